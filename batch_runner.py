@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多周期批量评分
+扫描 <根目录>/<团队>/<YYYY-MM>/{overdue,mean_overdue,days}.data 目录结构，
+使用进程池并行评分所有团队与周期，输出一张合并结果表。
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from result_export import check_export_path, export_results
+from scoring import DataProcessor
+
+DATA_FILES = ("overdue.data", "mean_overdue.data", "days.data")
+
+
+class PeriodTask(NamedTuple):
+    """一个待评分的团队周期"""
+    team: str
+    period: str
+    overdue_file: str
+    mean_overdue_file: str
+    days_file: str
+
+
+def discover_tasks(root_dir: str) -> List[PeriodTask]:
+    """查找所有包含完整三个数据文件的 团队/周期 目录"""
+    tasks = []
+    for team_entry in sorted(os.scandir(root_dir), key=lambda e: e.name):
+        if not team_entry.is_dir():
+            continue
+        for period_entry in sorted(os.scandir(team_entry.path), key=lambda e: e.name):
+            if not period_entry.is_dir():
+                continue
+            paths = [os.path.join(period_entry.path, name) for name in DATA_FILES]
+            if all(os.path.isfile(path) for path in paths):
+                tasks.append(PeriodTask(team_entry.name, period_entry.name, *paths))
+    return tasks
+
+
+# 每个工作进程复用同一个处理器，配置和缓存在进程内保持常驻
+_PROCESSOR: Optional[DataProcessor] = None
+
+
+def _init_worker(cache_dir: Optional[str]) -> None:
+    global _PROCESSOR
+    cache = None
+    if cache_dir:
+        from parse_cache import ParsedDataCache
+        cache = ParsedDataCache(cache_dir)
+    _PROCESSOR = DataProcessor(cache=cache)
+
+
+def score_task(task: PeriodTask) -> pd.DataFrame:
+    """评分单个团队周期，结果附带团队、周期与周期内排名"""
+    if _PROCESSOR is None:
+        _init_worker(None)
+    df = _PROCESSOR.process_files(task.overdue_file, task.mean_overdue_file,
+                                  task.days_file, verbose=False)
+    df.insert(0, "排名", df.index)
+    df.insert(0, "period", task.period)
+    df.insert(0, "team", task.team)
+    return df.reset_index(drop=True)
+
+
+def run_batch(root_dir: str, workers: Optional[int] = None,
+              cache_dir: Optional[str] = None,
+              verbose: bool = True) -> Tuple[pd.DataFrame, List[Tuple[PeriodTask, str]]]:
+    """并行评分目录下所有周期，返回(合并结果, 失败列表)"""
+    tasks = discover_tasks(root_dir)
+    frames = []
+    failures = []
+
+    if workers == 1:
+        _init_worker(cache_dir)
+        for task in tasks:
+            try:
+                frames.append(score_task(task))
+            except (ValueError, OSError) as e:
+                failures.append((task, str(e)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cache_dir,)) as executor:
+            futures = {executor.submit(score_task, task): task for task in tasks}
+            for done, future in enumerate(as_completed(futures), 1):
+                task = futures[future]
+                try:
+                    frames.append(future.result())
+                except (ValueError, OSError) as e:
+                    failures.append((task, str(e)))
+                if verbose and (done % 50 == 0 or done == len(tasks)):
+                    print(f"   进度: {done}/{len(tasks)}")
+
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+        combined = combined.sort_values(["team", "period", "排名"], kind="mergesort").reset_index(drop=True)
+    else:
+        combined = pd.DataFrame()
+    return combined, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 多团队多周期批量评分")
+    parser.add_argument("root", help="数据根目录，结构为 <团队>/<YYYY-MM>/{overdue,mean_overdue,days}.data")
+    parser.add_argument("--output", required=True, help="合并结果输出文件路径（.csv、.csv.gz/.bz2/.xz或.parquet）")
+    parser.add_argument("--workers", type=int, help="并行进程数 (默认: CPU核数)")
+    parser.add_argument("--cache-dir", help="解析结果缓存目录")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"❌ 数据根目录不存在: {args.root}")
+        return
+    try:
+        check_export_path(args.output)
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}")
+        return
+
+    start = time.perf_counter()
+    print(f"正在扫描并评分 {args.root} ...")
+    combined, failures = run_batch(args.root, args.workers, args.cache_dir)
+
+    for task, error in failures:
+        print(f"❌ {task.team}/{task.period} 处理失败: {error}")
+
+    if combined.empty:
+        print("❌ 未找到可评分的周期数据")
+        return
+
+    export_results(DataProcessor(), combined, args.output, index_label=None)
+    periods = combined.groupby(["team", "period"]).ngroups
+    print(f"\n✅ 共评分 {periods} 个团队周期、{len(combined)} 条记录，耗时 {time.perf_counter() - start:.1f}秒")
+    print(f"结果已保存到: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
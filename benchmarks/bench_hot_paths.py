@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分与解析热点路径基准测试
+覆盖 解析、对齐、评分、排名、统计、CSV导出 以及端到端process_files
+"""
+
+import pytest
+
+from scoring import DataParser, DataProcessor, ScoringCalculator
+
+
+@pytest.fixture(scope="session")
+def result_frames(data_files):
+    """按规模缓存的评分结果"""
+    cache = {}
+
+    def get(n):
+        if n not in cache:
+            paths = data_files(n)
+            cache[n] = DataProcessor().process_files(
+                paths["overdue"], paths["mean_overdue"], paths["days"], verbose=False)
+        return cache[n]
+    return get
+
+
+@pytest.mark.benchmark(group="parse")
+def bench_parse(benchmark, data_files, n):
+    paths = data_files(n)
+
+    def parse():
+        DataParser.parse_overdue_data(paths["overdue"])
+        DataParser.parse_mean_overdue_data(paths["mean_overdue"])
+        DataParser.parse_days_data(paths["days"])
+    benchmark(parse)
+
+
+@pytest.mark.benchmark(group="parse")
+@pytest.mark.parametrize("extension", ["csv", "parquet", "arrow"])
+def bench_parse_table(benchmark, columns, n, extension, tmp_path_factory):
+    if extension != "csv":
+        pytest.importorskip("pyarrow")
+    import pandas as pd
+    from table_input import write_table
+    path = str(tmp_path_factory.mktemp("table") / f"combined.{extension}")
+    write_table(pd.DataFrame(columns(n)), path)
+    processor = DataProcessor()
+    aligned = benchmark(processor.load_aligned_table, path, False)
+    assert len(aligned.names) == n
+
+
+@pytest.mark.benchmark(group="align")
+def bench_align(benchmark, columns, n):
+    data = columns(n)
+    overdue = (data["name"], data["overdue_ratio"])
+    mean_overdue = (data["name"][::-1].copy(), data["overdue_days"][::-1].copy())
+    days = (data["name"], data["work_days"])
+    aligned = benchmark(DataParser.join_columns, overdue, mean_overdue, days)
+    assert len(aligned.names) == n
+
+
+@pytest.mark.benchmark(group="score")
+@pytest.mark.parametrize("use_lookup", [False, True], ids=["exact", "lookup"])
+def bench_batch_score(benchmark, columns, n, use_lookup):
+    data = columns(n)
+    calculator = ScoringCalculator(use_lookup=use_lookup)
+    benchmark(calculator.calculate_batch_scores,
+              data["overdue_ratio"], data["overdue_days"], data["work_days"])
+
+
+@pytest.mark.scalar
+@pytest.mark.benchmark(group="score-scalar")
+def bench_scalar_score(benchmark, columns, n):
+    data = columns(n)
+    calculator = ScoringCalculator(cache_size=0)
+    rows = list(zip(data["overdue_ratio"].tolist(), data["overdue_days"].tolist(),
+                    data["work_days"].tolist()))
+
+    def score():
+        for ratio, days, work in rows:
+            calculator.calculate_comprehensive_score(ratio, days, work)
+    benchmark(score)
+
+
+@pytest.mark.scalar
+@pytest.mark.benchmark(group="explain")
+def bench_explain(benchmark, columns, n):
+    data = columns(n)
+    calculator = ScoringCalculator()
+    rows = list(zip(data["overdue_ratio"].tolist(), data["overdue_days"].tolist(),
+                    data["work_days"].tolist()))
+
+    def explain():
+        for ratio, days, work in rows:
+            calculator.explain_score(ratio, days, work)
+    benchmark(explain)
+
+
+@pytest.mark.benchmark(group="rank")
+def bench_rank(benchmark, result_frames, n):
+    df = result_frames(n).sample(frac=1.0, random_state=0)
+    benchmark(df.sort_values, "comprehensive_score", ascending=False)
+
+
+@pytest.mark.benchmark(group="rank")
+def bench_select_top_bottom(benchmark, result_frames, n):
+    df = result_frames(n).sample(frac=1.0, random_state=0)
+    processor = DataProcessor()
+
+    def select():
+        processor.select_top(df, 10)
+        processor.select_bottom(df, 10)
+
+    benchmark(select)
+
+
+@pytest.mark.benchmark(group="stats")
+def bench_statistics(benchmark, result_frames, n):
+    df = result_frames(n)
+    benchmark(DataProcessor().analyze_statistics, df)
+
+
+@pytest.mark.benchmark(group="export")
+def bench_csv_export(benchmark, result_frames, n, tmp_path):
+    df = result_frames(n)
+    output = str(tmp_path / "result.csv")
+    benchmark(df.to_csv, output, index=True, index_label="排名", encoding="utf-8-sig")
+
+
+@pytest.mark.benchmark(group="process_files")
+def bench_process_files(benchmark, data_files, n):
+    paths = data_files(n)
+    processor = DataProcessor()
+    benchmark(processor.process_files, paths["overdue"], paths["mean_overdue"],
+              paths["days"], verbose=False)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分与解析热点路径基准测试配置
+
+运行方式（需要 pytest-benchmark）:
+    pytest benchmarks --benchmark-save=baseline          # 记录基线
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%   # 与最近基线比较，退化超20%即失败
+
+规模通过环境变量 BENCH_SIZES 指定（逗号分隔，默认 100,10000,1000000）；
+逐人标量路径只在不超过 BENCH_SCALAR_MAX（默认 10000）的规模上运行。
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate_columns, write_data_files  # noqa: E402
+
+SIZES = [int(float(size)) for size in os.getenv("BENCH_SIZES", "100,10000,1000000").split(",")]
+SCALAR_MAX = int(float(os.getenv("BENCH_SCALAR_MAX", "10000")))
+
+
+def pytest_generate_tests(metafunc):
+    if "n" in metafunc.fixturenames:
+        sizes = SIZES
+        if metafunc.definition.get_closest_marker("scalar"):
+            sizes = [size for size in SIZES if size <= SCALAR_MAX]
+        metafunc.parametrize("n", sizes, scope="session")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "scalar: 逐人标量路径，仅在小规模上运行")
+
+
+@pytest.fixture(scope="session")
+def data_files(tmp_path_factory):
+    """按规模缓存的合成数据文件"""
+    cache = {}
+
+    def get(n):
+        if n not in cache:
+            cache[n] = write_data_files(str(tmp_path_factory.mktemp(f"data_{n}")), n)
+        return cache[n]
+    return get
+
+
+@pytest.fixture(scope="session")
+def columns():
+    """按规模缓存的合成输入列"""
+    cache = {}
+
+    def get(n):
+        if n not in cache:
+            cache[n] = generate_columns(n)
+        return cache[n]
+    return get
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史评分存储
+按 员工×周期 追加保存每期的原始指标与综合得分，供趋势、稳定性等历史类评分使用。
+
+存储为列式追加文件：每列一个定长二进制文件(<列名>.bin)，可直接内存映射读取；
+每行记录同一员工上一期所在行号(prev_row)，并维护每位员工最新一行的位置(heads-<行数>.npy)，
+因此读取某员工最近N期只需沿指针回溯N步，与历史总量无关。
+meta.json 记录已提交的行数与对应的heads文件，写入中断时未提交的尾部数据会在下次追加时被覆盖。
+仅支持单进程写入。
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 存储格式变化时递增
+STORE_FORMAT_VERSION = 1
+
+METRIC_COLUMNS = ("overdue_ratio", "overdue_days", "work_days", "comprehensive_score")
+COLUMN_DTYPES = {
+    "employee": np.int32,      # 员工编号（对应meta.json中的employees）
+    "period": np.int32,        # 周期编号（对应meta.json中的periods）
+    "prev_row": np.int64,      # 该员工上一期所在行，-1表示无
+    **{column: np.float64 for column in METRIC_COLUMNS},
+}
+
+
+class HistoryStore:
+    """追加式列存历史库 - 按员工与周期索引，O(1)定位员工最近N期"""
+
+    META_FILE = "meta.json"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+        self._load_meta()
+
+    # ---------- 基本信息 ----------
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def periods(self) -> List[str]:
+        """已写入的周期（按追加顺序）"""
+        return list(self._periods)
+
+    @property
+    def employees(self) -> List[str]:
+        """出现过的员工（按首次出现顺序）"""
+        return list(self._employees)
+
+    def column(self, name: str) -> np.ndarray:
+        """整列只读视图（内存映射）"""
+        if name not in self._mapped:
+            dtype = COLUMN_DTYPES[name]
+            if self._rows:
+                self._mapped[name] = np.memmap(self._column_path(name), dtype=dtype, mode="r",
+                                               shape=(self._rows,))
+            else:
+                self._mapped[name] = np.empty(0, dtype=dtype)
+        return self._mapped[name]
+
+    # ---------- 写入 ----------
+    def append_period(self, period: str, df: pd.DataFrame) -> int:
+        """追加一个周期的评分结果（需包含name及各项指标列），返回写入行数
+
+        周期须按时间顺序追加（标签按字符串递增，如YYYY-MM），已写入的周期不可重复或修改。
+        """
+        if self._periods and period <= self._periods[-1]:
+            raise ValueError(f"周期{period}须晚于已写入的最新周期{self._periods[-1]}")
+        names = df["name"].astype(str).tolist()
+        if len(set(names)) != len(names):
+            raise ValueError(f"周期{period}的数据中存在重复姓名")
+
+        # 新状态先在局部变量中构建，元数据写入成功后才替换内存状态，写入失败时保持原状态
+        employees = list(self._employees)
+        employee_ids = dict(self._employee_ids)
+        for name in names:
+            if name not in employee_ids:
+                employee_ids[name] = len(employees)
+                employees.append(name)
+        heads = np.concatenate([self._heads, np.full(len(employees) - len(self._heads), -1, dtype=np.int64)])
+
+        employee = np.fromiter((employee_ids[name] for name in names), dtype=np.int32, count=len(names))
+        total_rows = self._rows + len(names)
+        columns = {
+            "employee": employee,
+            "period": np.full(len(names), len(self._periods), dtype=np.int32),
+            "prev_row": heads[employee],
+            **{column: df[column].to_numpy(dtype=np.float64) for column in METRIC_COLUMNS},
+        }
+        heads[employee] = np.arange(self._rows, total_rows, dtype=np.int64)
+
+        # 先写列数据，再写指针和元数据；元数据替换成功即视为提交
+        for name, values in columns.items():
+            self._append_column(name, values.astype(COLUMN_DTYPES[name], copy=False))
+        heads_file = f"heads-{total_rows}.npy"
+        self._write_atomic(heads_file, lambda f: np.save(f, heads), binary=True)
+        periods = self._periods + [period]
+        self._write_meta(total_rows, periods, employees, heads_file)
+
+        old_heads_file = self._heads_file
+        self._rows, self._periods, self._heads, self._heads_file = total_rows, periods, heads, heads_file
+        self._employees, self._employee_ids = employees, employee_ids
+        if old_heads_file and old_heads_file != heads_file:  # 空周期沿用同名指针文件
+            os.remove(os.path.join(self.root_dir, old_heads_file))
+        self._mapped = {}
+        return len(names)
+
+    # ---------- 读取 ----------
+    def employee_rows(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """员工最近n期（默认全部）所在行号，按时间从早到晚"""
+        employee_id = self._employee_ids.get(name)
+        if employee_id is None:
+            return np.empty(0, dtype=np.int64)
+        prev_row = self.column("prev_row")
+        rows = []
+        row = int(self._heads[employee_id])
+        while row >= 0 and (n is None or len(rows) < n):
+            rows.append(row)
+            row = int(prev_row[row])
+        return np.array(rows[::-1], dtype=np.int64)
+
+    def last_n(self, name: str, n: int) -> Dict[str, np.ndarray]:
+        """员工最近n期的周期标签与各项指标，按时间从早到晚"""
+        rows = self.employee_rows(name, n)
+        periods = np.array(self._periods, dtype=object)
+        history = {"period": periods[self.column("period")[rows]] if len(rows) else np.empty(0, dtype=object)}
+        for column in METRIC_COLUMNS:
+            history[column] = np.asarray(self.column(column)[rows])
+        return history
+
+    def recent_matrix(self, column: str, n: int,
+                      names: Optional[Iterable[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """多名员工最近n期某项指标，返回(姓名, 员工数×n矩阵)
+
+        每行按时间从早到晚右对齐，不足n期的位置为NaN；沿指针整体回溯n步，按员工向量化完成。
+        """
+        names = list(self._employees) if names is None else list(names)
+        employee_ids = np.array([self._employee_ids.get(name, -1) for name in names], dtype=np.int64)
+        rows = np.full(len(names), -1, dtype=np.int64)
+        known = employee_ids >= 0
+        rows[known] = self._heads[employee_ids[known]]
+
+        values = self.column(column)
+        prev_row = self.column("prev_row")
+        matrix = np.full((len(names), n), np.nan)
+        for step in range(n - 1, -1, -1):
+            valid = rows >= 0
+            if not valid.any():
+                break
+            matrix[valid, step] = values[rows[valid]]
+            rows[valid] = prev_row[rows[valid]]
+        return names, matrix
+
+    # ---------- 内部实现 ----------
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.root_dir, f"{name}.bin")
+
+    def _append_column(self, name: str, values: np.ndarray) -> None:
+        """从已提交位置写入，覆盖上次中断可能残留的未提交数据"""
+        path = self._column_path(name)
+        offset = self._rows * np.dtype(COLUMN_DTYPES[name]).itemsize
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            f.write(values.tobytes())
+
+    def _load_meta(self) -> None:
+        try:
+            with open(os.path.join(self.root_dir, self.META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            meta = {"version": STORE_FORMAT_VERSION, "rows": 0, "periods": [], "employees": [],
+                    "heads_file": None}
+        if meta.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"历史库格式版本不兼容: {meta.get('version')}")
+
+        self._rows = meta["rows"]
+        self._periods = meta["periods"]
+        self._employees = meta["employees"]
+        self._employee_ids = {name: index for index, name in enumerate(self._employees)}
+        self._heads_file = meta["heads_file"]
+        if self._heads_file:
+            self._heads = np.load(os.path.join(self.root_dir, self._heads_file))
+        else:
+            self._heads = np.empty(0, dtype=np.int64)
+        self._mapped: Dict[str, np.ndarray] = {}
+
+    def _write_meta(self, rows: int, periods: List[str], employees: List[str], heads_file: str) -> None:
+        meta = {"version": STORE_FORMAT_VERSION, "rows": rows, "periods": periods,
+                "employees": employees, "heads_file": heads_file}
+        self._write_atomic(self.META_FILE, lambda f: json.dump(meta, f, ensure_ascii=False))
+
+    def _write_atomic(self, file_name: str, write, binary: bool = False) -> None:
+        path = os.path.join(self.root_dir, file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb" if binary else "w", **({} if binary else {"encoding": "utf-8"})) as f:
+            write(f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史滚动趋势与稳定性
+按周期顺序维护每位员工最近N期的滚动统计：逾期比例用滑动窗口累加和求均值，
+综合得分用Welford算法增量维护均值与方差（窗口满时先移除最旧一期）。
+每个新周期只需O(本期人数)的更新，回填全部历史为一次线性遍历。
+
+趋势与稳定性均基于本期之前的历史：
+  trend_score      本期逾期比例相对历史均值的变化（同calculate_overdue_trend_score）
+  stability_score  历史得分标准差对应的稳定性加减分（同calculate_performance_stability）
+"""
+
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore
+from scoring import STABILITY_LEVELS, ScoringCalculator
+
+
+class RollingHistoryStats:
+    """按员工编号维护的滚动窗口统计；window=None时为全部历史（不移除旧数据）"""
+
+    def __init__(self, window: Optional[int] = 6, calculator: ScoringCalculator = None):
+        if window is not None and window < 1:
+            raise ValueError("窗口期数必须为正整数")
+        self.window = window
+        self.calculator = calculator or ScoringCalculator()
+        self.count = np.zeros(0, dtype=np.int64)        # 窗口内期数
+        self.ratio_sum = np.zeros(0)                     # 窗口内逾期比例之和
+        self.score_mean = np.zeros(0)                    # 窗口内得分均值（Welford）
+        self.score_m2 = np.zeros(0)                      # 窗口内得分离差平方和（Welford）
+        self._appearances = np.zeros(0, dtype=np.int64)  # 累计出现期数，用于定位环形缓冲区
+        self._ratio_buffer = np.zeros((0, window or 0))
+        self._score_buffer = np.zeros((0, window or 0))
+
+    def _ensure_capacity(self, size: int) -> None:
+        grow = size - len(self.count)
+        if grow <= 0:
+            return
+        grow = max(grow, len(self.count))  # 按倍数扩容，避免逐期重新分配
+        self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+        self.ratio_sum = np.concatenate([self.ratio_sum, np.zeros(grow)])
+        self.score_mean = np.concatenate([self.score_mean, np.zeros(grow)])
+        self.score_m2 = np.concatenate([self.score_m2, np.zeros(grow)])
+        self._appearances = np.concatenate([self._appearances, np.zeros(grow, dtype=np.int64)])
+        self._ratio_buffer = np.vstack([self._ratio_buffer, np.zeros((grow, self._ratio_buffer.shape[1]))])
+        self._score_buffer = np.vstack([self._score_buffer, np.zeros((grow, self._score_buffer.shape[1]))])
+
+    def update(self, employee_ids: np.ndarray, overdue_ratio: np.ndarray,
+               scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """加入一个周期（同一周期内员工编号不重复），返回本期各员工基于此前历史的趋势与稳定性"""
+        ids = np.asarray(employee_ids, dtype=np.int64)
+        ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        score = np.asarray(scores, dtype=np.float64)
+        self._ensure_capacity(int(ids.max()) + 1 if len(ids) else 0)
+
+        # 1. 基于此前历史计算本期结果
+        count = self.count[ids]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            previous_avg = np.where(count > 0, self.ratio_sum[ids] / count, 0.0)
+            std_dev = np.where(count > 0, np.sqrt(np.maximum(self.score_m2[ids], 0.0) / count), 0.0)
+        trend = self.calculator.calculate_batch_overdue_trend_scores(ratio, previous_avg, count)
+        levels, stability = self.calculator.calculate_batch_stability(std_dev, count)
+        result = {
+            "history_periods": count.copy(),
+            "previous_ratio_avg": previous_avg,
+            "trend_score": trend,
+            "score_mean": np.where(count > 0, self.score_mean[ids], np.nan),
+            "score_std": std_dev,
+            "stability_level": levels,
+            "stability_score": stability,
+        }
+
+        # 2. 窗口已满时移除最旧一期（Welford逆向更新）
+        if self.window is not None:
+            slot = self._appearances[ids] % self.window
+            full = count == self.window
+            if full.any():
+                full_ids, full_slot = ids[full], slot[full]
+                old_ratio = self._ratio_buffer[full_ids, full_slot]
+                old_score = self._score_buffer[full_ids, full_slot]
+                self.ratio_sum[full_ids] -= old_ratio
+                remaining = self.count[full_ids] - 1
+                mean = self.score_mean[full_ids]
+                delta = old_score - mean
+                new_mean = np.where(remaining > 0, mean - delta / np.maximum(remaining, 1), 0.0)
+                self.score_m2[full_ids] -= delta * (old_score - new_mean)
+                self.score_mean[full_ids] = new_mean
+                self.count[full_ids] = remaining
+            self._ratio_buffer[ids, slot] = ratio
+            self._score_buffer[ids, slot] = score
+
+        # 3. 加入本期（Welford正向更新）
+        self.count[ids] += 1
+        self._appearances[ids] += 1
+        self.ratio_sum[ids] += ratio
+        delta = score - self.score_mean[ids]
+        self.score_mean[ids] += delta / self.count[ids]
+        self.score_m2[ids] += delta * (score - self.score_mean[ids])
+        return result
+
+
+def backfill(store: HistoryStore, window: Optional[int] = 6,
+             calculator: ScoringCalculator = None) -> pd.DataFrame:
+    """按周期顺序一次遍历历史库，生成每位员工每期的趋势与稳定性"""
+    stats = RollingHistoryStats(window, calculator)
+    employee = np.asarray(store.column("employee"))
+    period = np.asarray(store.column("period"))
+    ratio = np.asarray(store.column("overdue_ratio"))
+    scores = np.asarray(store.column("comprehensive_score"))
+
+    # 历史库按周期顺序追加，每个周期是一段连续的行
+    bounds = np.searchsorted(period, np.arange(len(store.periods) + 1))
+    parts = []
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        parts.append(stats.update(employee[start:end], ratio[start:end], scores[start:end]))
+
+    columns = {key: np.concatenate([part[key] for part in parts]) if parts else np.empty(0)
+               for key in ("history_periods", "previous_ratio_avg", "trend_score", "score_mean",
+                           "score_std", "stability_level", "stability_score")}
+    employees = np.array(store.employees, dtype=object)
+    periods = np.array(store.periods, dtype=object)
+    df = pd.DataFrame({
+        "name": employees[employee] if len(employee) else np.empty(0, dtype=object),
+        "period": periods[period] if len(period) else np.empty(0, dtype=object),
+        "overdue_ratio": ratio,
+        "comprehensive_score": scores,
+        **columns,
+    })
+    df["stability"] = np.array(STABILITY_LEVELS, dtype=object)[df["stability_level"].to_numpy(dtype=np.intp)]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 历史趋势与稳定性回填")
+    parser.add_argument("--history-dir", required=True, help="历史评分库目录")
+    parser.add_argument("--window", type=int, default=6, help="滚动窗口期数，0表示全部历史 (默认: 6)")
+    parser.add_argument("--output", required=True, help="输出文件路径 (CSV格式)")
+
+    args = parser.parse_args()
+
+    store = HistoryStore(args.history_dir)
+    if not len(store):
+        print(f"❌ 历史库为空: {args.history_dir}")
+        return
+    result = backfill(store, args.window or None)
+    result.to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"✅ 已回填 {len(store.periods)} 个周期、{len(result)} 条记录")
+    print(f"结果已保存到: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量评分
+保留上一次的评分结果和各数据文件快照；某个文件更新时只与其上一版快照按员工比较，
+仅对变化的员工重新评分，并通过有序数组的定点删除/插入更新排行榜，无需整体重新排序。
+适用于 days.data 每日刷新、逾期文件每周刷新的实时排行榜场景。
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scoring import DataProcessor
+
+KINDS = ("overdue", "mean_overdue", "days")
+INPUT_COLUMNS = {"overdue": "overdue_ratio", "mean_overdue": "overdue_days", "days": "work_days"}
+RESULT_COLUMNS = ["name", "overdue_ratio", "overdue_days", "work_days",
+                  "overdue_ratio_score", "overdue_days_score", "work_days_score",
+                  "comprehensive_score", "leave_adjustment", "grade", "explain_code", "needs_review"]
+COLUMN_DTYPES = {"name": str, "leave_adjustment": bool, "grade": str,
+                 "explain_code": np.uint8, "needs_review": bool}
+
+
+def _insert(array: np.ndarray, positions: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """有序数组定点插入；字符串列按需扩展宽度，避免插入较长姓名时被截断"""
+    dtype = np.result_type(array, values) if array.dtype.kind == "U" else array.dtype
+    return np.insert(array.astype(dtype, copy=False), positions, values)
+
+
+class IncrementalScorer:
+    """增量评分器 - 仅重算变化的员工，并以有序插入维护排名"""
+
+    def __init__(self, processor: DataProcessor = None):
+        self.processor = processor or DataProcessor()
+        self.files: Dict[str, str] = {}
+        # 各数据文件快照：按姓名排序的(姓名, 数值)
+        self._snapshots: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # 当前结果表：按姓名排序的各列
+        self._table: Dict[str, np.ndarray] = {}
+        # 排行榜：按(得分降序, 姓名升序)排列，_rank_keys为负得分以便升序二分查找
+        self._rank_keys = np.empty(0, dtype=np.float64)
+        self._rank_names = np.empty(0, dtype=str)
+        # 团队工作量异常列依赖全体成员，按需计算并缓存到结果表下次变化为止
+        self._version = 0
+        self._anomalies: Optional[Tuple[int, pd.DataFrame]] = None
+
+    # ---------- 公共接口 ----------
+    def load(self, overdue_file: str, mean_overdue_file: str, days_file: str) -> pd.DataFrame:
+        """首次加载三个文件并完整评分（含团队工作量异常列）"""
+        files = dict(zip(KINDS, (overdue_file, mean_overdue_file, days_file)))
+        snapshots = {kind: self._read_snapshot(kind, path) for kind, path in files.items()}
+        self._validate(snapshots)
+
+        empty_table = {column: np.empty(0, dtype=COLUMN_DTYPES.get(column, np.float64))
+                       for column in RESULT_COLUMNS}
+        state = self._apply_changes(snapshots["overdue"][0], snapshots, empty_table,
+                                    np.empty(0, dtype=np.float64), np.empty(0, dtype=str))
+        self.files = files
+        self._commit(snapshots, *state)
+        return self.ranked_frame(anomalies=True)
+
+    def update(self, overdue_file: Optional[str] = None, mean_overdue_file: Optional[str] = None,
+               days_file: Optional[str] = None) -> Dict[str, int]:
+        """用新版本文件更新（未提供的文件保持不变），返回各类变化的人数
+
+        先读取并验证全部新文件，新的结果表与排行榜在局部构建完成后才替换当前状态，
+        任一步骤失败时保持原有状态不变。
+        """
+        if not self._snapshots:
+            raise ValueError("尚未加载数据，请先调用load()")
+
+        paths = {kind: path for kind, path in zip(KINDS, (overdue_file, mean_overdue_file, days_file))
+                 if path is not None}
+        new_snapshots = {kind: self._read_snapshot(kind, path) for kind, path in paths.items()}
+        snapshots = {**self._snapshots, **new_snapshots}
+        self._validate(snapshots)
+
+        summary = {"changed": 0, "added": 0, "removed": 0, "rescored": 0}
+        affected: List[np.ndarray] = []
+        for kind, (new_names, new_values) in new_snapshots.items():
+            old_names, old_values = self._snapshots[kind]
+            changed, added, removed = self._diff(old_names, old_values, new_names, new_values)
+            summary["changed"] += len(changed)
+            summary["added"] += len(added)
+            summary["removed"] += len(removed)
+            affected.extend([changed, added, removed])
+
+        state = (self._table, self._rank_keys, self._rank_names, 0)
+        if affected:
+            state = self._apply_changes(np.unique(np.concatenate(affected)), snapshots, *state[:3])
+        self.files = {**self.files, **paths}
+        self._commit(snapshots, *state)
+        summary["rescored"] = state[3]
+        return summary
+
+    def ranked_frame(self, top: Optional[int] = None, anomalies: bool = False) -> pd.DataFrame:
+        """当前排行榜前top名（默认全部，排名从1开始）
+
+        只取出需要的行；anomalies=True时追加团队工作量异常列，
+        该统计依赖全体成员，按需整表聚合一次并缓存到结果表下次变化为止。
+        """
+        names = self._rank_names[:top]
+        positions = np.searchsorted(self._table["name"], names)
+        df = pd.DataFrame({column: self._table[column][positions] for column in RESULT_COLUMNS})
+        if anomalies:
+            workload = self._workload_anomalies()
+            df = pd.concat([df, workload.iloc[positions].reset_index(drop=True)], axis=1)
+        df.index += 1
+        return df
+
+    # ---------- 内部实现 ----------
+    def _validate(self, snapshots: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """与完整评分相同的数据验证，失败时抛出ValueError"""
+        is_valid, message = self.processor.parser.validate_columns(*(snapshots[kind] for kind in KINDS))
+        if not is_valid:
+            raise ValueError(f"数据验证失败: {message}")
+
+    def _commit(self, snapshots, table, rank_keys, rank_names, rescored) -> None:
+        """替换为新构建的快照、结果表与排行榜（rescored仅随_apply_changes的返回值传入）"""
+        self._snapshots, self._table = snapshots, table
+        self._rank_keys, self._rank_names = rank_keys, rank_names
+        self._version += 1
+
+    def _workload_anomalies(self) -> pd.DataFrame:
+        """按姓名顺序的团队工作量异常列（与完整评分的聚合顺序一致）"""
+        if self._anomalies is None or self._anomalies[0] != self._version:
+            df = self.processor.add_workload_anomalies(pd.DataFrame(self._table, columns=RESULT_COLUMNS))
+            self._anomalies = (self._version, df.drop(columns=RESULT_COLUMNS))
+        return self._anomalies[1]
+
+    def _read_snapshot(self, kind: str, path: str) -> Tuple[np.ndarray, np.ndarray]:
+        parse_func = {
+            "overdue": self.processor.parser.parse_overdue_data,
+            "mean_overdue": self.processor.parser.parse_mean_overdue_data,
+            "days": self.processor.parser.parse_days_data,
+        }[kind]
+        names, values = self.processor.load_columns(path, kind, parse_func)
+        order = np.argsort(names, kind="stable")
+        return names[order], values[order]
+
+    @staticmethod
+    def _diff(old_names, old_values, new_names, new_values):
+        """按员工比较新旧快照，返回(数值变化, 新增, 删除)的姓名"""
+        common, old_idx, new_idx = np.intersect1d(old_names, new_names, assume_unique=True,
+                                                  return_indices=True)
+        old_common, new_common = old_values[old_idx], new_values[new_idx]
+        differs = (old_common != new_common) & ~(np.isnan(old_common) & np.isnan(new_common))
+        return (common[differs],
+                np.setdiff1d(new_names, old_names, assume_unique=True),
+                np.setdiff1d(old_names, new_names, assume_unique=True))
+
+    @staticmethod
+    def _lookup(snapshot: Tuple[np.ndarray, np.ndarray], names: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """在快照中查找姓名，返回(是否存在, 数值)"""
+        snapshot_names, snapshot_values = snapshot
+        positions = np.searchsorted(snapshot_names, names)
+        clipped = np.minimum(positions, max(len(snapshot_names) - 1, 0))
+        found = (positions < len(snapshot_names))
+        if len(snapshot_names):
+            found &= snapshot_names[clipped] == names
+        values = snapshot_values[clipped] if len(snapshot_values) else np.zeros(len(names))
+        return found, values
+
+    @staticmethod
+    def _rank_positions(rank_keys: np.ndarray, rank_names: np.ndarray,
+                        keys: np.ndarray, names: np.ndarray) -> np.ndarray:
+        """(负得分, 姓名)在排行榜中的有序位置"""
+        lo = np.searchsorted(rank_keys, keys, side="left")
+        hi = np.searchsorted(rank_keys, keys, side="right")
+        return np.array([low + np.searchsorted(rank_names[low:high], name)
+                         for low, high, name in zip(lo.tolist(), hi.tolist(), names.tolist())],
+                        dtype=np.intp)
+
+    def _apply_changes(self, names: np.ndarray, snapshots: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                       table: Dict[str, np.ndarray], rank_keys: np.ndarray, rank_names: np.ndarray):
+        """对受影响的员工重新评分，返回新的(结果表, 排行榜键, 排行榜姓名, 重新评分人数)
+
+        删除与插入均生成新数组，传入的结果表与排行榜保持不变。
+        """
+        table = dict(table)
+
+        # 1. 从结果表和排行榜中移除受影响员工的旧记录
+        table_pos = np.searchsorted(table["name"], names)
+        in_table = table_pos < len(table["name"])
+        in_table[in_table] = table["name"][table_pos[in_table]] == names[in_table]
+        old_pos = table_pos[in_table]
+        if old_pos.size:
+            old_keys = -table["comprehensive_score"][old_pos]
+            rank_pos = self._rank_positions(rank_keys, rank_names, old_keys, names[in_table])
+            rank_keys = np.delete(rank_keys, rank_pos)
+            rank_names = np.delete(rank_names, rank_pos)
+            for column in RESULT_COLUMNS:
+                table[column] = np.delete(table[column], old_pos)
+
+        # 2. 三个文件中都存在的员工重新评分
+        present = np.ones(len(names), dtype=bool)
+        values = {}
+        for kind in KINDS:
+            found, kind_values = self._lookup(snapshots[kind], names)
+            present &= found
+            values[INPUT_COLUMNS[kind]] = kind_values
+        names = names[present]
+        if not len(names):
+            return table, rank_keys, rank_names, 0
+        inputs = {column: column_values[present] for column, column_values in values.items()}
+
+        calculator = self.processor.calculator
+        scores = calculator.calculate_batch_scores(inputs["overdue_ratio"], inputs["overdue_days"],
+                                                   inputs["work_days"])
+        new_rows = {"name": names, **inputs, **scores}
+
+        # 3. 按姓名有序插入结果表
+        insert_pos = np.searchsorted(table["name"], names)
+        for column in RESULT_COLUMNS:
+            table[column] = _insert(table[column], insert_pos, new_rows[column])
+
+        # 4. 按(得分降序, 姓名升序)有序插入排行榜
+        new_keys = -scores["comprehensive_score"]
+        order = np.lexsort((names, new_keys))
+        new_keys, new_names = new_keys[order], names[order]
+        if not len(rank_keys):
+            return table, new_keys, new_names, len(names)
+        rank_pos = self._rank_positions(rank_keys, rank_names, new_keys, new_names)
+        return (table, np.insert(rank_keys, rank_pos, new_keys), _insert(rank_names, rank_pos, new_names),
+                len(names))
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 增量刷新排行榜")
+    parser.add_argument("--overdue", help="逾期比例数据文件路径 (默认: data/overdue.data)")
+    parser.add_argument("--mean-overdue", help="逾期天数均值数据文件路径 (默认: data/mean_overdue.data)")
+    parser.add_argument("--days", help="工作人天数据文件路径 (默认: data/days.data)")
+    parser.add_argument("--interval", type=float, default=300, help="检查文件变化的间隔秒数 (默认: 300)")
+    parser.add_argument("--top", type=int, default=10, help="每次刷新显示的前N名")
+
+    args = parser.parse_args()
+
+    data_dir = os.getenv('DATA_DIR', 'data')
+    files = {
+        "overdue": args.overdue or os.path.join(data_dir, 'overdue.data'),
+        "mean_overdue": args.mean_overdue or os.path.join(data_dir, 'mean_overdue.data'),
+        "days": args.days or os.path.join(data_dir, 'days.data'),
+    }
+
+    scorer = IncrementalScorer()
+    try:
+        ranked = scorer.load(files["overdue"], files["mean_overdue"], files["days"])
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ 数据加载失败: {e}")
+        return
+    mtimes = {kind: os.stat(path).st_mtime_ns for kind, path in files.items()}
+    print(ranked.head(args.top)[["name", "comprehensive_score", "grade"]].to_string())
+    del ranked
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            changed, new_mtimes = {}, {}
+            for kind, path in files.items():
+                # 文件正在被替换（暂时不存在）时本轮跳过，保留上次的修改时间，下一轮再检查
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                if mtime != mtimes[kind]:
+                    new_mtimes[kind] = mtime
+                    changed[f"{kind}_file"] = path
+            if not changed:
+                continue
+            try:
+                summary = scorer.update(**changed)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"\n❌ {time.strftime('%H:%M:%S')} 更新失败，保持上一版排行榜: {e}")
+                continue
+            mtimes.update(new_mtimes)
+            print(f"\n🔄 {time.strftime('%H:%M:%S')} 已更新: 变化{summary['changed']}人, "
+                  f"新增{summary['added']}人, 移除{summary['removed']}人, 重新评分{summary['rescored']}人")
+            print(scorer.ranked_frame(args.top)[["name", "comprehensive_score", "grade"]].to_string())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析结果磁盘缓存
+将解析后的 姓名→数值 映射以列式二进制(.npz，内含names/values两个.npy数组)存储，
+以文件内容哈希为键；文件大小与修改时间未变时直接复用已记录的哈希，避免重复读取。
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# 解析逻辑或存储格式变化时递增，使旧缓存自动失效
+CACHE_FORMAT_VERSION = 1
+
+
+class ParsedDataCache:
+    """解析结果缓存 - 按文件内容哈希索引，按存活时间和总大小淘汰"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_age_days: float = 30.0,
+                 max_total_mb: float = 512.0):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_days * 86400
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    # ---------- 公共接口 ----------
+    def load_dict(self, file_path: str, kind: str,
+                  parse_func: Callable[[str], Dict[str, float]]) -> Dict[str, float]:
+        """读取解析结果（字典形式），未命中时调用parse_func解析并写入缓存"""
+        names, values = self.load_columns(file_path, kind, parse_func)
+        return dict(zip(names.tolist(), values.tolist()))
+
+    def load_columns(self, file_path: str, kind: str,
+                     parse_func: Callable[[str], Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """读取解析结果（列式数组：姓名、数值），未命中时解析并写入缓存"""
+        entry_path = self._entry_path(self._file_digest(file_path), kind)
+
+        columns = self._read_entry(entry_path)
+        if columns is not None:
+            self.hits += 1
+            return columns
+
+        self.misses += 1
+        data = parse_func(file_path)
+        names = np.array(list(data.keys()), dtype=str)
+        values = np.fromiter(data.values(), dtype=np.float64, count=len(data))
+        self._write_entry(entry_path, names, values)
+        self.evict()
+        return names, values
+
+    def evict(self) -> int:
+        """淘汰过期条目，并按最近使用时间淘汰超出总大小限制的条目，返回删除数量"""
+        now = time.time()
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(".npz"):
+                continue
+            path = os.path.join(self.cache_dir, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        total_bytes = sum(size for _, size, _ in entries)
+        # 最久未使用的条目排在前面
+        for mtime, size, path in sorted(entries):
+            expired = now - mtime > self.max_age_seconds
+            if not expired and total_bytes <= self.max_total_bytes:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """清空缓存"""
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".npz") or file_name == self.INDEX_FILE:
+                os.remove(os.path.join(self.cache_dir, file_name))
+        self._index = {}
+
+    # ---------- 内部实现 ----------
+    def _entry_path(self, digest: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}-{kind}-v{CACHE_FORMAT_VERSION}.npz")
+
+    def _file_digest(self, file_path: str) -> str:
+        """计算文件内容哈希；大小与修改时间均未变时复用索引中的哈希"""
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        record = self._index.get(abs_path)
+        if record and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+            return record["sha256"]
+
+        sha = hashlib.sha256()
+        with open(abs_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        self._index[abs_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        self._write_index()
+        return digest
+
+    def _read_entry(self, entry_path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                names, values = entry["names"], entry["values"]
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+        # 刷新修改时间，作为LRU淘汰依据
+        os.utime(entry_path)
+        return names, values
+
+    def _write_entry(self, entry_path: str, names: np.ndarray, values: np.ndarray) -> None:
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, names=names, values=values)
+        os.replace(tmp_path, entry_path)
+
+    def _read_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self) -> None:
+        # 清理已不存在的源文件记录，避免索引无限增长
+        self._index = {path: record for path, record in self._index.items() if os.path.exists(path)}
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分结果流式导出
+按块渲染解释文字并写出，不构造整张结果表的渲染副本或显示副本，导出时额外内存只有一块的大小。
+格式按扩展名判断：
+  .csv                 CSV（utf-8-sig，Excel兼容）
+  .csv.gz/.bz2/.xz     压缩CSV（标准库gzip/bz2/lzma流式压缩）
+  .parquet/.pq         Parquet（逐块写入行组，需要pyarrow，默认zstd压缩）
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from table_input import require_pyarrow
+
+CSV_COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+CSV_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+PARQUET_COMPRESSIONS = ("none", "snappy", "gzip", "brotli", "zstd", "lz4")
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+DEFAULT_EXPORT_CHUNK_ROWS = 100_000
+
+
+def detect_export_format(file_path: str) -> str:
+    """按扩展名判断导出格式：csv或parquet"""
+    path = file_path.lower()
+    if path.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    stem, extension = os.path.splitext(path)
+    if extension in CSV_COMPRESSIONS:
+        stem, extension = os.path.splitext(stem)
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"不支持的输出格式: {file_path}（支持 .csv、.csv.gz/.bz2/.xz、.parquet）")
+
+
+def check_export_path(file_path: str, compression: str = None) -> str:
+    """评分前检查输出格式、压缩方式与依赖，避免评分完成后才发现无法写出"""
+    fmt = detect_export_format(file_path)
+    if fmt == "csv":
+        if compression is not None:
+            raise ValueError("CSV的压缩方式由扩展名决定（.csv.gz/.csv.bz2/.csv.xz），不能使用--compression")
+        return fmt
+    if compression is not None and compression not in PARQUET_COMPRESSIONS:
+        raise ValueError(f"不支持的Parquet压缩方式: {compression}（可选 {', '.join(PARQUET_COMPRESSIONS)}）")
+    require_pyarrow()
+    return fmt
+
+
+def iter_export_chunks(processor, df: pd.DataFrame, index_label: Optional[str] = "排名",
+                       chunk_rows: int = DEFAULT_EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """按块渲染解释文字，index_label不为None时将索引（排名）作为首列输出；空结果输出一个空块（只写表头）"""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if "explain_code" in chunk.columns:
+            chunk = processor.render_explanations(chunk)
+        if index_label is not None:
+            chunk = chunk.rename_axis(index_label).reset_index()
+        yield chunk
+
+
+def _write_csv(chunks: Iterator[pd.DataFrame], file_path: str) -> int:
+    compression = CSV_COMPRESSIONS.get(os.path.splitext(file_path.lower())[1])
+    opener = CSV_OPENERS[compression] if compression else open
+    rows = 0
+    # utf-8-sig只在文件开头写一次BOM，之后各块直接追加
+    with opener(file_path, "wt", encoding="utf-8-sig", newline="") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def _write_parquet(chunks: Iterator[pd.DataFrame], file_path: str, compression: str) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            # 各块沿用第一块的schema，避免某块整列为空时推断出不同类型
+            table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file_path, table.schema, compression=compression)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_results(processor, df: pd.DataFrame, file_path: str, index_label: Optional[str] = "排名",
+                   compression: str = None, chunk_rows: int = DEFAULT_EXPORT_CHUNK_ROWS) -> int:
+    """分块导出评分结果，返回写出行数
+
+    processor用于渲染解释文字（DataProcessor.render_explanations）；
+    compression只用于Parquet（CSV的压缩由扩展名决定），默认zstd。
+    """
+    fmt = check_export_path(file_path, compression)
+    chunks = iter_export_chunks(processor, df, index_label, chunk_rows)
+    if fmt == "csv":
+        return _write_csv(chunks, file_path)
+    return _write_parquet(chunks, file_path, compression or DEFAULT_PARQUET_COMPRESSION)
@@ -6,16 +6,97 @@
 版本：2.3 - 10人天标准与递增惩罚算法
 """
 
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple
+from dataclasses import dataclass, field
 import argparse
 import re
 
+# numpy/pandas仅在批量评分和生成DataFrame时按需导入，
+# 使标量评分与数据解析在短生命周期脚本中保持快速启动
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+def _round_like_python(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """向量化四舍五入，结果与内置round()逐位一致
+
+    np.round先乘10^n再取整，在恰好接近.5的位置可能与round()的精确十进制舍入不同；
+    这些"临界"元素回退到内置round()，其余元素走向量化路径。
+    """
+    import numpy as np
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    result = np.rint(scaled) / scale
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = np.flatnonzero(frac < 1e-6)
+    if near_tie.size:
+        flat_values = values.reshape(-1)
+        result.reshape(-1)[near_tie] = [round(v, ndigits) for v in flat_values[near_tie].tolist()]
+    return result
+
+class _TrackedDict(dict):
+    """配置参数字典 - 修改时通知所属配置更新版本号，用于使派生缓存失效"""
+
+    def __init__(self, owner: "ScoringConfig", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def _changed(self):
+        self._owner._bump_version()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._changed()
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    # 复制与序列化得到普通dict，与所属配置脱离，修改副本不影响原配置的版本号
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        import copy
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
 @dataclass
 class ScoringConfig:
-    """增强版评分配置类 - 包含趋势分析、异常检测和绩效稳定性评估"""
+    """增强版评分配置类 - 包含趋势分析、异常检测和绩效稳定性评估
+
+    每个实例持有参数字典的独立副本；任何参数修改都会递增version，
+    查找表、得分缓存等派生数据据此失效。
+    """
 
     # 权重配置 - 增强版
     weights = {
@@ -102,94 +183,354 @@ class ScoringConfig:
         "workload_variance": 0.4     # 工作量变异系数阈值
     }
 
+    PARAM_GROUPS = (
+        "weights", "overdue_ratio_params", "overdue_days_params", "work_days_params",
+        "complexity_params", "stability_params", "urgency_params",
+        "grade_thresholds", "anomaly_thresholds",
+    )
+
+    def __post_init__(self):
+        object.__setattr__(self, "version", 0)
+        object.__setattr__(self, "_fingerprint", None)
+        for name in self.PARAM_GROUPS:
+            setattr(self, name, getattr(type(self), name))
+
+    def __setattr__(self, name, value):
+        if name in self.PARAM_GROUPS:
+            value = _TrackedDict(self, value)
+        object.__setattr__(self, name, value)
+        if name in self.PARAM_GROUPS:
+            self._bump_version()
+
+    def __getstate__(self):
+        # 复制/序列化时只保存参数内容，跟踪字典在恢复时重建
+        return {name: dict(getattr(self, name)) for name in self.PARAM_GROUPS}
+
+    def __setstate__(self, state):
+        self.__post_init__()
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _bump_version(self):
+        object.__setattr__(self, "version", self.version + 1)
+        object.__setattr__(self, "_fingerprint", None)
+
+    def fingerprint(self) -> tuple:
+        """配置指纹：全部参数的可哈希快照，仅在参数变化后重新计算"""
+        if self._fingerprint is None:
+            fingerprint = tuple(
+                (name, tuple(sorted(getattr(self, name).items())))
+                for name in self.PARAM_GROUPS
+            )
+            object.__setattr__(self, "_fingerprint", fingerprint)
+        return self._fingerprint
+
+@dataclass
+class AlignedData:
+    """按员工对齐后的三项输入数据（列式存储）"""
+
+    names: np.ndarray
+    overdue_ratio: np.ndarray
+    overdue_days: np.ndarray
+    work_days: np.ndarray
+    unmatched: Dict[str, List[str]] = field(default_factory=dict)  # 各文件中未匹配的员工
+
 class DataParser:
     """数据解析器"""
 
     @staticmethod
-    def parse_overdue_data(file_path: str) -> Dict[str, float]:
-        """解析逾期比例数据文件"""
-        data = {}
+    def iter_triplets(file_path: str) -> Iterator[Tuple[str, str, str]]:
+        """流式读取三行一组的数据文件：姓名、数值、中位数
+
+        逐行读取并跳过空行，内存占用与文件大小无关；末尾不完整的分组被忽略。
+        """
+        group = []
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                group.append(line)
+                if len(group) == 3:
+                    yield group[0], group[1], group[2]
+                    group = []
 
-        # 每3行为一组：姓名、逾期比例、中位数
-        for i in range(0, len(lines), 3):
-            if i + 2 < len(lines):
-                name = lines[i]
-                ratio_str = lines[i + 1]
-                # 提取百分比数字
-                ratio = float(ratio_str.replace('%', ''))
-                data[name] = ratio
+    @staticmethod
+    def iter_overdue_records(file_path: str) -> Iterator[Tuple[str, float]]:
+        """流式解析逾期比例数据：逐条产出(姓名, 逾期比例)"""
+        for name, ratio_str, _ in DataParser.iter_triplets(file_path):
+            # 提取百分比数字
+            yield name, float(ratio_str.replace('%', ''))
+
+    @staticmethod
+    def iter_mean_overdue_records(file_path: str) -> Iterator[Tuple[str, float]]:
+        """流式解析逾期天数均值数据：逐条产出(姓名, 天数)"""
+        for name, days_str, _ in DataParser.iter_triplets(file_path):
+            yield name, float(days_str)
+
+    @staticmethod
+    def iter_days_records(file_path: str) -> Iterator[Tuple[str, float]]:
+        """流式解析工作人天数据：逐条产出(姓名, 人天)"""
+        for name, work_days_str, _ in DataParser.iter_triplets(file_path):
+            yield name, float(work_days_str)  # 直接使用人天数据
 
-        return data
+    @staticmethod
+    def parse_overdue_data(file_path: str) -> Dict[str, float]:
+        """解析逾期比例数据文件"""
+        # 每3行为一组：姓名、逾期比例、中位数
+        return dict(DataParser.iter_overdue_records(file_path))
 
     @staticmethod
     def parse_mean_overdue_data(file_path: str) -> Dict[str, float]:
         """解析逾期天数均值数据文件"""
-        data = {}
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-
         # 每3行为一组：姓名、天数、中位数
-        for i in range(0, len(lines), 3):
-            if i + 2 < len(lines):
-                name = lines[i]
-                days = float(lines[i + 1])
-                data[name] = days
-
-        return data
+        return dict(DataParser.iter_mean_overdue_records(file_path))
 
     @staticmethod
     def parse_days_data(file_path: str) -> Dict[str, float]:
         """解析工作人天数据文件 - v2.4简化格式"""
-        data = {}
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-
         # 每3行为一组：姓名、实际工时（人天）、工时中位数
-        for i in range(0, len(lines), 3):
-            if i + 2 < len(lines):
-                name = lines[i]
-                work_days = float(lines[i + 1])  # 直接使用人天数据
-                data[name] = work_days
+        return dict(DataParser.iter_days_records(file_path))
 
-        return data
+    @staticmethod
+    def to_columns(data: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """将 姓名→数值 字典转换为列式数组(姓名, 数值)"""
+        import numpy as np
+        names = np.array(list(data.keys()), dtype=str)
+        values = np.fromiter(data.values(), dtype=np.float64, count=len(data))
+        return names, values
 
     @staticmethod
-    def validate_data(overdue_data: Dict[str, float],
-                     mean_overdue_data: Dict[str, float],
-                     days_data: Dict[str, float]) -> Tuple[bool, str]:
-        """验证数据的合理性"""
+    def join_columns(overdue: Tuple[np.ndarray, np.ndarray],
+                     mean_overdue: Tuple[np.ndarray, np.ndarray],
+                     days: Tuple[np.ndarray, np.ndarray]) -> "AlignedData":
+        """一次性按姓名连接三个数据集，输出对齐的列并记录各文件未匹配的员工
+
+        基于排序的连接(np.intersect1d)，避免逐人字典查找；每个数据集内姓名须唯一。
+        """
+        import numpy as np
+        overdue_names, overdue_values = overdue
+        mean_names, mean_values = mean_overdue
+        days_names, days_values = days
+
+        common, overdue_idx, mean_idx = np.intersect1d(
+            overdue_names, mean_names, assume_unique=True, return_indices=True)
+        names, common_idx, days_idx = np.intersect1d(
+            common, days_names, assume_unique=True, return_indices=True)
+
+        unmatched = {
+            kind: np.setdiff1d(kind_names, names, assume_unique=True).tolist()
+            for kind, kind_names in (("overdue", overdue_names),
+                                     ("mean_overdue", mean_names),
+                                     ("days", days_names))
+        }
+
+        return AlignedData(
+            names=names,
+            overdue_ratio=overdue_values[overdue_idx[common_idx]],
+            overdue_days=mean_values[mean_idx[common_idx]],
+            work_days=days_values[days_idx],
+            unmatched=unmatched
+        )
+
+    @staticmethod
+    def validate_columns(overdue: Tuple[np.ndarray, np.ndarray],
+                         mean_overdue: Tuple[np.ndarray, np.ndarray],
+                         days: Tuple[np.ndarray, np.ndarray],
+                         aligned: "AlignedData" = None) -> Tuple[bool, str]:
+        """验证列式数据的合理性；可传入已连接的结果避免重复连接"""
+        import numpy as np
 
         # 检查数据是否为空
-        if not overdue_data or not mean_overdue_data or not days_data:
+        if not len(overdue[0]) or not len(mean_overdue[0]) or not len(days[0]):
             return False, "存在空数据集"
 
         # 检查是否有交集
-        all_names = set(overdue_data.keys()) & set(mean_overdue_data.keys()) & set(days_data.keys())
-        if not all_names:
+        if aligned is None:
+            aligned = DataParser.join_columns(overdue, mean_overdue, days)
+        if not len(aligned.names):
             return False, "三个数据集没有共同的员工姓名"
 
         # 检查数据范围
-        for name, ratio in overdue_data.items():
-            if ratio < 0 or ratio > 100:
-                return False, f"逾期比例数据异常: {name} = {ratio}%"
+        checks = [
+            (overdue, (overdue[1] < 0) | (overdue[1] > 100), "逾期比例数据异常: {} = {}%"),
+            (mean_overdue, mean_overdue[1] < 0, "逾期天数数据异常: {} = {}天"),
+            (days, days[1] < 0, "工作人天数据异常: {} = {}人天"),
+        ]
+        for (names, values), invalid, message in checks:
+            invalid_idx = np.flatnonzero(invalid)
+            if invalid_idx.size:
+                first = invalid_idx[0]
+                return False, message.format(names[first], values[first].item())
 
-        for name, days in mean_overdue_data.items():
-            if days < 0:
-                return False, f"逾期天数数据异常: {name} = {days}天"
+        return True, "数据验证通过"
 
-        for name, work_days in days_data.items():
-            if work_days < 0:
-                return False, f"工作人天数据异常: {name} = {work_days}人天"
+    @staticmethod
+    def validate_data(overdue_data: Dict[str, float],
+                     mean_overdue_data: Dict[str, float],
+                     days_data: Dict[str, float]) -> Tuple[bool, str]:
+        """验证数据的合理性"""
+        return DataParser.validate_columns(
+            DataParser.to_columns(overdue_data),
+            DataParser.to_columns(mean_overdue_data),
+            DataParser.to_columns(days_data)
+        )
+
+class _ScoreLookupTable:
+    """按0.1天精度预计算的工作人天/逾期天数得分表（0-40天）
+
+    表值由精确的批量公式生成，仅对恰好落在网格上的输入查表，
+    因此查表结果与直接计算逐位一致；网格外或超出范围的输入回退到精确计算。
+    """
+
+    RESOLUTION = 10      # 每天10个网格点（0.1天精度）
+    MAX_DAYS = 40.0
+
+    def __init__(self, calculator: "ScoringCalculator"):
+        import numpy as np
+        self.fingerprint = calculator.config.fingerprint()
+        grid = np.arange(int(self.MAX_DAYS * self.RESOLUTION) + 1) / self.RESOLUTION
+        self.work_days_scores = calculator.calculate_batch_work_days_scores(grid)
+        self.overdue_days_scores = calculator.calculate_batch_overdue_days_scores(grid)
+
+    def lookup(self, table: np.ndarray, values: np.ndarray,
+               exact_func: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """查表取值，网格外的输入使用exact_func精确计算"""
+        import numpy as np
+        index = np.rint(values * self.RESOLUTION)
+        on_grid = (index >= 0) & (index < len(table)) & (index / self.RESOLUTION == values)
+        if on_grid.all():
+            return table[index.astype(np.intp)]
+
+        result = np.empty_like(values)
+        result[on_grid] = table[index[on_grid].astype(np.intp)]
+        off_grid = ~on_grid
+        result[off_grid] = exact_func(values[off_grid])
+        return result
+
+# 评分公式中的固定参数，scoring_rules.build_rule_spec据此生成规则，标量评分与解释编码同样引用
+OVERDUE_DAYS_BUFFER = 2.0                  # 逾期天数反比衰减的缓冲参数，确保极值情况下不为0
+LEAVE_FACTORS = ((1.0, 0.3), (3.0, 0.6))   # 请假调整 (工作人天上限, 综合得分保留比例)，按顺序匹配
+
+# 得分解释编码（uint8）：bit0=逾期比例超基准，bit1=逾期天数超基准，高位为工作量类别
+# 评分结果只保存编码，文字仅在显示或导出时按下列模板渲染
+EXPLAIN_RATIO_OVER = 1
+EXPLAIN_DAYS_OVER = 2
+EXPLAIN_WORK_SHIFT = 2
+EXPLAIN_RATIO_TEXT = ("✅ 逾期比例{ratio:.1f}%表现良好", "⚠️ 逾期比例{ratio:.1f}%超出基准({baseline:g}%)")
+EXPLAIN_DAYS_TEXT = ("✅ 逾期天数{days:.1f}天控制良好", "⚠️ 逾期天数{days:.1f}天超出基准({baseline:g}天)")
+EXPLAIN_WORK_TEXT = (
+    "🏠 请假状态{work:.1f}人天（评分已调整） | ⚠️ 逾期指标满分因无工作而不计入奖励",  # 0: 第一档请假调整
+    "📉 极低工作量{work:.1f}人天（评分已调整）",                                      # 1: 第二档请假调整
+    "📉 工作量{work:.1f}人天不足(标准{standard}人天)",                                # 2: 低于标准
+    "✅ 工作量{work:.1f}人天标准",                                                    # 3: 等于标准
+    "💪 工作量{work:.1f}人天优秀",                                                    # 4: 一级加分区间
+    "🔥 工作量{work:.1f}人天超高",                                                    # 5: 超高
+    "🔥 工作量{work:.1f}人天超高⚠️需核实人天记录",                                    # 6: 超高且需核实
+)
+
+# 检测结果编码（uint8）及共享文字表：批量检测只产生编码列，显示时按编码查表
+# 逾期模式：0=任务过载 1=工作态度问题 2=高效工作者 3=正常波动 4=需要进一步分析
+OVERDUE_PATTERN_REASONS = (
+    {"root_cause": "任务过载", "suggestion": "减少任务分配，优化排期"},
+    {"root_cause": "工作态度问题", "suggestion": "加强工作管理，提高责任心"},
+    {"root_cause": "高效工作者", "suggestion": "保持优秀表现，可作为榜样"},
+    {"root_cause": "正常波动", "suggestion": "继续保持，轻微改善即可"},
+    {"root_cause": "需要进一步分析", "suggestion": "结合具体情况分析原因"},
+)
+# 任务分配：0=无问题 1=严重过载 2=效率低下 3=轻微过载
+TASK_ASSIGNMENT_REASONS = (
+    {},
+    {"assignment_issue": "严重过载", "severity": "高", "action": "立即减少任务分配"},
+    {"assignment_issue": "效率低下", "severity": "中", "action": "调查原因，加强监督"},
+    {"assignment_issue": "轻微过载", "severity": "低", "action": "适当调整任务分配"},
+)
+# 工作量异常：0=无异常 1=严重异常 2=轻微异常（description按人天与偏离度格式化）
+WORKLOAD_ANOMALY_REASONS = (
+    {},
+    {"anomaly_type": "严重异常", "description": "工作量{work_days:.1f}人天，偏离团队平均{deviation:.1f}%",
+     "action": "立即调查原因"},
+    {"anomaly_type": "轻微异常", "description": "工作量{work_days:.1f}人天，偏离团队平均{deviation:.1f}%",
+     "action": "关注观察"},
+)
+# 绩效稳定性：0=数据不足 1=优秀 2=良好 3=不稳定
+STABILITY_LEVELS = ("数据不足", "优秀", "良好", "不稳定")
+REASON_TABLES = {
+    "overdue_pattern": OVERDUE_PATTERN_REASONS,
+    "task_assignment": TASK_ASSIGNMENT_REASONS,
+    "workload_anomaly": WORKLOAD_ANOMALY_REASONS,
+}
+
+
+def describe_reason(kind: str, code: int, **fields) -> Dict[str, str]:
+    """按编码查表生成检测结果字典；fields用于格式化带数值的文字（如工作量异常的description）"""
+    entry = REASON_TABLES[kind][int(code)]
+    return {key: text.format(**fields) if fields else text for key, text in entry.items()}
 
-        return True, "数据验证通过"
 
 class ScoringCalculator:
     """优化版评分计算器"""
 
-    def __init__(self, config: ScoringConfig = None):
+    def __init__(self, config: ScoringConfig = None, use_lookup: bool = False,
+                 cache_size: int = 1024):
         self.config = config or ScoringConfig()
+        # 查表模式：批量评分时工作人天/逾期天数得分改为数组索引，适合模拟与假设分析
+        self.use_lookup = use_lookup
+        self._lookup_table = None
+        self._compiled_rules = None
+        # 综合得分LRU缓存：键为(配置指纹编号, 逾期比例, 逾期天数, 工作人天)，cache_size=0时关闭
+        self.cache_size = cache_size
+        self._score_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._fingerprint_ids = {}
+        self._next_fingerprint_id = 0
+        self._cached_config = None
+        self._cached_version = -1
+        self._cached_fingerprint_id = 0
+
+    def _config_fingerprint_id(self) -> int:
+        """当前配置指纹对应的编号；仅在配置对象或版本变化时重新计算指纹"""
+        config = self.config
+        if config is not self._cached_config or config.version != self._cached_version:
+            fingerprint = config.fingerprint()
+            ids = self._fingerprint_ids
+            if fingerprint not in ids:
+                # 编号只被缓存条目引用：指纹数超过缓存容量时丢弃已没有缓存条目的指纹，
+                # 映射大小随LRU一起受cache_size限制；编号单调递增，不会与残留条目冲突
+                if len(ids) > self.cache_size:
+                    live = {key[0] for key in self._score_cache}
+                    self._fingerprint_ids = ids = {fp: i for fp, i in ids.items() if i in live}
+                ids[fingerprint] = self._next_fingerprint_id
+                self._next_fingerprint_id += 1
+            self._cached_fingerprint_id = ids[fingerprint]
+            self._cached_config = config
+            self._cached_version = config.version
+        return self._cached_fingerprint_id
+
+    def cache_info(self) -> Dict[str, int]:
+        """综合得分缓存的命中统计"""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._score_cache),
+            "maxsize": self.cache_size
+        }
+
+    def cache_clear(self):
+        """清空综合得分缓存及统计"""
+        self._score_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._fingerprint_ids.clear()
+        self._cached_config = None
+
+    def _get_lookup_table(self) -> _ScoreLookupTable:
+        """获取当前配置对应的查找表，配置变化后重建"""
+        table = self._lookup_table
+        if table is None or table.fingerprint != self.config.fingerprint():
+            table = self._lookup_table = _ScoreLookupTable(self)
+        return table
 
     def calculate_overdue_ratio_score(self, ratio: float) -> float:
         """计算逾期比例得分"""
@@ -209,7 +550,7 @@ class ScoringCalculator:
         # 超过基准线：使用递减函数，避免到达0分
         # 使用公式: 100 * (baseline + buffer) / (days + buffer)
         # buffer确保高逾期天数仍有非零分数
-        buffer = 2.0  # 缓冲参数，确保极值情况下不为0
+        buffer = OVERDUE_DAYS_BUFFER
         score = params["max_score"] * (baseline + buffer) / (days + buffer)
         return max(params["min_score"], round(score, 2))
 
@@ -265,7 +606,26 @@ class ScoringCalculator:
                                     overdue_days: float,
                                     work_days: float) -> Dict[str, float]:
         """计算综合得分 - v2.3.2版本（修复请假员工评分问题）"""
-
+        if self.cache_size <= 0:
+            return self._calculate_comprehensive_score(overdue_ratio, overdue_days, work_days)
+
+        key = (self._config_fingerprint_id(), overdue_ratio, overdue_days, work_days)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            self._cache_hits += 1
+            self._score_cache.move_to_end(key)
+            return dict(cached)
+
+        self._cache_misses += 1
+        scores = self._calculate_comprehensive_score(overdue_ratio, overdue_days, work_days)
+        self._score_cache[key] = scores
+        if len(self._score_cache) > self.cache_size:
+            self._score_cache.popitem(last=False)
+        return dict(scores)
+
+    def _calculate_comprehensive_score(self, overdue_ratio: float,
+                                       overdue_days: float,
+                                       work_days: float) -> Dict[str, float]:
         # 计算各项得分
         ratio_score = self.calculate_overdue_ratio_score(overdue_ratio)
         days_score = self.calculate_overdue_days_score(overdue_days)
@@ -280,25 +640,18 @@ class ScoringCalculator:
         )
 
         # v2.3.2修复：处理请假员工评分问题
-        # 当工作人天极低（<=1人天）时，应用额外惩罚
-        # 因为此时逾期指标的满分没有实际意义
-        if work_days <= 1.0:
-            # 请假或无工作状态：大幅降低综合得分
-            # 逾期表现不应奖励，因为根本没工作
-            penalty_factor = 0.3  # 保留30%的分数
-            comprehensive_score = comprehensive_score * penalty_factor
-
-        elif work_days <= 3.0:
-            # 极低工作量：适度降低综合得分
-            penalty_factor = 0.6  # 保留60%的分数
-            comprehensive_score = comprehensive_score * penalty_factor
+        # 请假或极低工作量时逾期指标的满分没有实际意义，按LEAVE_FACTORS保留部分分数
+        for max_work_days, penalty_factor in LEAVE_FACTORS:
+            if work_days <= max_work_days:
+                comprehensive_score = comprehensive_score * penalty_factor
+                break
 
         return {
             "overdue_ratio_score": round(ratio_score, 2),
             "overdue_days_score": round(days_score, 2),
             "work_days_score": round(work_days_score, 2),
             "comprehensive_score": round(comprehensive_score, 2),
-            "leave_adjustment": work_days <= 3.0  # 标记是否应用了请假调整
+            "leave_adjustment": work_days <= LEAVE_FACTORS[-1][0]  # 标记是否应用了请假调整
         }
 
     def get_grade(self, score: float) -> str:
@@ -319,45 +672,63 @@ class ScoringCalculator:
     def explain_score(self, overdue_ratio: float, overdue_days: float,
                      work_days: float) -> str:
         """解释评分详情 - v2.3.2版本（包含请假调整说明）"""
-        scores = self.calculate_comprehensive_score(overdue_ratio, overdue_days, work_days)
-        params = self.config.work_days_params
-
-        explanation = []
-
-        # 逾期比例分析
-        if overdue_ratio <= 20:
-            explanation.append(f"✅ 逾期比例{overdue_ratio:.1f}%表现良好")
-        else:
-            explanation.append(f"⚠️ 逾期比例{overdue_ratio:.1f}%超出基准(20%)")
-
-        # 逾期天数分析
-        if overdue_days <= 2:
-            explanation.append(f"✅ 逾期天数{overdue_days:.1f}天控制良好")
-        else:
-            explanation.append(f"⚠️ 逾期天数{overdue_days:.1f}天超出基准(2天)")
-
-        # 工作量分析 - v2.3.2版本逻辑
+        code = self.explain_code(overdue_ratio, overdue_days, work_days)
+        return self.render_explanation(code, overdue_ratio, overdue_days, work_days)
+
+    def explain_code(self, overdue_ratio: float, overdue_days: float, work_days: float) -> int:
+        """得分解释编码（见EXPLAIN_*常量），与explain_score的分支一一对应"""
+        config = self.config
+        params = config.work_days_params
+        code = 0
+        if not overdue_ratio <= config.overdue_ratio_params["baseline"]:
+            code |= EXPLAIN_RATIO_OVER
+        if not overdue_days <= config.overdue_days_params["baseline"]:
+            code |= EXPLAIN_DAYS_OVER
+
+        # 工作量类别 - v2.3.2版本逻辑（请假、极低工作量特殊处理）
+        (leave_days, _), (low_work_days, _) = LEAVE_FACTORS
         standard_days = params["standard_days"]  # 10人天
-        if work_days <= 1.0:
-            # v2.3.2修复：请假状态特殊处理
-            explanation.append(f"🏠 请假状态{work_days:.1f}人天（评分已调整）")
-            explanation.append(f"⚠️ 逾期指标满分因无工作而不计入奖励")
-        elif work_days <= 3.0:
-            # v2.3.2修复：极低工作量特殊处理
-            explanation.append(f"📉 极低工作量{work_days:.1f}人天（评分已调整）")
+        if work_days <= leave_days:
+            category = 0
+        elif work_days <= low_work_days:
+            category = 1
         elif work_days < standard_days:
-            explanation.append(f"📉 工作量{work_days:.1f}人天不足(标准{standard_days}人天)")
+            category = 2
         elif work_days == standard_days:
-            explanation.append(f"✅ 工作量{work_days:.1f}人天标准")
+            category = 3
         elif standard_days < work_days <= params["bonus_tier1_max"]:
-            explanation.append(f"💪 工作量{work_days:.1f}人天优秀")
+            category = 4
+        elif work_days > params["inflation_threshold"]:
+            category = 6
         else:
-            if work_days > params["inflation_threshold"]:
-                explanation.append(f"🔥 工作量{work_days:.1f}人天超高⚠️需核实人天记录")
-            else:
-                explanation.append(f"🔥 工作量{work_days:.1f}人天超高")
-
-        return " | ".join(explanation)
+            category = 5
+        return code | (category << EXPLAIN_WORK_SHIFT)
+
+    def render_explanation(self, code: int, overdue_ratio: float, overdue_days: float,
+                           work_days: float) -> str:
+        """将解释编码渲染为文字"""
+        code = int(code)
+        config = self.config
+        return " | ".join((
+            EXPLAIN_RATIO_TEXT[code & EXPLAIN_RATIO_OVER].format(
+                ratio=overdue_ratio, baseline=config.overdue_ratio_params["baseline"]),
+            EXPLAIN_DAYS_TEXT[(code & EXPLAIN_DAYS_OVER) >> 1].format(
+                days=overdue_days, baseline=config.overdue_days_params["baseline"]),
+            EXPLAIN_WORK_TEXT[code >> EXPLAIN_WORK_SHIFT].format(
+                work=work_days, standard=self.config.work_days_params["standard_days"]),
+        ))
+
+    def render_explanations(self, codes: np.ndarray, overdue_ratio: np.ndarray,
+                            overdue_days: np.ndarray, work_days: np.ndarray) -> List[str]:
+        """批量渲染解释文字，仅用于需要显示或导出的行"""
+        import numpy as np
+        return [
+            self.render_explanation(code, ratio, days, work)
+            for code, ratio, days, work in zip(np.asarray(codes).tolist(),
+                                               np.asarray(overdue_ratio, dtype=np.float64).tolist(),
+                                               np.asarray(overdue_days, dtype=np.float64).tolist(),
+                                               np.asarray(work_days, dtype=np.float64).tolist())
+        ]
 
     def needs_review(self, work_days: float) -> bool:
         """判断是否需要核实人天记录"""
@@ -367,6 +738,97 @@ class ScoringCalculator:
         """判断是否工作过载"""
         return work_days > self.config.work_days_params["overload_threshold"]
 
+    # ========== 批量向量化评分 ==========
+    def _get_compiled_rules(self):
+        """获取当前配置编译后的评分规则（见scoring_rules.py），配置变化后重新编译"""
+        rules = self._compiled_rules
+        fingerprint = self.config.fingerprint()
+        if rules is None or rules.fingerprint != fingerprint:
+            from scoring_rules import build_rule_spec, compile_rules
+            rules = self._compiled_rules = compile_rules(build_rule_spec(self.config), fingerprint)
+        return rules
+
+    def calculate_batch_overdue_ratio_scores(self, ratios: np.ndarray) -> np.ndarray:
+        """批量计算逾期比例得分（与calculate_overdue_ratio_score逐位一致）"""
+        return self._get_compiled_rules().score_component("overdue_ratio", ratios)
+
+    def calculate_batch_overdue_days_scores(self, days: np.ndarray) -> np.ndarray:
+        """批量计算逾期天数得分（与calculate_overdue_days_score逐位一致）"""
+        return self._get_compiled_rules().score_component("overdue_days", days)
+
+    def calculate_batch_work_days_scores(self, days: np.ndarray) -> np.ndarray:
+        """批量计算工作人天得分（与calculate_work_days_score逐位一致）"""
+        return self._get_compiled_rules().score_component("work_days", days)
+
+    def calculate_batch_explain_codes(self, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                                      work_days: np.ndarray) -> np.ndarray:
+        """批量计算得分解释编码（uint8，与explain_code逐个一致）"""
+        import numpy as np
+        config = self.config
+        params = config.work_days_params
+        overdue_ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        overdue_days = np.asarray(overdue_days, dtype=np.float64)
+        work_days = np.asarray(work_days, dtype=np.float64)
+
+        (leave_days, _), (low_work_days, _) = LEAVE_FACTORS
+        standard_days = params["standard_days"]
+        category = np.select(
+            [work_days <= leave_days, work_days <= low_work_days, work_days < standard_days,
+             work_days == standard_days, work_days <= params["bonus_tier1_max"],
+             work_days > params["inflation_threshold"]],
+            [0, 1, 2, 3, 4, 6],
+            default=5
+        ).astype(np.uint8)
+        codes = category << np.uint8(EXPLAIN_WORK_SHIFT)
+        codes |= (~(overdue_ratio <= config.overdue_ratio_params["baseline"])).astype(np.uint8) \
+            * np.uint8(EXPLAIN_RATIO_OVER)
+        codes |= (~(overdue_days <= config.overdue_days_params["baseline"])).astype(np.uint8) \
+            * np.uint8(EXPLAIN_DAYS_OVER)
+        return codes
+
+    def get_batch_grades(self, scores: np.ndarray) -> np.ndarray:
+        """批量获取等级"""
+        import numpy as np
+        return self._get_compiled_rules().grades(np.asarray(scores, dtype=np.float64))
+
+    def calculate_batch_scores(self, overdue_ratio: np.ndarray,
+                               overdue_days: np.ndarray,
+                               work_days: np.ndarray) -> Dict[str, np.ndarray]:
+        """批量计算综合得分、等级和标记 - 与逐人调用的标量路径结果逐位一致
+
+        返回列：各项得分、comprehensive_score、leave_adjustment、grade、explain_code、needs_review
+        """
+        import numpy as np
+        overdue_ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        overdue_days = np.asarray(overdue_days, dtype=np.float64)
+        work_days = np.asarray(work_days, dtype=np.float64)
+
+        ratio_score = self.calculate_batch_overdue_ratio_scores(overdue_ratio)
+        if self.use_lookup:
+            table = self._get_lookup_table()
+            days_score = table.lookup(table.overdue_days_scores, overdue_days,
+                                      self.calculate_batch_overdue_days_scores)
+            work_days_score = table.lookup(table.work_days_scores, work_days,
+                                           self.calculate_batch_work_days_scores)
+        else:
+            days_score = self.calculate_batch_overdue_days_scores(overdue_days)
+            work_days_score = self.calculate_batch_work_days_scores(work_days)
+
+        # 加权求和与v2.3.2请假调整（LEAVE_FACTORS）
+        rules = self._get_compiled_rules()
+        comprehensive_score = rules.combine(ratio_score, days_score, work_days_score, work_days)
+
+        return {
+            "overdue_ratio_score": _round_like_python(ratio_score),
+            "overdue_days_score": _round_like_python(days_score),
+            "work_days_score": _round_like_python(work_days_score),
+            "comprehensive_score": comprehensive_score,
+            "leave_adjustment": rules.leave_adjustment(work_days),
+            "grade": rules.grades(comprehensive_score),
+            "explain_code": self.calculate_batch_explain_codes(overdue_ratio, overdue_days, work_days),
+            "needs_review": work_days > self.config.work_days_params["inflation_threshold"]
+        }
+
     # ========== 目标1：逾期趋势分析和任务复杂度调整 ==========
     def calculate_overdue_trend_score(self, current_ratio: float, previous_ratios: List[float]) -> float:
         """计算逾期趋势得分 - 识别逾期是否在恶化或改善"""
@@ -395,59 +857,39 @@ class ScoringCalculator:
 
     def analyze_overdue_patterns(self, overdue_ratio: float, overdue_days: float, work_days: float) -> Dict[str, str]:
         """分析逾期模式，识别根本原因"""
-        patterns = {}
-
         # 高逾期+高工作量
         if overdue_ratio > 50 and work_days > 15:
-            patterns["root_cause"] = "任务过载"
-            patterns["suggestion"] = "减少任务分配，优化排期"
-
+            code = 0
         # 高逾期+低工作量
         elif overdue_ratio > 60 and work_days < 5:
-            patterns["root_cause"] = "工作态度问题"
-            patterns["suggestion"] = "加强工作管理，提高责任心"
-
+            code = 1
         # 低逾期+高工作量
         elif overdue_ratio <= 20 and work_days > 15:
-            patterns["root_cause"] = "高效工作者"
-            patterns["suggestion"] = "保持优秀表现，可作为榜样"
-
+            code = 2
         # 中等逾期+中等工作量
         elif 20 < overdue_ratio <= 40 and 8 <= work_days <= 12:
-            patterns["root_cause"] = "正常波动"
-            patterns["suggestion"] = "继续保持，轻微改善即可"
-
+            code = 3
         else:
-            patterns["root_cause"] = "需要进一步分析"
-            patterns["suggestion"] = "结合具体情况分析原因"
-
-        return patterns
+            code = 4
+        return describe_reason("overdue_pattern", code)
 
     # ========== 目标2：任务分配合理性检测和排期准确性评估 ==========
     def detect_task_assignment_issues(self, work_days: float, overdue_ratio: float) -> Dict[str, str]:
         """检测任务分配合理性"""
-        issues = {}
         thresholds = self.config.anomaly_thresholds
 
         # 过载检测
         if work_days > 20 and overdue_ratio > thresholds["overload_ratio"]:
-            issues["assignment_issue"] = "严重过载"
-            issues["severity"] = "高"
-            issues["action"] = "立即减少任务分配"
-
+            code = 1
         # 低效率检测
         elif work_days < 5 and overdue_ratio > thresholds["low_efficiency"]:
-            issues["assignment_issue"] = "效率低下"
-            issues["severity"] = "中"
-            issues["action"] = "调查原因，加强监督"
-
+            code = 2
         # 轻微过载
         elif work_days > 15 and overdue_ratio > 30:
-            issues["assignment_issue"] = "轻微过载"
-            issues["severity"] = "低"
-            issues["action"] = "适当调整任务分配"
-
-        return issues
+            code = 3
+        else:
+            code = 0
+        return describe_reason("task_assignment", code)
 
     def evaluate_estimation_accuracy(self, estimated_days: float, actual_days: float) -> Dict[str, any]:
         """评估排期准确性"""
@@ -475,27 +917,76 @@ class ScoringCalculator:
 
     def detect_workload_anomalies(self, work_days: float, team_average: float) -> Dict[str, str]:
         """检测工作量异常"""
-        anomalies = {}
-
         if team_average == 0:
-            return anomalies
+            return {}
 
         deviation = abs(work_days - team_average) / team_average
 
         if deviation > 1.0:  # 偏离团队平均100%以上
-            anomalies["anomaly_type"] = "严重异常"
-            anomalies["description"] = f"工作量{work_days:.1f}人天，偏离团队平均{deviation*100:.1f}%"
-            anomalies["action"] = "立即调查原因"
+            code = 1
         elif deviation > 0.5:  # 偏离团队平均50%以上
-            anomalies["anomaly_type"] = "轻微异常"
-            anomalies["description"] = f"工作量{work_days:.1f}人天，偏离团队平均{deviation*100:.1f}%"
-            anomalies["action"] = "关注观察"
-
-        return anomalies
+            code = 2
+        else:
+            code = 0
+        return describe_reason("workload_anomaly", code, work_days=work_days, deviation=deviation * 100)
+
+    # ========== 批量检测（uint8编码列，文字见REASON_TABLES） ==========
+    def analyze_batch_overdue_patterns(self, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                                       work_days: np.ndarray) -> np.ndarray:
+        """批量分析逾期模式，返回OVERDUE_PATTERN_REASONS编码（与analyze_overdue_patterns一致）"""
+        import numpy as np
+        ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        work = np.asarray(work_days, dtype=np.float64)
+        return np.select(
+            [(ratio > 50) & (work > 15), (ratio > 60) & (work < 5), (ratio <= 20) & (work > 15),
+             (ratio > 20) & (ratio <= 40) & (work >= 8) & (work <= 12)],
+            [0, 1, 2, 3],
+            default=4
+        ).astype(np.uint8)
+
+    def detect_batch_task_assignment_issues(self, work_days: np.ndarray,
+                                            overdue_ratio: np.ndarray) -> np.ndarray:
+        """批量检测任务分配合理性，返回TASK_ASSIGNMENT_REASONS编码"""
+        import numpy as np
+        thresholds = self.config.anomaly_thresholds
+        work = np.asarray(work_days, dtype=np.float64)
+        ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        return np.select(
+            [(work > 20) & (ratio > thresholds["overload_ratio"]),
+             (work < 5) & (ratio > thresholds["low_efficiency"]),
+             (work > 15) & (ratio > 30)],
+            [1, 2, 3],
+            default=0
+        ).astype(np.uint8)
+
+    def detect_batch_workload_anomalies(self, work_days: np.ndarray,
+                                        team_average) -> np.ndarray:
+        """批量检测工作量异常，team_average可为标量或逐人数组，返回WORKLOAD_ANOMALY_REASONS编码"""
+        import numpy as np
+        work = np.asarray(work_days, dtype=np.float64)
+        average = np.broadcast_to(np.asarray(team_average, dtype=np.float64), work.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = np.abs(work - average) / average
+        valid = average != 0
+        return np.select([valid & (deviation > 1.0), valid & (deviation > 0.5)],
+                         [1, 2], default=0).astype(np.uint8)
+
+    def describe_workload_anomalies(self, codes: np.ndarray, work_days: np.ndarray,
+                                    team_average) -> List[Dict[str, str]]:
+        """将工作量异常编码渲染为与detect_workload_anomalies相同的字典，仅用于需要显示的行"""
+        import numpy as np
+        work = np.asarray(work_days, dtype=np.float64)
+        average = np.broadcast_to(np.asarray(team_average, dtype=np.float64), work.shape)
+        return [
+            describe_reason("workload_anomaly", code, work_days=w,
+                            deviation=abs(w - avg) / avg * 100) if code else {}
+            for code, w, avg in zip(np.asarray(codes).tolist(), work.tolist(), average.tolist())
+        ]
 
     # ========== 目标3：稳定性指标和紧急任务处理能力评估 ==========
     def calculate_performance_stability(self, historical_scores: List[float]) -> Dict[str, any]:
         """计算绩效稳定性"""
+        import numpy as np
         if len(historical_scores) < 3:
             return {"stability": "数据不足", "stability_score": 0.0}
 
@@ -520,6 +1011,33 @@ class ScoringCalculator:
             "avg_score": avg_score
         }
 
+    def calculate_batch_overdue_trend_scores(self, current_ratio: np.ndarray, previous_avg: np.ndarray,
+                                             previous_count: np.ndarray) -> np.ndarray:
+        """批量逾期趋势得分：由历史逾期比例均值与期数直接计算（无历史时为0）"""
+        import numpy as np
+        params = self.config.overdue_ratio_params
+        diff = np.asarray(current_ratio, dtype=np.float64) - np.asarray(previous_avg, dtype=np.float64)
+        penalty = np.minimum(diff * params["trend_penalty"], params["trend_penalty"])
+        bonus = np.minimum(-diff * params["trend_bonus"], params["trend_bonus"])
+        scores = np.select([diff > 0, diff < 0], [-penalty, bonus], default=0.0)
+        return np.where(np.asarray(previous_count) > 0, scores, 0.0)
+
+    def calculate_batch_stability(self, std_dev: np.ndarray,
+                                  count: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量绩效稳定性：由历史得分标准差与期数计算，返回(STABILITY_LEVELS编码, 稳定性得分)"""
+        import numpy as np
+        params = self.config.stability_params
+        std_dev = np.asarray(std_dev, dtype=np.float64)
+        enough = np.asarray(count) >= 3
+        levels = np.select(
+            [~enough, std_dev <= params["excellent_threshold"], std_dev <= params["good_threshold"]],
+            [0, 1, 2],
+            default=3
+        ).astype(np.uint8)
+        level_scores = np.array([0.0, params["bonus_excellent"], params["bonus_good"],
+                                 -params["penalty_unstable"]])
+        return levels, level_scores[levels]
+
     def evaluate_urgency_handling(self, urgent_tasks_completed: int, urgent_tasks_total: int) -> Dict[str, any]:
         """评估紧急任务处理能力"""
         if urgent_tasks_total == 0:
@@ -601,96 +1119,522 @@ class ScoringCalculator:
             "enhanced_score": round(enhanced_score, 2)
         }
 
+    def calculate_batch_enhanced_scores(self, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                                        work_days: np.ndarray, complexity=None,
+                                        previous_ratios: np.ndarray = None,
+                                        historical_scores: np.ndarray = None,
+                                        urgent_tasks_completed: np.ndarray = None,
+                                        urgent_tasks_total: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """批量计算增强版综合得分 - 与逐人调用calculate_enhanced_comprehensive_score结果一致
+
+        complexity: 复杂度标签（pandas Categorical或标签数组，缺省为"中等"）
+        previous_ratios/historical_scores: 员工数×N的历史矩阵，每行按时间右对齐、缺失为NaN
+            （如HistoryStore.recent_matrix的结果）
+        urgent_tasks_completed/urgent_tasks_total: 紧急任务完成数与总数（整数数组）
+        """
+        import numpy as np
+        import pandas as pd
+        overdue_ratio = np.asarray(overdue_ratio, dtype=np.float64)
+        n = len(overdue_ratio)
+        base = self.calculate_batch_scores(overdue_ratio, overdue_days, work_days)
+
+        # 任务复杂度调整：按类别查表，每个类别只查一次
+        if complexity is None:
+            factor = np.full(n, self.config.complexity_params.get("中等", 1.0))
+        else:
+            categorical = pd.Categorical(complexity)
+            category_factors = np.array([self.config.complexity_params.get(label, 1.0)
+                                         for label in categorical.categories] + [1.0])
+            factor = category_factors[categorical.codes]  # 缺失标签(code=-1)取最后的1.0
+        adjusted_ratio_score = self.calculate_batch_overdue_ratio_scores(overdue_ratio * factor)
+
+        # 逾期趋势与稳定性
+        trend_score = np.zeros(n)
+        if previous_ratios is not None:
+            count, total, _ = _history_row_stats(previous_ratios, with_std=False)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                previous_avg = np.where(count > 0, total / count, 0.0)
+            trend_score = self.calculate_batch_overdue_trend_scores(overdue_ratio, previous_avg, count)
+        stability_score = np.zeros(n)
+        if historical_scores is not None:
+            count, _, std_dev = _history_row_stats(historical_scores, with_std=True)
+            _, stability_score = self.calculate_batch_stability(std_dev, count)
+
+        # 紧急任务处理
+        urgency_score = np.zeros(n)
+        if urgent_tasks_total is not None:
+            total = np.asarray(urgent_tasks_total, dtype=np.int64)
+            completed = np.asarray(urgent_tasks_completed if urgent_tasks_completed is not None
+                                   else np.zeros(n), dtype=np.int64)
+            params = self.config.urgency_params
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rate = completed / total
+            urgency_score = np.select(
+                [total <= 0, rate >= params["excellent_rate"], rate >= params["good_rate"]],
+                [0.0, params["bonus_excellent"], params["bonus_good"]],
+                default=-params["penalty_poor"]
+            )
+
+        enhanced_score = base["comprehensive_score"] + trend_score + stability_score + urgency_score
+        return {
+            "overdue_ratio_score": base["overdue_ratio_score"],
+            "overdue_days_score": base["overdue_days_score"],
+            "work_days_score": base["work_days_score"],
+            "adjusted_ratio_score": _round_like_python(adjusted_ratio_score),
+            "trend_score": _round_like_python(trend_score),
+            "stability_score": _round_like_python(np.asarray(stability_score, dtype=np.float64)),
+            "urgency_score": _round_like_python(urgency_score),
+            "comprehensive_score": base["comprehensive_score"],
+            "enhanced_score": _round_like_python(enhanced_score)
+        }
+
+
+def _history_row_stats(matrix: np.ndarray, with_std: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """历史矩阵（每行右对齐、缺失为NaN）的逐行期数、累加和与总体标准差
+
+    累加和按列顺序逐期相加，与内置sum()的求和顺序一致；标准差按期数分组后对连续的有效列调用np.std，
+    与对单个列表调用np.std一致。
+    """
+    import numpy as np
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    valid = ~np.isnan(matrix)
+    count = valid.sum(axis=1)
+    total = np.zeros(len(matrix))
+    for column in range(matrix.shape[1]):
+        total += np.where(valid[:, column], matrix[:, column], 0.0)
+
+    std_dev = np.zeros(len(matrix))
+    if with_std:
+        width = matrix.shape[1]
+        for periods in np.unique(count[count > 0]).tolist():
+            rows = np.flatnonzero(count == periods)
+            std_dev[rows] = np.std(np.ascontiguousarray(matrix[rows, width - periods:]), axis=1)
+    return count, total, std_dev
+
+
+def _select_smallest(keys: np.ndarray, k: int) -> np.ndarray:
+    """选出keys中最小的k个位置并按(键, 位置)升序返回，等价于稳定排序后取前k个
+
+    先用np.partition求出第k小的键值，严格更小的元素全部入选，与之相等的按位置补足，
+    只对入选的k个元素排序，整体为O(n + k log k)。
+    """
+    import numpy as np
+    n = len(keys)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        kth = np.partition(keys, k - 1)[k - 1]
+        strict = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[:k - len(strict)]
+        candidates = np.concatenate([strict, ties])
+    else:
+        candidates = np.arange(n)
+    return candidates[np.lexsort((candidates, keys[candidates]))]
+
+
+class StatisticsAccumulator:
+    """分块累积的评分统计 - 每块数据只遍历一次，不生成中间DataFrame
+
+    均值、计数和分档直接累加；中位数按取值计数精确计算（得分保留两位小数、人天为0.1精度，
+    不同取值数量有限），因此超大规模数据可以分块输入，内存占用与总人数无关。
+    名单类统计（Highlight、Lowlight、需核实）按需保留姓名。
+    """
+
+    GRADES = ("S", "A", "B", "C", "D")
+    # 工作量分档：<8、8-10、10-15、>15人天
+    WORK_DAY_BANDS = ("工作量不足(<8人天)", "理想区间(8-10人天)",
+                      "优秀表现(10-15人天)", "超高产出(>15人天)")
+
+    def __init__(self):
+        self.count = 0
+        self.score_sum = 0.0
+        self.score_min = None
+        self.score_max = None
+        self.score_counts = {}
+        self.grade_counts = dict.fromkeys(self.GRADES, 0)
+        self.highlight_names = []
+        self.lowlight_names = []
+        self.review_names = []
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+        self.overdue_days_sum = 0.0
+        self.overdue_days_count = 0
+        self.high_ratio_count = 0
+        self.long_overdue_count = 0
+        self.work_days_sum = 0.0
+        self.work_days_counts = {}
+        self.band_counts = [0, 0, 0, 0]
+
+    @staticmethod
+    def _merge_value_counts(counts: Dict[float, int], values: np.ndarray):
+        import numpy as np
+        unique, unique_counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        for value, count in zip(unique.tolist(), unique_counts.tolist()):
+            counts[value] = counts.get(value, 0) + count
+
+    @staticmethod
+    def _median_from_counts(counts: Dict[float, int]) -> float:
+        total = sum(counts.values())
+        if total == 0:
+            return float("nan")
+        lower_pos, upper_pos = (total - 1) // 2, total // 2
+        lower = upper = None
+        seen = 0
+        for value in sorted(counts):
+            seen += counts[value]
+            if lower is None and seen > lower_pos:
+                lower = value
+            if seen > upper_pos:
+                upper = value
+                break
+        return (lower + upper) / 2
+
+    def update(self, chunk: pd.DataFrame):
+        """累积一块评分结果（需包含name、comprehensive_score、grade、needs_review及三项输入列）"""
+        import numpy as np
+        if not len(chunk):
+            return
+        names = chunk["name"].to_numpy()
+        scores = chunk["comprehensive_score"].to_numpy(dtype=np.float64)
+        grades = chunk["grade"].to_numpy()
+        review = chunk["needs_review"].to_numpy(dtype=bool)
+        ratios = chunk["overdue_ratio"].to_numpy(dtype=np.float64)
+        overdue_days = chunk["overdue_days"].to_numpy(dtype=np.float64)
+        work_days = chunk["work_days"].to_numpy(dtype=np.float64)
+
+        self.count += len(chunk)
+
+        # 综合得分
+        valid_scores = scores[~np.isnan(scores)]
+        if valid_scores.size:
+            self.score_sum += valid_scores.sum()
+            chunk_min, chunk_max = valid_scores.min(), valid_scores.max()
+            self.score_min = chunk_min if self.score_min is None else min(self.score_min, chunk_min)
+            self.score_max = chunk_max if self.score_max is None else max(self.score_max, chunk_max)
+        self._merge_value_counts(self.score_counts, scores)
+
+        # 等级分布与名单
+        unique_grades, grade_counts = np.unique(grades, return_counts=True)
+        for grade, count in zip(unique_grades.tolist(), grade_counts.tolist()):
+            self.grade_counts[grade] = self.grade_counts.get(grade, 0) + count
+        self.highlight_names.extend(names[grades == "S"].tolist())
+        self.lowlight_names.extend(names[grades == "D"].tolist())
+        self.review_names.extend(names[review].tolist())
+
+        # 逾期分析
+        valid_ratios = ratios[~np.isnan(ratios)]
+        self.ratio_sum += valid_ratios.sum()
+        self.ratio_count += valid_ratios.size
+        valid_days = overdue_days[~np.isnan(overdue_days)]
+        self.overdue_days_sum += valid_days.sum()
+        self.overdue_days_count += valid_days.size
+        self.high_ratio_count += int((ratios > 50).sum())
+        self.long_overdue_count += int((overdue_days > 5).sum())
+
+        # 工作量分析：一次分档计数
+        valid_work = work_days[~np.isnan(work_days)]
+        self.work_days_sum += valid_work.sum()
+        self._merge_value_counts(self.work_days_counts, work_days)
+        bands = (valid_work >= 8).astype(np.int8) + (valid_work > 10) + (valid_work > 15)
+        for band, count in enumerate(np.bincount(bands, minlength=4).tolist()):
+            self.band_counts[band] += count
+
+    def result(self) -> Dict:
+        """生成与analyze_statistics相同结构的统计结果"""
+        work_days_count = sum(self.work_days_counts.values())
+        score_count = sum(self.score_counts.values())
+
+        def mean(total, count):
+            return round(total / count, 2) if count else float("nan")
+
+        grade_distribution = {grade: count for grade, count in self.grade_counts.items() if count}
+        grade_distribution = dict(sorted(grade_distribution.items(), key=lambda item: -item[1]))
+
+        return {
+            "总人数": self.count,
+            "平均综合得分": mean(self.score_sum, score_count),
+            "得分中位数": round(self._median_from_counts(self.score_counts), 2),
+            "最高分": self.score_max,
+            "最低分": self.score_min,
+            "等级分布": grade_distribution,
+            "Highlight候选": list(self.highlight_names),
+            "Lowlight需关注": list(self.lowlight_names),
+            "需核实人天": list(self.review_names),
+            "逾期分析": {
+                "平均逾期比例": mean(self.ratio_sum, self.ratio_count),
+                "平均逾期天数": mean(self.overdue_days_sum, self.overdue_days_count),
+                "逾期比例>50%": self.high_ratio_count,
+                "逾期天数>5天": self.long_overdue_count
+            },
+            "工作量分析": {
+                "平均人天": mean(self.work_days_sum, work_days_count),
+                "人天中位数": round(self._median_from_counts(self.work_days_counts), 2),
+                **dict(zip(self.WORK_DAY_BANDS, self.band_counts)),
+                "需核实记录(>15人天)": len(self.review_names)
+            }
+        }
+
 class DataProcessor:
     """数据处理器"""
 
-    def __init__(self, config: ScoringConfig = None):
+    def __init__(self, config: ScoringConfig = None, cache=None):
         self.calculator = ScoringCalculator(config)
         self.parser = DataParser()
+        self.cache = cache  # 可选的解析结果缓存（parse_cache.ParsedDataCache）
+
+    def load_columns(self, file_path: str, kind: str,
+                      parse_func: Callable[[str], Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """解析数据文件为列式数组，配置了缓存时优先读取缓存"""
+        if self.cache is None:
+            return self.parser.to_columns(parse_func(file_path))
+        return self.cache.load_columns(file_path, kind, parse_func)
 
     def process_files(self, overdue_file: str, mean_overdue_file: str,
-                     days_file: str) -> pd.DataFrame:
-        """处理三个数据文件并生成评分结果"""
+                     days_file: str, verbose: bool = True, rank: bool = True) -> pd.DataFrame:
+        """处理三个数据文件并生成评分结果；verbose=False时不打印验证信息，
+        rank=False时跳过整体排序（只需Top/Bottom名单时配合select_top/select_bottom使用）"""
 
-        # 解析三个文件
-        overdue_data = self.parser.parse_overdue_data(overdue_file)
-        mean_overdue_data = self.parser.parse_mean_overdue_data(mean_overdue_file)
-        days_data = self.parser.parse_days_data(days_file)
+        aligned = self.load_aligned_data(overdue_file, mean_overdue_file, days_file, verbose)
+        return self.score_aligned_data(aligned, rank)
+
+    def load_aligned_data(self, overdue_file: str, mean_overdue_file: str,
+                          days_file: str, verbose: bool = True) -> AlignedData:
+        """解析、连接并验证三个数据文件，返回对齐的列式数据"""
 
-        # 验证数据
-        is_valid, message = self.parser.validate_data(overdue_data, mean_overdue_data, days_data)
+        # 解析三个文件
+        overdue = self.load_columns(overdue_file, "overdue", self.parser.parse_overdue_data)
+        mean_overdue = self.load_columns(mean_overdue_file, "mean_overdue", self.parser.parse_mean_overdue_data)
+        days = self.load_columns(days_file, "days", self.parser.parse_days_data)
+        return self.align_columns(overdue, mean_overdue, days, verbose)
+
+    def load_aligned_table(self, input_file: str, verbose: bool = True) -> AlignedData:
+        """读取单个合并文件（CSV/Parquet/Arrow-IPC），返回与load_aligned_data相同的对齐数据"""
+        from table_input import read_metric_columns
+        columns = read_metric_columns(input_file)
+        return self.align_columns(columns["overdue"], columns["mean_overdue"], columns["days"], verbose)
+
+    def process_table(self, input_file: str, verbose: bool = True, rank: bool = True) -> pd.DataFrame:
+        """处理单个合并文件并生成评分结果"""
+        return self.score_aligned_data(self.load_aligned_table(input_file, verbose), rank)
+
+    def align_columns(self, overdue: Tuple[np.ndarray, np.ndarray],
+                      mean_overdue: Tuple[np.ndarray, np.ndarray],
+                      days: Tuple[np.ndarray, np.ndarray], verbose: bool = True) -> AlignedData:
+        """连接并验证三组列式数据"""
+        # 一次性连接三个数据集并验证
+        aligned = self.parser.join_columns(overdue, mean_overdue, days)
+        is_valid, message = self.parser.validate_columns(overdue, mean_overdue, days, aligned)
         if not is_valid:
             raise ValueError(f"数据验证失败: {message}")
 
-        print(f"数据验证: {message}")
-
-        # 获取所有员工名单（取交集）
-        all_names = set(overdue_data.keys()) & set(mean_overdue_data.keys()) & set(days_data.keys())
-
-        results = []
-        for name in all_names:
-            # 获取每个员工的三项数据
-            overdue_ratio = overdue_data[name]
-            overdue_days = mean_overdue_data[name]
-            work_days = days_data[name]
+        if verbose:
+            print(f"数据验证: {message}")
+            self._report_unmatched(aligned)
+
+        return aligned
+
+    def _report_unmatched(self, aligned: AlignedData):
+        """提示未能在三个文件间匹配的员工"""
+        labels = {"overdue": "逾期比例", "mean_overdue": "逾期天数", "days": "工作人天"}
+        for kind, names in aligned.unmatched.items():
+            if names:
+                preview = ", ".join(names[:10]) + (" ..." if len(names) > 10 else "")
+                print(f"⚠️  {labels.get(kind, kind)}数据中有{len(names)}人未在其他文件中匹配: {preview}")
+
+    def score_aligned_data(self, aligned: AlignedData, rank: bool = True,
+                           scores: Dict[str, np.ndarray] = None) -> pd.DataFrame:
+        """对已对齐的列式数据批量评分并生成排名结果；rank=False时保持输入顺序、不排序
+
+        scores为已由calculate_batch_scores算好的得分（如评分服务合并多个请求后拆分的结果），默认现算。
+        """
+        import pandas as pd
+        overdue_ratio = aligned.overdue_ratio
+        overdue_days = aligned.overdue_days
+        work_days = aligned.work_days
+
+        # 批量计算得分
+        # 解释只保存uint8编码，文字由render_explanations按需生成
+        if scores is None:
+            scores = self.calculator.calculate_batch_scores(overdue_ratio, overdue_days, work_days)
+
+        results = {
+            "name": aligned.names.tolist(),
+            "overdue_ratio": overdue_ratio,
+            "overdue_days": overdue_days,
+            "work_days": work_days,
+            "overdue_ratio_score": scores["overdue_ratio_score"],
+            "overdue_days_score": scores["overdue_days_score"],
+            "work_days_score": scores["work_days_score"],
+            "comprehensive_score": scores["comprehensive_score"],
+            "leave_adjustment": scores["leave_adjustment"],
+            "grade": scores["grade"],
+            "explain_code": scores["explain_code"],
+            "needs_review": scores["needs_review"]
+        }
 
-            # 计算得分
-            scores = self.calculator.calculate_comprehensive_score(
-                overdue_ratio, overdue_days, work_days
-            )
+        # 转换为DataFrame，追加团队工作量异常列（按姓名顺序聚合，保证结果与输入顺序无关）
+        df = self.add_workload_anomalies(pd.DataFrame(results))
 
-            grade = self.calculator.get_grade(scores["comprehensive_score"])
-            explanation = self.calculator.explain_score(overdue_ratio, overdue_days, work_days)
-            needs_review = self.calculator.needs_review(work_days)
-
-            result = {
-                "name": name,
-                "overdue_ratio": overdue_ratio,
-                "overdue_days": overdue_days,
-                "work_days": work_days,
-                **scores,
-                "grade": grade,
-                "explanation": explanation,
-                "needs_review": needs_review
-            }
-            results.append(result)
-
-        # 转换为DataFrame并排序
-        df = pd.DataFrame(results)
-        df = df.sort_values("comprehensive_score", ascending=False).reset_index(drop=True)
-        df.index += 1  # 排名从1开始
+        # 排序（稳定排序，同分保持输入顺序，与select_top/select_bottom一致）
+        if rank:
+            df = df.sort_values("comprehensive_score", ascending=False, kind="mergesort").reset_index(drop=True)
+            df.index += 1  # 排名从1开始
 
         return df
 
+    def render_explanations(self, df: pd.DataFrame) -> pd.DataFrame:
+        """将explain_code列渲染为explanation文字列（原位置替换），返回新的DataFrame
+
+        只对传入的行渲染，显示或导出部分行时先筛选再调用。
+        """
+        explanations = self.calculator.render_explanations(
+            df["explain_code"], df["overdue_ratio"], df["overdue_days"], df["work_days"])
+        rendered = df.copy()
+        position = rendered.columns.get_loc("explain_code")
+        rendered.insert(position, "explanation", explanations)
+        return rendered.drop(columns="explain_code")
+
+    def add_workload_anomalies(self, df: pd.DataFrame, group_by: List[str] = None) -> pd.DataFrame:
+        """团队工作量异常检测 - 分组聚合一次得到各团队统计量，逐人偏离度一次向量化完成
+
+        group_by为None时整张表视为一个团队；多团队结果可按["team", "period"]等列分组，
+        分组列缺失（NaN）的人员归为单独的一组，不会被丢弃。
+        追加列：
+          team_work_mean/median/mad/var   团队人天均值、中位数、绝对中位差(MAD)、方差
+          work_days_deviation             相对团队均值的偏离度 |人天-均值|/均值
+          work_days_robust_z              稳健z分数 (人天-中位数)/(1.4826×MAD)
+          workload_anomaly                工作量异常编码（WORKLOAD_ANOMALY_REASONS）
+          team_workload_uneven            团队人天变异系数超过anomaly_thresholds["workload_variance"]
+        """
+        import numpy as np
+        work = df["work_days"].to_numpy(dtype=np.float64)
+        if group_by is None:
+            groups = np.zeros(len(work), dtype=np.intp)
+        else:
+            groups = df.groupby(group_by, sort=False, dropna=False).ngroup().to_numpy()
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+        counts = np.bincount(groups, minlength=n_groups)
+
+        # 均值与方差：按组求和
+        mean = np.bincount(groups, weights=work, minlength=n_groups) / counts
+        var = np.bincount(groups, weights=(work - mean[groups]) ** 2, minlength=n_groups) / counts
+
+        # 中位数与MAD：按(组, 值)排序一次，各组中位数直接按下标取出
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+
+        def grouped_median(values):
+            sorted_values = values[np.lexsort((values, groups))]
+            lower = sorted_values[starts + (counts - 1) // 2]
+            upper = sorted_values[starts + counts // 2]
+            return (lower + upper) / 2
+
+        median = grouped_median(work)
+        mad = grouped_median(np.abs(work - median[groups]))
+
+        row_mean, row_median, row_mad = mean[groups], median[groups], mad[groups]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = np.where(row_mean != 0, np.abs(work - row_mean) / row_mean, 0.0)
+            robust_z = np.where(row_mad != 0, (work - row_median) / (1.4826 * row_mad), 0.0)
+            variation = np.where(mean != 0, np.sqrt(var) / mean, 0.0)
+
+        result = df.copy()
+        result["team_work_mean"] = row_mean
+        result["team_work_median"] = row_median
+        result["team_work_mad"] = row_mad
+        result["team_work_var"] = var[groups]
+        result["work_days_deviation"] = deviation
+        result["work_days_robust_z"] = robust_z
+        result["workload_anomaly"] = self.calculator.detect_batch_workload_anomalies(work, row_mean)
+        result["team_workload_uneven"] = (variation > self.calculator.config.anomaly_thresholds["workload_variance"])[groups]
+        return result
+
+    def add_enhanced_scores(self, df: pd.DataFrame, attributes: pd.DataFrame = None,
+                            history=None, window: int = 6) -> pd.DataFrame:
+        """增强版评分流水线 - 一次向量化调用追加复杂度、趋势、稳定性和紧急任务各项得分
+
+        attributes: 扩展属性表（name列，可含complexity、urgent_tasks_completed、urgent_tasks_total），
+            未列出的员工按默认值（复杂度"中等"、无紧急任务）处理
+        history: history_store.HistoryStore，取每人最近window期的逾期比例与综合得分；
+            应在本期结果追加到历史库之前调用
+        追加列：adjusted_ratio_score、trend_score、stability_score、urgency_score、enhanced_score
+        """
+        import numpy as np
+        import pandas as pd
+        names = df["name"].astype(str).tolist()
+        complexity = urgent_completed = urgent_total = None
+        if attributes is not None:
+            attrs = attributes.drop_duplicates("name", keep="last").set_index("name").reindex(names)
+            if "complexity" in attrs:
+                complexity = pd.Categorical(attrs["complexity"].fillna("中等"))
+            if "urgent_tasks_total" in attrs:
+                urgent_total = attrs["urgent_tasks_total"].fillna(0).to_numpy(dtype=np.int64)
+                urgent_completed = attrs.get("urgent_tasks_completed", pd.Series(0, index=attrs.index))
+                urgent_completed = urgent_completed.fillna(0).to_numpy(dtype=np.int64)
+
+        previous_ratios = historical_scores = None
+        if history is not None:
+            previous_ratios = history.recent_matrix("overdue_ratio", window, names)[1]
+            historical_scores = history.recent_matrix("comprehensive_score", window, names)[1]
+
+        enhanced = self.calculator.calculate_batch_enhanced_scores(
+            df["overdue_ratio"].to_numpy(dtype=np.float64), df["overdue_days"].to_numpy(dtype=np.float64),
+            df["work_days"].to_numpy(dtype=np.float64), complexity, previous_ratios, historical_scores,
+            urgent_completed, urgent_total)
+
+        result = df.copy()
+        for column in ("adjusted_ratio_score", "trend_score", "stability_score", "urgency_score", "enhanced_score"):
+            result[column] = enhanced[column]
+        return result
+
+    def select_top(self, df: pd.DataFrame, k: int = 3) -> pd.DataFrame:
+        """选出得分最高的k人（按得分降序，索引为排名），无需对整表排序
+
+        结果与完整排名表的head(k)一致；df可以是已排序或未排序(rank=False)的评分结果。
+        """
+        scores = df["comprehensive_score"].to_numpy(dtype=float)
+        positions = _select_smallest(-scores, k)
+        top = df.iloc[positions].copy()
+        top.index = range(1, len(top) + 1)
+        return top
+
+    def select_bottom(self, df: pd.DataFrame, k: int = 3) -> pd.DataFrame:
+        """选出得分最低的k人（按得分降序，索引为排名），结果与完整排名表的tail(k)一致"""
+        scores = df["comprehensive_score"].to_numpy(dtype=float)
+        n = len(scores)
+        # 在逆序数组上选最小值，同分时靠后的记录优先入选，与稳定降序排序的末尾一致
+        positions = n - 1 - _select_smallest(scores[::-1], k)
+        bottom = df.iloc[positions[::-1]].copy()
+        bottom.index = range(n - len(bottom) + 1, n + 1)
+        return bottom
+
+    def select_grade_boundaries(self, df: pd.DataFrame, margin: float = 2.0) -> Dict[str, pd.DataFrame]:
+        """选出各等级门槛附近（门槛±margin分内）的人员，按得分降序
+
+        返回 {等级: DataFrame}，用于校准前复核"差一点升/降级"的名单；
+        仅对入选人员排序，并附加distance_to_cutoff列（得分减门槛，负数表示差多少分达到该等级）。
+        """
+        import numpy as np
+        scores = df["comprehensive_score"].to_numpy(dtype=float)
+        boundaries = {}
+        for grade, cutoff in self.calculator.config.grade_thresholds.items():
+            positions = np.flatnonzero((scores >= cutoff - margin) & (scores < cutoff + margin))
+            positions = positions[np.lexsort((positions, -scores[positions]))]
+            members = df.iloc[positions].copy()
+            members["distance_to_cutoff"] = np.round(scores[positions] - cutoff, 2)
+            boundaries[grade] = members
+        return boundaries
+
     def analyze_statistics(self, df: pd.DataFrame) -> Dict:
-        """分析统计信息"""
-        stats = {
-            "总人数": len(df),
-            "平均综合得分": round(df["comprehensive_score"].mean(), 2),
-            "得分中位数": round(df["comprehensive_score"].median(), 2),
-            "最高分": df["comprehensive_score"].max(),
-            "最低分": df["comprehensive_score"].min(),
-            "等级分布": df["grade"].value_counts().to_dict(),
-            "Highlight候选": df[df["grade"] == "S"]["name"].tolist(),
-            "Lowlight需关注": df[df["grade"] == "D"]["name"].tolist(),
-            "需核实人天": df[df["needs_review"] == True]["name"].tolist(),
-            "逾期分析": {
-                "平均逾期比例": round(df["overdue_ratio"].mean(), 2),
-                "平均逾期天数": round(df["overdue_days"].mean(), 2),
-                "逾期比例>50%": len(df[df["overdue_ratio"] > 50]),
-                "逾期天数>5天": len(df[df["overdue_days"] > 5])
-            },
-            "工作量分析": {
-                "平均人天": round(df["work_days"].mean(), 2),
-                "人天中位数": round(df["work_days"].median(), 2),
-                "工作量不足(<8人天)": len(df[df["work_days"] < 8]),
-                "理想区间(8-10人天)": len(df[(df["work_days"] >= 8) & (df["work_days"] <= 10)]),
-                "优秀表现(10-15人天)": len(df[(df["work_days"] > 10) & (df["work_days"] <= 15)]),
-                "超高产出(>15人天)": len(df[df["work_days"] > 15]),
-                "需核实记录(>15人天)": len(df[df["needs_review"] == True])
-            }
-        }
-        return stats
+        """分析统计信息 - 单次遍历各列完成全部计数与汇总"""
+        accumulator = StatisticsAccumulator()
+        accumulator.update(df)
+        return accumulator.result()
+
+    def _row_explanation(self, row) -> str:
+        """单行评分结果的解释文字"""
+        return self.calculator.render_explanation(row['explain_code'], row['overdue_ratio'],
+                                                  row['overdue_days'], row['work_days'])
 
     def print_detailed_analysis(self, df: pd.DataFrame):
         """打印详细分析报告"""
@@ -734,14 +1678,14 @@ class DataProcessor:
             for name in stats['Highlight候选']:
                 row = df[df['name'] == name].iloc[0]
                 print(f"   • {name:<8}: {row['comprehensive_score']:>6.2f}分")
-                print(f"     └─ {row['explanation']}")
+                print(f"     └─ {self._row_explanation(row)}")
 
         if stats['Lowlight需关注']:
             print(f"\n⚠️  Lowlight需关注 (D级 <40分):")
             for name in stats['Lowlight需关注']:
                 row = df[df['name'] == name].iloc[0]
                 print(f"   • {name:<8}: {row['comprehensive_score']:>6.2f}分")
-                print(f"     └─ {row['explanation']}")
+                print(f"     └─ {self._row_explanation(row)}")
 
         if stats['需核实人天']:
             print(f"\n🔍 需核实人天记录 (>15人天):")
@@ -750,6 +1694,19 @@ class DataProcessor:
                 print(f"   • {row['name']:<8}: {row['work_days']:>6.1f}人天 ({row['comprehensive_score']:.1f}分)")
                 print(f"     └─ 建议核实：是否存在人天记录膨胀或重复统计")
 
+        anomaly_df = df[df['workload_anomaly'] != 0]
+        if len(anomaly_df) or df['team_workload_uneven'].any():
+            first = df.iloc[0]
+            print(f"\n📐 团队工作量分布 (均值{first['team_work_mean']:.1f}人天, "
+                  f"中位数{first['team_work_median']:.1f}人天, MAD {first['team_work_mad']:.1f}):")
+            if df['team_workload_uneven'].any():
+                threshold = self.calculator.config.anomaly_thresholds['workload_variance']
+                print(f"   ⚠️ 团队人天变异系数超过{threshold:.0%}，工作分配不均衡")
+            anomalies = self.calculator.describe_workload_anomalies(
+                anomaly_df['workload_anomaly'], anomaly_df['work_days'], anomaly_df['team_work_mean'])
+            for name, anomaly in zip(anomaly_df['name'], anomalies):
+                print(f"   • {name:<8}: {anomaly['anomaly_type']} - {anomaly['description']}（{anomaly['action']}）")
+
         # 改进建议
         print(f"\n💡 团队改进建议:")
         if overdue_stats['平均逾期比例'] > 30:
@@ -770,13 +1727,29 @@ def main():
     parser.add_argument("--overdue", help="逾期比例数据文件路径 (默认: data/overdue.data)")
     parser.add_argument("--mean-overdue", help="逾期天数均值数据文件路径 (默认: data/mean_overdue.data)")
     parser.add_argument("--days", help="工作人天数据文件路径 (默认: data/days.data)")
-    parser.add_argument("--output", help="输出结果文件路径")
+    parser.add_argument("--input", help="合并数据文件（.csv/.parquet/.arrow），代替上述三个文件")
+    parser.add_argument("--output", help="输出结果文件路径（.csv、.csv.gz/.bz2/.xz或.parquet），分块流式写出，不在终端打印完整排名表")
+    parser.add_argument("--compression", help="Parquet输出的压缩方式 (默认: zstd，可选 none/snappy/gzip/brotli/zstd/lz4)")
     parser.add_argument("--stats", action="store_true", help="显示统计信息")
     parser.add_argument("--detailed", action="store_true", help="显示详细分析报告")
     parser.add_argument("--explain", action="store_true", help="显示每人得分解释")
+    parser.add_argument("--cache-dir", help="解析结果缓存目录，数据文件未变化时跳过文本解析 (也可用环境变量 PERF_CACHE_DIR)")
+    parser.add_argument("--history-dir", help="历史评分库目录，配合--period将本期结果追加到历史库")
+    parser.add_argument("--period", help="本期周期标签，如2025-09（须晚于历史库中已有周期）")
+    parser.add_argument("--enhanced", action="store_true",
+                        help="计算增强版得分（复杂度、逾期趋势、稳定性、紧急任务），历史取自--history-dir")
+    parser.add_argument("--attributes", help="扩展属性CSV（name, complexity, urgent_tasks_completed, urgent_tasks_total）")
+    parser.add_argument("--top", type=int, default=3, help="Top/Bottom名单人数 (默认: 3)")
+    parser.add_argument("--summary", action="store_true",
+                        help="只显示Top/Bottom名单，不打印完整排名表（未指定--output时跳过整体排序）")
 
     args = parser.parse_args()
 
+    if args.compression and not args.output:
+        parser.error("--compression需要配合--output使用")
+    if args.history_dir and not args.period:
+        parser.error("使用--history-dir时需要通过--period指定本期周期")
+
     # 设置默认数据文件路径
     data_dir = os.getenv('DATA_DIR', 'data')
     overdue_file = args.overdue or os.path.join(data_dir, 'overdue.data')
@@ -784,15 +1757,36 @@ def main():
     days_file = args.days or os.path.join(data_dir, 'days.data')
 
     # 检查数据文件是否存在
-    for file_path, name in [(overdue_file, '逾期比例'), (mean_overdue_file, '逾期天数'), (days_file, '工作人天')]:
+    # (文件路径, 名称, 对应的命令行参数)
+    input_files = [(args.input, '合并', '--input')] if args.input else \
+        [(overdue_file, '逾期比例', '--overdue'), (mean_overdue_file, '逾期天数', '--mean-overdue'),
+         (days_file, '工作人天', '--days')]
+    for file_path, name, flag in input_files:
         if not os.path.exists(file_path):
             print(f"❌ {name}数据文件不存在: {file_path}")
-            print(f"💡 请将数据文件放在 {data_dir}/ 目录下，或使用 --{name.split('_')[0]} 参数指定路径")
+            print(f"💡 请将数据文件放在 {data_dir}/ 目录下，或使用 {flag} 参数指定路径")
             return
 
     try:
+        if args.output:
+            from result_export import check_export_path
+            check_export_path(args.output, args.compression)
+
+        # 历史库在评分前打开并检查周期顺序
+        store = None
+        if args.history_dir:
+            from history_store import HistoryStore
+            store = HistoryStore(args.history_dir)
+            if store.periods and args.period <= store.periods[-1]:
+                raise ValueError(f"周期{args.period}须晚于历史库中的最新周期{store.periods[-1]}")
+
         # 创建数据处理器
-        processor = DataProcessor()
+        cache = None
+        cache_dir = args.cache_dir or os.getenv('PERF_CACHE_DIR')
+        if cache_dir:
+            from parse_cache import ParsedDataCache
+            cache = ParsedDataCache(cache_dir)
+        processor = DataProcessor(cache=cache)
 
         # 处理文件
         print("正在处理数据文件...")
@@ -807,35 +1801,52 @@ def main():
         print("     - <10人天：递增惩罚，距离标准越远惩罚越重")
         print()
 
-        result_df = processor.process_files(overdue_file, mean_overdue_file, days_file)
+        # 只有打印或导出完整排名表时才需要整体排序
+        full_table = not args.summary or bool(args.output)
+        if args.input:
+            result_df = processor.process_table(args.input, rank=full_table)
+        else:
+            result_df = processor.process_files(overdue_file, mean_overdue_file, days_file, rank=full_table)
+
+        # 增强版得分（使用追加本期之前的历史）
+        if args.enhanced:
+            import pandas as pd
+            attributes = None
+            if args.attributes:
+                attributes = pd.read_csv(args.attributes, encoding='utf-8-sig')
+            elif args.input:
+                from table_input import read_attributes
+                attributes = read_attributes(args.input)
+            result_df = processor.add_enhanced_scores(result_df, attributes, store)
 
         # 显示结果
         print(f"\n=== 评分结果 (共{len(result_df)}人) ===")
-        print("📊 综合得分计算公式：逾期比例得分×40% + 逾期天数得分×40% + 工作人天得分×20%")
-        print("📋 下表显示各项得分明细，帮助理解等级评定依据")
-        print()
-
-        # 格式化输出
-        display_df = result_df.copy()
-        display_df["overdue_ratio"] = display_df["overdue_ratio"].apply(lambda x: f"{x:.1f}%")
-        display_df["overdue_days"] = display_df["overdue_days"].apply(lambda x: f"{x:.1f}天")
-        display_df["work_days"] = display_df["work_days"].apply(lambda x: f"{x:.1f}人天")
-
-        # 添加各项得分显示（用户要求看到grade如何计算得出）
-        display_df["逾期比例得分"] = display_df["overdue_ratio_score"].apply(lambda x: f"{x:.1f}")
-        display_df["逾期天数得分"] = display_df["overdue_days_score"].apply(lambda x: f"{x:.1f}")
-        display_df["工作人天得分"] = display_df["work_days_score"].apply(lambda x: f"{x:.1f}")
-
-        # 选择要显示的列
-        if args.explain:
-            display_columns = ["name", "overdue_ratio", "overdue_days", "work_days",
-                             "逾期比例得分", "逾期天数得分", "工作人天得分",
-                             "comprehensive_score", "grade", "explanation"]
-            print(display_df[display_columns].to_string(index=True, index_names=["排名"]))
-        else:
+        if args.output and not args.summary:
+            print("📄 完整排名表直接写出到输出文件，不在终端打印")
+        elif not args.summary:
+            print("📊 综合得分计算公式：逾期比例得分×40% + 逾期天数得分×40% + 工作人天得分×20%")
+            print("📋 下表显示各项得分明细，帮助理解等级评定依据")
+            print()
+
+            # 格式化输出（仅--explain时渲染解释文字）
+            display_df = processor.render_explanations(result_df) if args.explain else result_df.copy()
+            display_df["overdue_ratio"] = display_df["overdue_ratio"].apply(lambda x: f"{x:.1f}%")
+            display_df["overdue_days"] = display_df["overdue_days"].apply(lambda x: f"{x:.1f}天")
+            display_df["work_days"] = display_df["work_days"].apply(lambda x: f"{x:.1f}人天")
+
+            # 添加各项得分显示（用户要求看到grade如何计算得出）
+            display_df["逾期比例得分"] = display_df["overdue_ratio_score"].apply(lambda x: f"{x:.1f}")
+            display_df["逾期天数得分"] = display_df["overdue_days_score"].apply(lambda x: f"{x:.1f}")
+            display_df["工作人天得分"] = display_df["work_days_score"].apply(lambda x: f"{x:.1f}")
+
+            # 选择要显示的列
             display_columns = ["name", "overdue_ratio", "overdue_days", "work_days",
                              "逾期比例得分", "逾期天数得分", "工作人天得分",
                              "comprehensive_score", "grade"]
+            if args.enhanced:
+                display_columns += ["trend_score", "stability_score", "urgency_score", "enhanced_score"]
+            if args.explain:
+                display_columns.append("explanation")
             print(display_df[display_columns].to_string(index=True, index_names=["排名"]))
 
         # 显示详细分析
@@ -866,23 +1877,29 @@ def main():
 
         # 保存结果
         if args.output:
-            result_df.to_csv(args.output, index=True, index_label="排名", encoding='utf-8-sig')
-            print(f"\n结果已保存到: {args.output}")
+            from result_export import export_results
+            rows = export_results(processor, result_df, args.output, compression=args.compression)
+            print(f"\n结果已保存到: {args.output} ({rows}行)")
+
+        # 追加到历史评分库
+        if store is not None:
+            store.append_period(args.period, result_df)
+            print(f"\n本期结果已追加到历史库: {args.history_dir} (共{len(store.periods)}个周期)")
 
         # 显示前3名和后3名 - 增强显示各项得分
-        print(f"\n=== Top 3 (优秀表现) ===")
-        top3 = result_df.head(3)
-        for idx, row in top3.iterrows():
+        print(f"\n=== Top {args.top} (优秀表现) ===")
+        top_df = processor.select_top(result_df, args.top)
+        for idx, row in top_df.iterrows():
             review_flag = " 🔍需核实" if row['needs_review'] else ""
             print(f"{idx}. {row['name']} - {row['comprehensive_score']}分 ({row['grade']}级){review_flag}")
             print(f"     逾期比例: {row['overdue_ratio_score']:.1f}分 | 逾期天数: {row['overdue_days_score']:.1f}分 | 工作人天: {row['work_days_score']:.1f}分")
 
-        print(f"\n=== Bottom 3 (需要改进) ===")
-        bottom3 = result_df.tail(3)
-        for idx, row in bottom3.iterrows():
+        print(f"\n=== Bottom {args.top} (需要改进) ===")
+        bottom_df = processor.select_bottom(result_df, args.top)
+        for idx, row in bottom_df.iterrows():
             print(f"{idx}. {row['name']} - {row['comprehensive_score']}分 ({row['grade']}级)")
             print(f"     逾期比例: {row['overdue_ratio_score']:.1f}分 | 逾期天数: {row['overdue_days_score']:.1f}分 | 工作人天: {row['work_days_score']:.1f}分")
-            # 为Bottom 3添加简短改进建议
+            # 为Bottom名单添加简短改进建议
             if row['overdue_ratio_score'] < 60:
                 print(f"     💡 建议: 重点关注逾期比例改善")
             if row['overdue_days_score'] < 60:
@@ -894,6 +1911,8 @@ def main():
         print(f"❌ 文件未找到: {e}")
     except ValueError as e:
         print(f"❌ 数据错误: {e}")
+    except ImportError as e:
+        print(f"❌ 缺少依赖: {e}")
     except Exception as e:
         print(f"❌ 处理过程中出错: {e}")
 
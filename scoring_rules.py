@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分规则单一来源
+将ScoringConfig中的评分公式描述为声明式规则（分段区间、权重、请假系数、等级门槛），
+再由同一份规则编译出两套实现：
+  compile_rules  向量化Python评估器（ScoringCalculator的批量评分使用）
+  generate_js    网页 performance_evaluation.html 中的ScoringRules类（位于生成标记之间）
+
+差分测试用同一批随机输入分别驱动两套实现（JS部分由node执行），逐项比较两位小数得分与等级。
+  python scoring_rules.py --write-html      按当前规则重新生成网页中的评分代码
+  python scoring_rules.py --check-html      检查网页中的评分代码是否与规则一致
+  python scoring_rules.py --fuzz 1000000    差分测试（需要node）
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# OVERDUE_DAYS_BUFFER、LEAVE_FACTORS为评分公式的固定参数，与标量评分共用scoring中的定义
+from scoring import LEAVE_FACTORS, OVERDUE_DAYS_BUFFER, ScoringConfig, _round_like_python
+
+# 规则格式变化时递增
+RULES_FORMAT_VERSION = 1
+ROUND_DIGITS = 2
+BASE_SCORE = 100
+COMPONENTS = ("overdue_ratio", "overdue_days", "work_days")
+GRADES = ("S", "A", "B", "C")
+DEFAULT_GRADE = "D"
+
+HTML_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "performance_evaluation.html")
+JS_BEGIN_MARKER = "// BEGIN GENERATED SCORING RULES"
+JS_END_MARKER = "// END GENERATED SCORING RULES"
+JS_INDENT = " " * 8
+# 各项在网页代码中的(参数名, 得分变量名)
+JS_COMPONENT_NAMES = {
+    "overdue_ratio": ("overdueRatio", "ratioScore"),
+    "overdue_days": ("overdueDays", "daysScore"),
+    "work_days": ("workDays", "workDaysScore"),
+}
+
+
+def build_rule_spec(config: ScoringConfig = None) -> Dict:
+    """由评分配置生成声明式规则（可JSON序列化）"""
+    config = config or ScoringConfig()
+    ratio = config.overdue_ratio_params
+    days = config.overdue_days_params
+    work = config.work_days_params
+    return {
+        "version": RULES_FORMAT_VERSION,
+        "round_digits": ROUND_DIGITS,
+        "components": {
+            # 线性惩罚：max - max(0, x - baseline) * rate，限制在[min, max]
+            "overdue_ratio": {"kind": "linear_penalty", "baseline": ratio["baseline"],
+                              "rate": ratio["multiplier"], "min": ratio["min_score"], "max": ratio["max_score"]},
+            # 反比衰减：x <= baseline满分，否则 max * (baseline + buffer) / (x + buffer)
+            "overdue_days": {"kind": "inverse_decay", "baseline": days["baseline"], "buffer": OVERDUE_DAYS_BUFFER,
+                             "min": days["min_score"], "max": days["max_score"]},
+            # 分段：低于标准递增惩罚，标准为基础分，之上按区间累加奖励
+            "work_days": {
+                "kind": "tiered",
+                "standard": work["standard_days"],
+                "base": BASE_SCORE,
+                "penalty": {"rate": work["base_penalty_rate"], "multiplier": work["progressive_multiplier"],
+                            "min": work["min_score"]},
+                "tiers": [
+                    {"upper": work["bonus_tier1_max"], "rate": work["bonus_tier1_rate"]},
+                    {"upper": work["bonus_tier3_max"], "rate": work["bonus_tier2_rate"]},
+                    {"upper": None, "rate": work["bonus_tier3_rate"]},
+                ],
+                "max": work["max_score"],
+            },
+        },
+        "weights": {name: config.weights[name] for name in COMPONENTS},
+        "leave_factors": [{"max_work_days": limit, "factor": factor} for limit, factor in LEAVE_FACTORS],
+        "grades": [{"grade": grade, "min_score": config.grade_thresholds[grade]} for grade in GRADES],
+        "default_grade": DEFAULT_GRADE,
+        "review_threshold": work["inflation_threshold"],
+    }
+
+
+def _check_spec(spec: Dict) -> None:
+    if spec.get("version") != RULES_FORMAT_VERSION:
+        raise ValueError(f"评分规则格式版本不兼容: {spec.get('version')}")
+    if tuple(spec["components"]) != COMPONENTS:
+        raise ValueError(f"评分规则须依次包含: {', '.join(COMPONENTS)}")
+    for name, component in spec["components"].items():
+        if component["kind"] not in _PYTHON_COMPILERS:
+            raise ValueError(f"未知的评分规则类型: {name}={component['kind']}")
+    tiers = spec["components"]["work_days"]["tiers"]
+    if not tiers or tiers[-1]["upper"] is not None:
+        raise ValueError("分段规则的最后一段须无上限")
+
+
+def _tier_starts(rule: Dict):
+    """各奖励区间的(下限, 区间起点得分, 上限, 每单位奖励)；起点得分按区间顺序累加，与标量公式的求和顺序一致"""
+    lower, start = rule["standard"], rule["base"]
+    for tier in rule["tiers"]:
+        yield lower, start, tier["upper"], tier["rate"]
+        if tier["upper"] is not None:
+            start = start + (tier["upper"] - lower) * tier["rate"]
+            lower = tier["upper"]
+
+
+# ========== 编译为向量化Python ==========
+def _compile_linear_penalty(rule: Dict) -> Callable[[np.ndarray], np.ndarray]:
+    baseline, rate, low, high = rule["baseline"], rule["rate"], rule["min"], rule["max"]
+
+    def score(x):
+        return np.maximum(low, np.minimum(high, high - np.maximum(0, x - baseline) * rate))
+    return score
+
+
+def _compile_inverse_decay(rule: Dict) -> Callable[[np.ndarray], np.ndarray]:
+    baseline, buffer, low, high = rule["baseline"], rule["buffer"], rule["min"], rule["max"]
+
+    def score(x):
+        decayed = _round_like_python(high * (baseline + buffer) / (x + buffer), ROUND_DIGITS)
+        return np.where(x <= baseline, float(high), np.maximum(low, decayed))
+    return score
+
+
+def _compile_tiered(rule: Dict) -> Callable[[np.ndarray], np.ndarray]:
+    standard, base, high = rule["standard"], rule["base"], rule["max"]
+    penalty_rate = rule["penalty"]["rate"]
+    multiplier = rule["penalty"]["multiplier"]
+    penalty_min = rule["penalty"]["min"]
+    tiers = list(_tier_starts(rule))
+
+    def score(x):
+        # 递增惩罚：幂运算按不同指数逐个用内置pow计算，与标量路径一致
+        below = x < standard
+        gap = standard - x[below]
+        unique_exponents, inverse = np.unique(gap - 1, return_inverse=True)
+        powers = np.array([multiplier ** e for e in unique_exponents.tolist()],
+                          dtype=np.float64)[inverse.reshape(-1)]
+        penalty_score = np.empty_like(x)
+        penalty_score[below] = np.maximum(penalty_min, base - penalty_rate * powers * gap)
+
+        conditions = [below, x == standard]
+        choices = [penalty_score, float(base)]
+        for lower, start, upper, rate in tiers[:-1]:
+            conditions.append(x <= upper)
+            choices.append(np.minimum(high, start + (x - lower) * rate))
+        lower, start, _, rate = tiers[-1]
+        return np.select(conditions, choices, default=np.minimum(high, start + (x - lower) * rate))
+    return score
+
+
+_PYTHON_COMPILERS = {
+    "linear_penalty": _compile_linear_penalty,
+    "inverse_decay": _compile_inverse_decay,
+    "tiered": _compile_tiered,
+}
+
+
+class CompiledRules:
+    """规则编译后的向量化评估器，结果与ScoringCalculator的标量评分逐位一致"""
+
+    def __init__(self, spec: Dict, fingerprint: tuple = None):
+        _check_spec(spec)
+        self.spec = spec
+        self.fingerprint = fingerprint  # 对应ScoringConfig.fingerprint()，用于判断是否需要重新编译
+        self._components = {name: _PYTHON_COMPILERS[rule["kind"]](rule)
+                            for name, rule in spec["components"].items()}
+
+    def score_component(self, name: str, values: np.ndarray) -> np.ndarray:
+        """单项得分（未舍入）"""
+        return self._components[name](np.asarray(values, dtype=np.float64))
+
+    def combine(self, ratio_score: np.ndarray, days_score: np.ndarray, work_days_score: np.ndarray,
+                work_days: np.ndarray, weights: Dict = None) -> np.ndarray:
+        """加权求和并按请假系数调整，返回舍入后的综合得分
+
+        weights默认取规则中的权重；敏感性扫描传入K×1的权重列，与N个员工的得分广播为K×N。
+        """
+        weights = weights or self.spec["weights"]
+        score = (ratio_score * weights["overdue_ratio"] +
+                 days_score * weights["overdue_days"] +
+                 work_days_score * weights["work_days"])
+        return _round_like_python(score * self.leave_factor(work_days), self.spec["round_digits"])
+
+    def leave_factor(self, work_days: np.ndarray) -> np.ndarray:
+        """请假调整系数（未调整为1.0）"""
+        leave = self.spec["leave_factors"]
+        return np.select([work_days <= item["max_work_days"] for item in leave],
+                         [item["factor"] for item in leave], default=1.0)
+
+    def leave_adjustment(self, work_days: np.ndarray) -> np.ndarray:
+        """是否应用了请假调整"""
+        return work_days <= max(item["max_work_days"] for item in self.spec["leave_factors"])
+
+    def grades(self, scores: np.ndarray) -> np.ndarray:
+        """等级"""
+        cutoffs = self.spec["grades"]
+        return np.select([scores >= item["min_score"] for item in cutoffs],
+                         [item["grade"] for item in cutoffs], default=self.spec["default_grade"])
+
+    def evaluate(self, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                 work_days: np.ndarray) -> Dict[str, np.ndarray]:
+        """各项得分（两位小数）、综合得分与等级"""
+        work_days = np.asarray(work_days, dtype=np.float64)
+        ratio_score = self.score_component("overdue_ratio", overdue_ratio)
+        days_score = self.score_component("overdue_days", overdue_days)
+        work_days_score = self.score_component("work_days", work_days)
+        comprehensive_score = self.combine(ratio_score, days_score, work_days_score, work_days)
+        digits = self.spec["round_digits"]
+        return {
+            "overdue_ratio_score": _round_like_python(ratio_score, digits),
+            "overdue_days_score": _round_like_python(days_score, digits),
+            "work_days_score": _round_like_python(work_days_score, digits),
+            "comprehensive_score": comprehensive_score,
+            "grade": self.grades(comprehensive_score),
+        }
+
+
+def compile_rules(spec: Dict = None, fingerprint: tuple = None) -> CompiledRules:
+    """编译规则为向量化Python评估器（默认使用默认配置的规则）"""
+    return CompiledRules(spec or build_rule_spec(), fingerprint)
+
+
+# ========== 生成JavaScript ==========
+def _js(value) -> str:
+    """Python数值/字符串转JS字面量（浮点数用repr，JS解析得到同一个双精度值）"""
+    if isinstance(value, float):
+        return repr(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _js_method_name(component: str) -> str:
+    head, *rest = component.split("_")
+    return head + "".join(part.capitalize() for part in rest) + "Score"
+
+
+def _js_linear_penalty(rule: Dict) -> str:
+    return f"""
+    const score = {_js(rule["max"])} - Math.max(0, x - {_js(rule["baseline"])}) * {_js(rule["rate"])};
+    return Math.max({_js(rule["min"])}, Math.min({_js(rule["max"])}, score));"""
+
+
+def _js_inverse_decay(rule: Dict) -> str:
+    return f"""
+    if (x <= {_js(rule["baseline"])}) {{
+        return {_js(rule["max"])};
+    }}
+    const score = {_js(rule["max"])} * ({_js(rule["baseline"])} + {_js(rule["buffer"])}) / (x + {_js(rule["buffer"])});
+    return Math.max({_js(rule["min"])}, ScoringRules.roundScore(score));"""
+
+
+def _js_tiered(rule: Dict) -> str:
+    penalty = rule["penalty"]
+    lines = [f"""
+    if (x < {_js(rule["standard"])}) {{
+        const gap = {_js(rule["standard"])} - x;
+        const penalty = {_js(penalty["rate"])} * Math.pow({_js(penalty["multiplier"])}, gap - 1) * gap;
+        return Math.max({_js(penalty["min"])}, {_js(rule["base"])} - penalty);
+    }}
+    if (x === {_js(rule["standard"])}) {{
+        return {_js(rule["base"])};
+    }}"""]
+    for lower, start, upper, rate in _tier_starts(rule):
+        expression = f"Math.min({_js(rule['max'])}, {_js(start)} + (x - {_js(lower)}) * {_js(rate)})"
+        if upper is None:
+            lines.append(f"\n    return {expression};")
+        else:
+            lines.append(f"\n    if (x <= {_js(upper)}) {{\n        return {expression};\n    }}")
+    return "".join(lines)
+
+
+_JS_GENERATORS = {
+    "linear_penalty": _js_linear_penalty,
+    "inverse_decay": _js_inverse_decay,
+    "tiered": _js_tiered,
+}
+
+
+def _js_config(config: ScoringConfig) -> Dict:
+    """网页ScoringCalculator使用的配置（说明文字与阈值判断）"""
+    return {
+        "weights": {name: config.weights[name] for name in COMPONENTS},
+        "overdue_ratio_params": {key: config.overdue_ratio_params[key]
+                                 for key in ("baseline", "multiplier", "max_score", "min_score")},
+        "overdue_days_params": dict(config.overdue_days_params),
+        "work_days_params": dict(config.work_days_params),
+        "grade_thresholds": {grade: config.grade_thresholds[grade] for grade in GRADES},
+        "leave_factors": [{"max_work_days": limit, "factor": factor} for limit, factor in LEAVE_FACTORS],
+    }
+
+
+def generate_js(spec: Dict = None, config: ScoringConfig = None) -> str:
+    """生成网页中的ScoringRules类（含首尾标记，已按页面缩进）"""
+    config = config or ScoringConfig()
+    spec = spec or build_rule_spec(config)
+    _check_spec(spec)
+    digits = spec["round_digits"]
+
+    methods = []
+    for name, rule in spec["components"].items():
+        methods.append(f"static {_js_method_name(name)}(x) {{{_JS_GENERATORS[rule['kind']](rule)}\n}}")
+
+    weights = spec["weights"]
+    component_calls = "\n    ".join(
+        f"const {score} = ScoringRules.{_js_method_name(name)}({argument});"
+        for name, (argument, score) in JS_COMPONENT_NAMES.items())
+    weighted = " +\n        ".join(f"{score} * {_js(weights[name])}"
+                                  for name, (_, score) in JS_COMPONENT_NAMES.items())
+    leave = " else ".join(
+        f"if (workDays <= {_js(item['max_work_days'])}) {{\n        score = score * {_js(item['factor'])};\n    }}"
+        for item in spec["leave_factors"])
+    rounded = ",\n        ".join(f"{name}_score: ScoringRules.roundScore({score})"
+                                 for name, (_, score) in JS_COMPONENT_NAMES.items())
+    methods.append(f"""static comprehensiveScore(overdueRatio, overdueDays, workDays) {{
+    {component_calls}
+
+    let score = (
+        {weighted}
+    );
+    // 请假调整
+    {leave}
+
+    return {{
+        {rounded},
+        comprehensive_score: ScoringRules.roundScore(score)
+    }};
+}}""")
+
+    grade_lines = "\n    ".join(f"if (score >= {_js(item['min_score'])}) return {_js(item['grade'])};"
+                               for item in spec["grades"])
+    methods.append(f"static grade(score) {{\n    {grade_lines}\n    return {_js(spec['default_grade'])};\n}}")
+    methods.append(f"static needsReview(workDays) {{\n    return workDays > {_js(spec['review_threshold'])};\n}}")
+
+    scale = 10 ** digits
+    round_method = f"""// 与Python round(x, {digits})逐位一致：非临界值直接取整，接近.5的临界值按精确十进制值舍入（恰为中点时取偶数）
+static roundScore(x) {{
+    const scaled = x * {scale};
+    if (Math.abs(scaled - Math.floor(scaled) - 0.5) >= 1e-6) {{
+        return Math.round(scaled) / {scale};
+    }}
+    const abs = Math.abs(x);
+    if (abs * {2 ** (digits + 1)} % 2 === 1) {{
+        return Math.sign(x) * (Math.round(abs * {scale} / 2) * 2 / {scale});
+    }}
+    return Math.sign(x) * Number(abs.toFixed({digits}));
+}}"""
+
+    body = "\n\n".join([
+        f"static CONFIG = {json.dumps(_js_config(config), ensure_ascii=False, indent=4)};",
+        round_method,
+        *methods,
+    ])
+    lines = [
+        JS_BEGIN_MARKER,
+        "// 由 scoring_rules.py 根据ScoringConfig生成，请勿手工修改（python scoring_rules.py --write-html）",
+        "class ScoringRules {",
+        *[("    " + line) if line else "" for line in body.split("\n")],
+        "}",
+        JS_END_MARKER,
+    ]
+    return "\n".join((JS_INDENT + line) if line else "" for line in lines) + "\n"
+
+
+def _split_html(html: str):
+    begin = html.find(JS_INDENT + JS_BEGIN_MARKER)
+    end = html.find(JS_END_MARKER, begin)
+    if begin < 0 or end < 0:
+        raise ValueError(f"网页中未找到评分规则生成标记: {JS_BEGIN_MARKER}")
+    end = html.index("\n", end) + 1
+    return html[:begin], html[begin:end], html[end:]
+
+
+def extract_js(html_file: str = HTML_FILE) -> str:
+    """网页中当前的生成代码"""
+    with open(html_file, "r", encoding="utf-8") as f:
+        return _split_html(f.read())[1]
+
+
+def write_html(html_file: str = HTML_FILE, config: ScoringConfig = None) -> bool:
+    """重新生成网页中的评分代码，返回是否有变化"""
+    with open(html_file, "r", encoding="utf-8") as f:
+        html = f.read()
+    head, current, tail = _split_html(html)
+    generated = generate_js(config=config)
+    if generated == current:
+        return False
+    with open(html_file, "w", encoding="utf-8") as f:
+        f.write(head + generated + tail)
+    return True
+
+
+# ========== 差分测试 ==========
+_NODE_DRIVER = """
+const fs = require('fs');
+const [inputPath, outputPath] = process.argv.slice(2);
+const data = fs.readFileSync(inputPath);
+const input = new Float64Array(data.buffer, data.byteOffset, data.byteLength / 8);
+const count = input.length / 3;
+const output = new Float64Array(count * 5);
+const grades = %s;
+for (let i = 0; i < count; i++) {
+    const scores = ScoringRules.comprehensiveScore(input[i], input[count + i], input[2 * count + i]);
+    output[i] = scores.overdue_ratio_score;
+    output[count + i] = scores.overdue_days_score;
+    output[2 * count + i] = scores.work_days_score;
+    output[3 * count + i] = scores.comprehensive_score;
+    output[4 * count + i] = grades.indexOf(ScoringRules.grade(scores.comprehensive_score));
+}
+fs.writeFileSync(outputPath, Buffer.from(output.buffer));
+"""
+
+_RESULT_COLUMNS = ("overdue_ratio_score", "overdue_days_score", "work_days_score", "comprehensive_score", "grade")
+
+
+def fuzz_inputs(count: int, seed: int = 0, spec: Dict = None) -> Dict[str, np.ndarray]:
+    """生成差分测试输入：连续随机值、常见精度的取值、各分段边界及其相邻浮点数"""
+    spec = spec or build_rule_spec()
+    rng = np.random.default_rng(seed)
+    ranges = {"overdue_ratio": (-5.0, 120.0), "overdue_days": (0.0, 60.0), "work_days": (0.0, 40.0)}
+
+    boundaries = {name: [] for name in COMPONENTS}
+    for name, rule in spec["components"].items():
+        for key in ("baseline", "standard"):
+            if key in rule:
+                boundaries[name].append(rule[key])
+        boundaries[name].extend(tier["upper"] for tier in rule.get("tiers", []) if tier["upper"] is not None)
+    boundaries["work_days"].extend(item["max_work_days"] for item in spec["leave_factors"])
+
+    columns = {}
+    for name in COMPONENTS:
+        low, high = ranges[name]
+        uniform = rng.uniform(low, high, count)
+        # 1/3：连续值；1/3：一位或两位小数；1/6：1/16的倍数（得分恰为舍入中点）；1/6：边界±1ulp
+        kind = rng.integers(0, 6, count)
+        values = uniform.copy()
+        decimals = np.where(rng.random(count) < 0.5, 1, 2)
+        values = np.where((kind == 2) | (kind == 3), np.round(uniform * 10.0 ** decimals) / 10.0 ** decimals, values)
+        values = np.where(kind == 4, np.round(uniform * 16) / 16, values)
+        points = np.array(boundaries[name], dtype=np.float64)
+        edge = points[rng.integers(0, len(points), count)]
+        edge = np.nextafter(edge, edge + rng.choice([-1.0, 0.0, 1.0], count))
+        columns[name] = np.where(kind == 5, edge, values)
+    return columns
+
+
+def differential_check(count: int = 1_000_000, seed: int = 0, js_source: str = None,
+                       node: Optional[str] = None, spec: Dict = None) -> Dict:
+    """用同一批输入比较Python评估器与JS评估器，返回不一致的数量与示例
+
+    js_source默认为网页中的生成代码；未找到node时抛出FileNotFoundError。
+    """
+    node = node or shutil.which("node")
+    if not node:
+        raise FileNotFoundError("差分测试需要node")
+    spec = spec or build_rule_spec()
+    js_source = js_source if js_source is not None else extract_js()
+    inputs = fuzz_inputs(count, seed, spec)
+    expected = compile_rules(spec).evaluate(inputs["overdue_ratio"], inputs["overdue_days"], inputs["work_days"])
+    grade_order = [item["grade"] for item in spec["grades"]] + [spec["default_grade"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, "driver.js")
+        input_path = os.path.join(tmp, "input.bin")
+        output_path = os.path.join(tmp, "output.bin")
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(js_source + _NODE_DRIVER % json.dumps(grade_order, ensure_ascii=False))
+        np.concatenate([inputs[name] for name in COMPONENTS]).tofile(input_path)
+        subprocess.run([node, script_path, input_path, output_path], check=True)
+        actual = np.fromfile(output_path, dtype=np.float64).reshape(len(_RESULT_COLUMNS), count)
+
+    grade_codes = np.zeros(count)
+    for code, grade in enumerate(grade_order):
+        grade_codes[expected["grade"] == grade] = code
+    mismatched = np.zeros(count, dtype=bool)
+    for row, column in enumerate(_RESULT_COLUMNS):
+        reference = grade_codes if column == "grade" else expected[column]
+        mismatched |= actual[row] != reference
+
+    rows = np.flatnonzero(mismatched)
+    examples = [{**{name: float(inputs[name][i]) for name in COMPONENTS},
+                 "python": {column: expected[column][i].item() for column in _RESULT_COLUMNS},
+                 "js": {column: float(actual[row][i]) for row, column in enumerate(_RESULT_COLUMNS)}}
+                for i in rows[:5].tolist()]
+    return {"count": count, "mismatches": len(rows), "examples": examples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 评分规则生成与差分测试")
+    parser.add_argument("--write-html", action="store_true", help="按当前规则重新生成网页中的评分代码")
+    parser.add_argument("--check-html", action="store_true", help="检查网页中的评分代码是否与规则一致")
+    parser.add_argument("--fuzz", type=int, metavar="N", help="用N组随机输入对比Python与网页评分（需要node）")
+    parser.add_argument("--seed", type=int, default=0, help="差分测试随机种子 (默认: 0)")
+    parser.add_argument("--print-spec", action="store_true", help="输出声明式规则(JSON)")
+
+    args = parser.parse_args()
+
+    if args.print_spec:
+        print(json.dumps(build_rule_spec(), ensure_ascii=False, indent=2))
+    if args.write_html:
+        changed = write_html()
+        print("✅ 已更新网页评分代码" if changed else "✅ 网页评分代码已是最新")
+    if args.check_html:
+        if extract_js() != generate_js():
+            print("❌ 网页评分代码与规则不一致，请运行: python scoring_rules.py --write-html")
+            raise SystemExit(1)
+        print("✅ 网页评分代码与规则一致")
+    if args.fuzz:
+        try:
+            result = differential_check(args.fuzz, args.seed)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        if result["mismatches"]:
+            print(f"❌ {result['count']} 组输入中 {result['mismatches']} 组不一致")
+            for example in result["examples"]:
+                print(f"   {example}")
+            raise SystemExit(1)
+        print(f"✅ {result['count']} 组输入Python与网页评分结果完全一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地评分服务
+常驻进程提供HTTP评分接口，评分配置、编译规则与查找表在进程内保持预热，
+避免每次调用CLI重复付出解释器与pandas的启动开销。仅依赖标准库asyncio。
+
+  POST /score[?rank=0&explain=1]   评分并排名（默认排名、只返回explain_code，explain=1时渲染解释文字）
+  GET  /health                     运行状态与合并批次统计
+
+请求体（三选一）：
+  {"employees": [{"name": ..., "overdue_ratio": ..., "overdue_days": ..., "work_days": ...}, ...]}
+  {"name": [...], "overdue_ratio": [...], "overdue_days": [...], "work_days": [...]}
+  Arrow-IPC流（Content-Type: application/vnd.apache.arrow.stream，需要pyarrow）
+
+并发到达的请求在max_delay内合并为一次批量评分调用，再按请求拆分后分别排名。
+响应以分块传输流式输出：默认JSON，Accept为application/x-ndjson时每行一条记录，
+为application/vnd.apache.arrow.stream时输出Arrow-IPC流。
+"""
+
+import argparse
+import asyncio
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from scoring import DataProcessor, ScoringCalculator
+from table_input import METRIC_COLUMNS, require_pyarrow
+
+JSON_TYPE = "application/json"
+NDJSON_TYPE = "application/x-ndjson"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+DEFAULT_MAX_DELAY = 0.005           # 合并等待时间（秒）
+DEFAULT_MAX_BATCH_ROWS = 200_000    # 单次合并的最大行数
+DEFAULT_STREAM_CHUNK_ROWS = 5_000   # 流式输出每块行数
+DEFAULT_MAX_BODY_BYTES = 256 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """返回给客户端的错误（状态码与说明）"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MicroBatcher:
+    """合并并发评分请求：max_delay内到达的请求拼接为一次calculate_batch_scores调用
+
+    评分在单线程执行器中运行，计算器的编译规则只被一个线程访问，事件循环保持响应。
+    """
+
+    def __init__(self, calculator: ScoringCalculator, executor: ThreadPoolExecutor,
+                 max_delay: float = DEFAULT_MAX_DELAY, max_rows: int = DEFAULT_MAX_BATCH_ROWS):
+        self.calculator = calculator
+        self.executor = executor
+        self.max_delay = max_delay
+        self.max_rows = max_rows
+        self.batches = 0
+        self.requests = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def score(self, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                    work_days: np.ndarray) -> Dict[str, np.ndarray]:
+        """提交一个请求的三项指标，返回该请求对应的得分列"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((overdue_ratio, overdue_days, work_days), future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Tuple[np.ndarray, ...], asyncio.Future]]:
+        """等待第一个请求，再等待max_delay收集同期到达的请求（不超过max_rows，超出部分留给下一批）"""
+        pending = [await self._queue.get()]
+        rows = len(pending[0][0][0])
+        if self.max_delay > 0 and rows < self.max_rows:
+            await asyncio.sleep(self.max_delay)
+        while rows < self.max_rows and not self._queue.empty():
+            item = self._queue.get_nowait()
+            pending.append(item)
+            rows += len(item[0][0])
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            columns = [np.concatenate([inputs[i] for inputs, _ in pending]) for i in range(3)]
+            try:
+                scores = await loop.run_in_executor(self.executor, self.calculator.calculate_batch_scores, *columns)
+            except Exception as e:  # 批量失败时逐个通知请求
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(pending)
+            start = 0
+            for inputs, future in pending:
+                end = start + len(inputs[0])
+                if not future.done():
+                    future.set_result({key: values[start:end] for key, values in scores.items()})
+                start = end
+
+
+class ScoringService:
+    """常驻评分服务：共享一个DataProcessor（配置与编译规则预热），HTTP/1.1长连接"""
+
+    def __init__(self, processor: DataProcessor = None, max_delay: float = DEFAULT_MAX_DELAY,
+                 max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+                 stream_chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES):
+        self.processor = processor or DataProcessor()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batcher = MicroBatcher(self.processor.calculator, self.executor, max_delay, max_batch_rows)
+        self.stream_chunk_rows = stream_chunk_rows
+        self.max_body_bytes = max_body_bytes
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def close(self) -> None:
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+        self.executor.shutdown(wait=True)
+
+    # ---------- 评分 ----------
+    async def score(self, names: np.ndarray, overdue_ratio: np.ndarray, overdue_days: np.ndarray,
+                    work_days: np.ndarray, rank: bool = True, explain: bool = False) -> pd.DataFrame:
+        """对一组员工评分：验证对齐后交由合并批次评分，再在执行器中生成排名与说明"""
+        loop = asyncio.get_running_loop()
+        _validate_request_columns(names, overdue_ratio, overdue_days, work_days)
+        try:
+            aligned = self.processor.align_columns((names, overdue_ratio), (names, overdue_days),
+                                                   (names, work_days), verbose=False)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from e
+
+        scores = await self.batcher.score(aligned.overdue_ratio, aligned.overdue_days, aligned.work_days)
+
+        def finish():
+            df = self.processor.score_aligned_data(aligned, rank=rank, scores=scores)
+            if explain:
+                df = self.processor.render_explanations(df)
+            if rank:
+                df.insert(0, "rank", df.index)
+            return df.reset_index(drop=True)
+        return await loop.run_in_executor(self.executor, finish)
+
+    def health(self) -> Dict:
+        return {
+            "status": "ok",
+            "config_version": self.processor.calculator.config.version,
+            "batches": self.batcher.batches,
+            "requests": self.batcher.requests,
+        }
+
+    # ---------- HTTP ----------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        """处理一个请求，返回连接是否保持"""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await _send_json(writer, HTTPStatus.BAD_REQUEST, {"error": "无效的请求行"}, keep_alive=False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        keep_alive = (headers.get("connection", "").lower() != "close"
+                      and version.upper() == "HTTP/1.1")
+
+        # 请求体未读完时无法确定下一个请求的起点，返回错误后关闭连接
+        try:
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError(f"无效的Content-Length: {length}")
+            if length > self.max_body_bytes:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"请求体超过{self.max_body_bytes}字节")
+            body = await reader.readexactly(length) if length else b""
+        except HTTPError as e:
+            await _send_json(writer, e.status, {"error": e.message}, keep_alive=False)
+            return False
+        except ValueError:
+            await _send_json(writer, HTTPStatus.BAD_REQUEST,
+                             {"error": f"无效的Content-Length: {headers.get('content-length')}"}, keep_alive=False)
+            return False
+
+        try:
+            url = urlsplit(target)
+            if method == "GET" and url.path == "/health":
+                await _send_json(writer, HTTPStatus.OK, self.health(), keep_alive)
+            elif method == "POST" and url.path == "/score":
+                await self._handle_score(url.query, headers, body, writer, keep_alive)
+            elif url.path in ("/health", "/score"):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"不支持的方法: {method}")
+            else:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"未知路径: {url.path}")
+        except HTTPError as e:
+            await _send_json(writer, e.status, {"error": e.message}, keep_alive)
+        except ValueError as e:
+            await _send_json(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)}, keep_alive)
+        except Exception as e:  # 未预期的错误：返回500并关闭连接，服务继续运行
+            print(f"❌ 处理请求失败: {method} {target}: {e!r}")
+            await _send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "服务内部错误"}, False)
+            return False
+        return keep_alive
+
+    async def _handle_score(self, query: str, headers: Dict[str, str], body: bytes,
+                            writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        options = parse_qs(query)
+        rank = _flag(options, "rank", True)
+        explain = _flag(options, "explain", False)  # 解释文字按需渲染，默认只返回explain_code
+
+        columns = _parse_body(body, headers.get("content-type", JSON_TYPE))
+        df = await self.score(*columns, rank=rank, explain=explain)
+
+        accept = headers.get("accept", JSON_TYPE)
+        if ARROW_TYPE in accept:
+            try:
+                require_pyarrow()
+            except ImportError as e:
+                raise HTTPError(HTTPStatus.NOT_ACCEPTABLE, str(e)) from e
+            content_type, chunks = ARROW_TYPE, _arrow_chunks(df, self.stream_chunk_rows)
+        elif NDJSON_TYPE in accept:
+            content_type, chunks = NDJSON_TYPE, _ndjson_chunks(df, self.stream_chunk_rows)
+        else:
+            content_type, chunks = JSON_TYPE, _json_chunks(df, self.stream_chunk_rows)
+        await _send_chunked(writer, HTTPStatus.OK, content_type, chunks, keep_alive)
+
+
+# ========== 请求解析 ==========
+def _flag(options: Dict[str, List[str]], name: str, default: bool) -> bool:
+    if name not in options:
+        return default
+    return options[name][-1].lower() not in ("0", "false", "no")
+
+
+def _parse_body(body: bytes, content_type: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """请求体转为(姓名, 逾期比例, 逾期天数, 工作人天)四列"""
+    if ARROW_TYPE in content_type:
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(e)) from e
+        import pyarrow as pa
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+            columns = {column: table.column(column).to_pylist() for column in ("name",) + METRIC_COLUMNS}
+        except (pa.ArrowInvalid, KeyError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"无效的Arrow请求体: {e}") from e
+    else:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"无效的JSON请求体: {e}") from e
+        if isinstance(payload, dict) and "employees" in payload:
+            try:
+                columns = {column: [record[column] for record in payload["employees"]]
+                           for column in ("name",) + METRIC_COLUMNS}
+            except (KeyError, TypeError) as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"员工记录缺少字段: {e}") from e
+        elif isinstance(payload, dict):
+            columns = payload
+        else:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "请求体须为JSON对象")
+
+    missing = [column for column in ("name",) + METRIC_COLUMNS if column not in columns]
+    if missing:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"请求缺少列: {', '.join(missing)}")
+    try:
+        names = np.array([str(name).strip() for name in columns["name"]], dtype=str)
+        metrics = [np.array(columns[column], dtype=np.float64) for column in METRIC_COLUMNS]
+    except (TypeError, ValueError) as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"指标须为数值: {e}") from e
+    return (names, *metrics)
+
+
+def _validate_request_columns(names: np.ndarray, *metrics: np.ndarray) -> None:
+    if any(values.ndim != 1 or len(values) != len(names) for values in metrics):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "姓名与各项指标长度不一致")
+    if not len(names):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "请求中没有员工数据")
+    if (names == "").any():
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "存在空姓名")
+    if len(np.unique(names)) != len(names):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "存在重复姓名")
+    if not all(np.isfinite(values).all() for values in metrics):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "存在缺失或非有限的指标值")
+
+
+# ========== 响应输出 ==========
+def _records_json(df: pd.DataFrame) -> str:
+    return df.to_json(orient="records", force_ascii=False, double_precision=15)
+
+
+def _json_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    yield f'{{"count": {len(df)}, "results": ['.encode()
+    for start in range(0, len(df), chunk_rows):
+        records = _records_json(df.iloc[start:start + chunk_rows])[1:-1]
+        yield ((", " if start else "") + records).encode("utf-8")
+    yield b"]}"
+
+
+def _ndjson_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_json(
+            orient="records", lines=True, force_ascii=False, double_precision=15).rstrip("\n").encode("utf-8") + b"\n"
+
+
+def _arrow_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    with pa.ipc.new_stream(buffer, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            writer.write_batch(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()  # 流结束标记
+
+
+def _status_line(status: HTTPStatus) -> str:
+    return f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: HTTPStatus, payload: Dict, keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (_status_line(status) + f"Content-Type: {JSON_TYPE}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _send_chunked(writer: asyncio.StreamWriter, status: HTTPStatus, content_type: str,
+                        chunks: Iterator[bytes], keep_alive: bool) -> None:
+    """分块传输编码输出，每块写出后等待缓冲区排空，大结果不在内存中整体拼接"""
+    charset = "; charset=utf-8" if content_type != ARROW_TYPE else ""
+    head = (_status_line(status) + f"Content-Type: {content_type}{charset}\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1"))
+    for chunk in chunks:
+        if chunk:
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def serve(host: str, port: int, **options) -> None:
+    service = ScoringService(**options)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"✅ 评分服务已启动: http://{address[0]}:{address[1]}  (POST /score, GET /health)")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 本地HTTP评分服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址 (默认: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口 (默认: 8765)")
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY * 1000,
+                        help="并发请求合并等待时间，毫秒 (默认: 5)")
+    parser.add_argument("--max-batch-rows", type=int, default=DEFAULT_MAX_BATCH_ROWS,
+                        help=f"单次合并评分的最大行数 (默认: {DEFAULT_MAX_BATCH_ROWS})")
+    parser.add_argument("--lookup", action="store_true", help="批量评分使用预计算查找表")
+
+    args = parser.parse_args()
+
+    processor = DataProcessor()
+    processor.calculator.use_lookup = args.lookup
+    try:
+        asyncio.run(serve(args.host, args.port, processor=processor, max_delay=args.max_delay_ms / 1000,
+                          max_batch_rows=args.max_batch_rows))
+    except KeyboardInterrupt:
+        print("评分服务已停止")
+
+
+if __name__ == "__main__":
+    main()
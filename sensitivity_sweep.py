@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+权重/等级门槛敏感性扫描
+对同一份已加载的数据批量评估多组权重与等级门槛，输出每组方案的等级分布和排名变化，
+用于校准ScoringConfig.weights与grade_thresholds。
+
+各项子得分与权重、门槛无关，只计算一次；每组方案仅需一次加权求和与分级，
+按方案分块向量化计算，数千组方案可在数秒内完成。子得分、加权求和与请假调整均由
+scoring_rules编译的规则计算，与批量评分使用同一份规则。
+"""
+
+import argparse
+import itertools
+import os
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scoring import AlignedData, DataProcessor, ScoringCalculator
+from scoring_rules import build_rule_spec, compile_rules
+
+GRADES = ("S", "A", "B", "C", "D")
+THRESHOLD_KEYS = ("S", "A", "B", "C")
+
+
+def weight_grid(step: float = 0.05, min_weight: float = 0.0) -> np.ndarray:
+    """生成三项权重之和为1的网格，返回 K×3 数组（逾期比例、逾期天数、工作人天）"""
+    n = int(round(1 / step))
+    combos = [(i, j, n - i - j) for i in range(n + 1) for j in range(n + 1 - i)]
+    weights = np.array(combos, dtype=np.float64) / n
+    return weights[(weights >= min_weight - 1e-12).all(axis=1)]
+
+
+def threshold_grid(s_values: Sequence[float], a_values: Sequence[float],
+                   b_values: Sequence[float], c_values: Sequence[float]) -> np.ndarray:
+    """生成等级门槛组合（S>A>B>C），返回 K×4 数组"""
+    combos = [combo for combo in itertools.product(s_values, a_values, b_values, c_values)
+              if combo[0] > combo[1] > combo[2] > combo[3]]
+    return np.array(combos, dtype=np.float64).reshape(-1, 4)
+
+
+def random_candidates(n: int, seed: Optional[int] = None,
+                      threshold_ranges: Sequence[Tuple[float, float]] = ((75, 95), (60, 80), (45, 65), (30, 50))
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """随机采样n组方案：权重服从Dirichlet分布，门槛在各自区间内均匀采样并保证递减"""
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(3), size=n)
+    lows = np.array([low for low, _ in threshold_ranges])
+    highs = np.array([high for _, high in threshold_ranges])
+    thresholds = np.round(rng.uniform(lows, highs, size=(n, 4)), 1)
+    thresholds = -np.sort(-thresholds, axis=1)
+    return weights, thresholds
+
+
+def cross_candidates(weights: np.ndarray, thresholds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """权重网格与门槛网格做笛卡尔积"""
+    weight_idx, threshold_idx = np.meshgrid(np.arange(len(weights)), np.arange(len(thresholds)),
+                                            indexing="ij")
+    return weights[weight_idx.ravel()], thresholds[threshold_idx.ravel()]
+
+
+class SensitivitySweep:
+    """敏感性扫描引擎 - 复用已对齐的输入数组与向量化子得分"""
+
+    def __init__(self, aligned: AlignedData, calculator: ScoringCalculator = None,
+                 max_chunk_elements: int = 4_000_000):
+        self.aligned = aligned
+        self.calculator = calculator or ScoringCalculator()
+        self.max_chunk_elements = max_chunk_elements
+
+        self.rules = compile_rules(build_rule_spec(self.calculator.config))
+        # 子得分（未取整，与标量路径一致）按 逾期比例、逾期天数、工作人天 顺序堆叠
+        self.sub_scores = np.stack([
+            self.rules.score_component("overdue_ratio", aligned.overdue_ratio),
+            self.rules.score_component("overdue_days", aligned.overdue_days),
+            self.rules.score_component("work_days", aligned.work_days),
+        ])
+
+        weights = self.rules.spec["weights"]
+        thresholds = {item["grade"]: item["min_score"] for item in self.rules.spec["grades"]}
+        self.baseline_weights = np.array([[weights["overdue_ratio"], weights["overdue_days"],
+                                           weights["work_days"]]])
+        self.baseline_thresholds = np.array([[thresholds[key] for key in THRESHOLD_KEYS]],
+                                            dtype=np.float64)
+        baseline_scores = self._scores(self.baseline_weights)
+        self.baseline_grades = self._grade_codes(baseline_scores, self.baseline_thresholds)[0]
+        self.baseline_ranks = self._ranks(baseline_scores)[0]
+
+    def _scores(self, weights: np.ndarray) -> np.ndarray:
+        """K组权重下的综合得分（K×N），运算顺序与标量路径一致"""
+        ratio, days, work = self.sub_scores
+        columns = {"overdue_ratio": weights[:, 0:1], "overdue_days": weights[:, 1:2],
+                   "work_days": weights[:, 2:3]}
+        return self.rules.combine(ratio, days, work, self.aligned.work_days, weights=columns)
+
+    @staticmethod
+    def _grade_codes(scores: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        """等级编码：0=S, 1=A, 2=B, 3=C, 4=D"""
+        passed = sum((scores >= thresholds[:, i:i + 1]).astype(np.int8) for i in range(4))
+        return 4 - passed
+
+    @staticmethod
+    def _ranks(scores: np.ndarray) -> np.ndarray:
+        """按得分降序的排名（从0开始，同分按原顺序）"""
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(scores.shape[1]), axis=1)
+        return ranks
+
+    def evaluate(self, weights: np.ndarray, thresholds: np.ndarray) -> pd.DataFrame:
+        """评估K组方案（weights: K×3，thresholds: K×4），返回每组方案的等级分布与排名变化"""
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1, 3)
+        thresholds = np.asarray(thresholds, dtype=np.float64).reshape(-1, 4)
+        if len(weights) != len(thresholds):
+            raise ValueError("权重与门槛方案数量不一致")
+
+        n_employees = self.sub_scores.shape[1]
+        chunk = max(1, self.max_chunk_elements // max(n_employees, 1))
+        parts = []
+        for start in range(0, len(weights), chunk):
+            w = weights[start:start + chunk]
+            t = thresholds[start:start + chunk]
+            scores = self._scores(w)
+            codes = self._grade_codes(scores, t)
+
+            offsets = (np.arange(len(w)) * len(GRADES))[:, None]
+            counts = np.bincount((codes + offsets).ravel(),
+                                 minlength=len(w) * len(GRADES)).reshape(len(w), len(GRADES))
+            rank_shift = np.abs(self._ranks(scores) - self.baseline_ranks)
+
+            parts.append(np.column_stack([
+                w, t, counts,
+                (codes != self.baseline_grades).sum(axis=1),
+                rank_shift.mean(axis=1),
+                rank_shift.max(axis=1),
+            ]))
+
+        columns = (["w_overdue_ratio", "w_overdue_days", "w_work_days"]
+                   + [f"{grade}_cutoff" for grade in THRESHOLD_KEYS]
+                   + list(GRADES)
+                   + ["grade_changes", "mean_rank_shift", "max_rank_shift"])
+        result = pd.DataFrame(np.vstack(parts) if parts else np.empty((0, len(columns))),
+                              columns=columns)
+        for column in list(GRADES) + ["grade_changes", "max_rank_shift"]:
+            result[column] = result[column].astype(np.int64)
+        result["D_ratio"] = (result["D"] / max(n_employees, 1) * 100).round(1)
+        return result
+
+
+def _parse_values(text: Optional[str], default: float) -> Sequence[float]:
+    if not text:
+        return [default]
+    return [float(value) for value in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 权重/等级门槛敏感性扫描")
+    parser.add_argument("--overdue", help="逾期比例数据文件路径 (默认: data/overdue.data)")
+    parser.add_argument("--mean-overdue", help="逾期天数均值数据文件路径 (默认: data/mean_overdue.data)")
+    parser.add_argument("--days", help="工作人天数据文件路径 (默认: data/days.data)")
+    parser.add_argument("--samples", type=int, help="随机采样方案数量（不指定则使用网格）")
+    parser.add_argument("--seed", type=int, default=0, help="随机采样种子")
+    parser.add_argument("--weight-step", type=float, default=0.1, help="权重网格步长 (默认: 0.1)")
+    parser.add_argument("--min-weight", type=float, default=0.1, help="网格中每项最小权重 (默认: 0.1)")
+    parser.add_argument("--s-cutoffs", help="S级门槛候选，逗号分隔 (默认: 当前配置)")
+    parser.add_argument("--a-cutoffs", help="A级门槛候选，逗号分隔")
+    parser.add_argument("--b-cutoffs", help="B级门槛候选，逗号分隔")
+    parser.add_argument("--c-cutoffs", help="C级门槛候选，逗号分隔")
+    parser.add_argument("--target-d-ratio", type=float, default=35.0, help="目标D级占比%% (默认: 35)")
+    parser.add_argument("--top", type=int, default=10, help="显示最接近目标的方案数量")
+    parser.add_argument("--output", help="完整扫描结果输出文件路径 (CSV格式)")
+
+    args = parser.parse_args()
+
+    data_dir = os.getenv('DATA_DIR', 'data')
+    overdue_file = args.overdue or os.path.join(data_dir, 'overdue.data')
+    mean_overdue_file = args.mean_overdue or os.path.join(data_dir, 'mean_overdue.data')
+    days_file = args.days or os.path.join(data_dir, 'days.data')
+
+    try:
+        processor = DataProcessor()
+        aligned = processor.load_aligned_data(overdue_file, mean_overdue_file, days_file)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ 数据加载失败: {e}")
+        return
+
+    sweep = SensitivitySweep(aligned, processor.calculator)
+    if args.samples:
+        weights, thresholds = random_candidates(args.samples, args.seed)
+    else:
+        baseline = processor.calculator.config.grade_thresholds
+        thresholds = threshold_grid(_parse_values(args.s_cutoffs, baseline["S"]),
+                                    _parse_values(args.a_cutoffs, baseline["A"]),
+                                    _parse_values(args.b_cutoffs, baseline["B"]),
+                                    _parse_values(args.c_cutoffs, baseline["C"]))
+        weights, thresholds = cross_candidates(weight_grid(args.weight_step, args.min_weight), thresholds)
+
+    result = sweep.evaluate(weights, thresholds)
+    print(f"\n=== 敏感性扫描 (共{len(result)}组方案, {len(aligned.names)}人) ===")
+
+    result["target_gap"] = (result["D_ratio"] - args.target_d_ratio).abs()
+    best = result.sort_values(["target_gap", "mean_rank_shift"], kind="mergesort").head(args.top)
+    print(f"📌 最接近目标D级占比{args.target_d_ratio}%的方案（排名变化越小越稳定）:")
+    print(best.drop(columns="target_gap").to_string(index=False))
+
+    if args.output:
+        result.drop(columns="target_gap").to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n结果已保存到: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
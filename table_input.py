@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合并表格输入
+读取单个 CSV / Parquet / Arrow-IPC 文件代替三个 .data 文件，每人一行、按列存储类型化数据：
+  name, overdue_ratio(%), overdue_days, work_days
+可选扩展列：complexity, urgent_tasks_completed, urgent_tasks_total
+
+只读取需要的列（列投影），按块读取后拼接，结果交给与 .data 文件相同的连接、验证和评分流程。
+Parquet 与 Arrow-IPC 需要安装 pyarrow（pip install "performance-evaluation[arrow]"）。
+"""
+
+import argparse
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = ("overdue_ratio", "overdue_days", "work_days")
+EXTENDED_COLUMNS = ("complexity", "urgent_tasks_completed", "urgent_tasks_total")
+COLUMN_DTYPES = {
+    "name": "string",
+    "overdue_ratio": "float64",
+    "overdue_days": "float64",
+    "work_days": "float64",
+    "complexity": "category",
+    "urgent_tasks_completed": "Int64",
+    "urgent_tasks_total": "Int64",
+}
+# 与 .data 文件对应的数据类别，用于未匹配提示和缓存键
+METRIC_KINDS = {"overdue_ratio": "overdue", "overdue_days": "mean_overdue", "work_days": "days"}
+
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet", ".pq": "parquet",
+    ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow",
+}
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def detect_format(file_path: str) -> str:
+    """按扩展名判断文件格式"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"不支持的输入格式: {file_path}（支持 .csv、.parquet、.arrow/.feather）")
+    return FORMAT_EXTENSIONS[extension]
+
+
+def require_pyarrow():
+    """检查可选依赖pyarrow（Parquet/Arrow读写），未安装时给出安装说明"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError('读写Parquet/Arrow文件需要安装pyarrow: pip install "performance-evaluation[arrow]"') from e
+
+
+def _open_arrow(file_path: str):
+    """打开Arrow-IPC文件（文件格式或流格式）"""
+    import pyarrow as pa
+    try:
+        return pa.ipc.open_file(file_path)
+    except pa.ArrowInvalid:
+        return pa.ipc.open_stream(file_path)
+
+
+def available_columns(file_path: str) -> List[str]:
+    """读取文件中的列名（只读表头或schema）"""
+    fmt = detect_format(file_path)
+    if fmt == "csv":
+        return list(pd.read_csv(file_path, nrows=0, encoding="utf-8-sig").columns)
+    require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(file_path).names)
+    return list(_open_arrow(file_path).schema.names)
+
+
+def iter_table_chunks(file_path: str, columns: Sequence[str],
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """按块读取指定列"""
+    fmt = detect_format(file_path)
+    columns = list(columns)
+    if fmt == "csv":
+        dtypes = {column: COLUMN_DTYPES[column] for column in columns if column in COLUMN_DTYPES}
+        yield from pd.read_csv(file_path, usecols=columns, dtype=dtypes, chunksize=chunk_rows,
+                               encoding="utf-8-sig")
+        return
+
+    require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows, columns=columns)
+    else:
+        reader = _open_arrow(file_path)
+        if hasattr(reader, "num_record_batches"):
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        else:
+            batches = iter(reader)
+    for batch in batches:
+        yield batch.select(columns).to_pandas()
+
+
+def read_table(file_path: str, columns: Optional[Sequence[str]] = None,
+               chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """读取合并文件的指定列（默认基础列），姓名重复时保留最后一行（与.data文件一致）"""
+    columns = list(columns or ("name",) + METRIC_COLUMNS)
+    missing = [column for column in columns if column not in available_columns(file_path)]
+    if missing:
+        raise ValueError(f"输入文件缺少列: {', '.join(missing)}")
+
+    chunks = list(iter_table_chunks(file_path, columns, chunk_rows))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+    df = df.dropna(subset=["name"])
+    df["name"] = df["name"].astype(str).str.strip()
+    df = df[df["name"] != ""]
+    return df.drop_duplicates("name", keep="last").reset_index(drop=True)
+
+
+def read_metric_columns(file_path: str,
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """读取三项指标，返回 {数据类别: (姓名, 数值)}，格式与DataProcessor.load_columns一致
+
+    某项指标为空的员工只从该项中剔除，其余流程按未匹配员工处理。
+    """
+    df = read_table(file_path, ("name",) + METRIC_COLUMNS, chunk_rows)
+    names = df["name"].to_numpy(dtype=str)
+    columns = {}
+    for column, kind in METRIC_KINDS.items():
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        columns[kind] = (names[present], values[present])
+    return columns
+
+
+def read_attributes(file_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Optional[pd.DataFrame]:
+    """读取扩展属性列（存在时），供DataProcessor.add_enhanced_scores使用"""
+    extended = [column for column in EXTENDED_COLUMNS if column in available_columns(file_path)]
+    if not extended:
+        return None
+    return read_table(file_path, ["name"] + extended, chunk_rows)
+
+
+def write_table(df: pd.DataFrame, file_path: str) -> None:
+    """按扩展名写出合并文件"""
+    fmt = detect_format(file_path)
+    if fmt == "csv":
+        df.to_csv(file_path, index=False, encoding="utf-8-sig")
+        return
+    require_pyarrow()
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path)
+    else:
+        with pa.ipc.new_file(file_path, table.schema) as writer:
+            writer.write_table(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="研发团队效能评分 - 将三个.data文件合并为单个CSV/Parquet/Arrow文件")
+    parser.add_argument("--overdue", help="逾期比例数据文件路径 (默认: data/overdue.data)")
+    parser.add_argument("--mean-overdue", help="逾期天数均值数据文件路径 (默认: data/mean_overdue.data)")
+    parser.add_argument("--days", help="工作人天数据文件路径 (默认: data/days.data)")
+    parser.add_argument("--output", required=True, help="合并文件路径（.csv/.parquet/.arrow）")
+
+    args = parser.parse_args()
+
+    from scoring import DataProcessor
+
+    data_dir = os.getenv('DATA_DIR', 'data')
+    processor = DataProcessor()
+    try:
+        aligned = processor.load_aligned_data(args.overdue or os.path.join(data_dir, 'overdue.data'),
+                                              args.mean_overdue or os.path.join(data_dir, 'mean_overdue.data'),
+                                              args.days or os.path.join(data_dir, 'days.data'))
+        write_table(pd.DataFrame({"name": aligned.names, "overdue_ratio": aligned.overdue_ratio,
+                                  "overdue_days": aligned.overdue_days, "work_days": aligned.work_days}),
+                    args.output)
+    except (FileNotFoundError, ValueError, ImportError) as e:
+        print(f"❌ 转换失败: {e}")
+        return
+    print(f"✅ 已写出 {len(aligned.names)} 人的合并文件: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多周期批量评分测试
+验证目录扫描、进程池并行评分与合并结果
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_runner import discover_tasks, run_batch
+
+
+def _write_period(path, records):
+    os.makedirs(path)
+    for index, file_name in enumerate(["overdue.data", "mean_overdue.data", "days.data"]):
+        with open(os.path.join(path, file_name), "w", encoding="utf-8") as f:
+            for name, values in records.items():
+                f.write(f"{name}\n{values[index]}\n0\n")
+
+
+def test_run_batch():
+    """并行与串行结果一致，失败的周期单独报告"""
+    with tempfile.TemporaryDirectory() as root:
+        _write_period(os.path.join(root, "平台组", "2025-08"), {"张三": (10, 1, 12), "李四": (60, 5, 6)})
+        _write_period(os.path.join(root, "平台组", "2025-09"), {"张三": (30, 2, 10), "李四": (0, 0, 0)})
+        _write_period(os.path.join(root, "算法组", "2025-09"), {"王五": (120, 1, 10)})
+        os.makedirs(os.path.join(root, "算法组", "2025-10"))  # 缺少数据文件，不参与评分
+
+        tasks = discover_tasks(root)
+        assert [(t.team, t.period) for t in tasks] == \
+            [("平台组", "2025-08"), ("平台组", "2025-09"), ("算法组", "2025-09")]
+
+        serial, serial_failures = run_batch(root, workers=1)
+        parallel, parallel_failures = run_batch(root, workers=2, verbose=False)
+
+    assert serial.equals(parallel)
+    assert len(serial) == 4
+    assert serial[["team", "period", "排名", "name"]].values.tolist()[:2] == \
+        [["平台组", "2025-08", 1, "张三"], ["平台组", "2025-08", 2, "李四"]]
+    assert [(t.team, t.period) for t, _ in serial_failures] == [("算法组", "2025-09")]
+    assert len(parallel_failures) == 1
+    print("✅ 批量评分结果正确")
+
+
+if __name__ == "__main__":
+    test_run_batch()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量向量化评分测试
+验证calculate_batch_scores与逐人标量评分结果逐位一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import ScoringCalculator, DataProcessor
+
+
+def _scalar_columns(calculator, ratios, days, work_days):
+    """使用标量路径逐人计算，作为对照"""
+    rows = [calculator.calculate_comprehensive_score(r, d, w)
+            for r, d, w in zip(ratios, days, work_days)]
+    columns = {key: np.array([row[key] for row in rows]) for key in rows[0]}
+    columns["grade"] = np.array([calculator.get_grade(s) for s in columns["comprehensive_score"]])
+    columns["needs_review"] = np.array([calculator.needs_review(w) for w in work_days])
+    columns["explain_code"] = np.array([calculator.explain_code(r, d, w)
+                                        for r, d, w in zip(ratios, days, work_days)], dtype=np.uint8)
+    return columns
+
+
+def test_batch_matches_scalar():
+    """随机输入与边界值下批量结果与标量结果逐位一致"""
+    calculator = ScoringCalculator()
+    rng = np.random.default_rng(20250909)
+
+    # 边界值 + 0.1精度的真实分布 + 任意浮点
+    edges = [0.0, 0.5, 1.0, 1.1, 2.0, 3.0, 3.1, 9.9, 10.0, 10.1, 15.0, 15.1, 20.0, 20.1, 40.0, 90.0]
+    ratios = np.concatenate([[0.0, 20.0, 20.1, 70.0, 100.0] * 4,
+                             np.round(rng.uniform(0, 100, 50000), 1),
+                             rng.uniform(0, 100, 50000)])
+    days = np.concatenate([edges + edges[:4],
+                           np.round(rng.uniform(0, 40, 50000), 1),
+                           rng.uniform(0, 40, 50000)])
+    work_days = np.concatenate([edges + edges[:4],
+                                np.round(rng.uniform(0, 40, 50000), 1),
+                                rng.uniform(0, 40, 50000)])
+    rng.shuffle(work_days)
+
+    batch = calculator.calculate_batch_scores(ratios, days, work_days)
+    scalar = _scalar_columns(calculator, ratios.tolist(), days.tolist(), work_days.tolist())
+
+    for key, expected in scalar.items():
+        actual = batch[key]
+        if expected.dtype.kind == "f":
+            assert np.array_equal(actual.view(np.int64), expected.astype(np.float64).view(np.int64)), key
+        else:
+            assert np.array_equal(actual, expected), key
+    print(f"✅ {len(ratios)}组输入批量与标量结果逐位一致")
+
+
+def test_process_files_uses_batch_scores():
+    """process_files输出与标量评分一致"""
+    records = {"张三": (10.0, 1.0, 12.0), "李四": (55.5, 6.3, 6.0), "王五": (0.0, 0.0, 0.0)}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index, fmt in enumerate(["{:.1f}%", "{:.1f}", "{:.1f}"]):
+            path = os.path.join(tmp, f"{index}.data")
+            with open(path, "w", encoding="utf-8") as f:
+                for name, values in records.items():
+                    f.write(f"{name}\n{fmt.format(values[index])}\n0\n")
+            paths.append(path)
+
+        processor = DataProcessor()
+        df = processor.process_files(*paths)
+
+    assert "explanation" not in df.columns
+    df = processor.render_explanations(df)
+    calculator = ScoringCalculator()
+    for _, row in df.iterrows():
+        expected = calculator.calculate_comprehensive_score(*records[row["name"]])
+        assert row["comprehensive_score"] == expected["comprehensive_score"]
+        assert row["grade"] == calculator.get_grade(expected["comprehensive_score"])
+        assert row["explanation"] == calculator.explain_score(*records[row["name"]])
+    assert list(df["comprehensive_score"]) == sorted(df["comprehensive_score"], reverse=True)
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_process_files_uses_batch_scores()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据集连接测试
+验证三个数据集一次性对齐、未匹配员工报告以及数据验证
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scoring import DataParser
+
+
+def test_join_columns():
+    """三个数据集按姓名对齐，并报告各自未匹配的员工"""
+    overdue = DataParser.to_columns({"张三": 10.0, "李四": 50.0, "王五": 30.0, "赵六": 5.0})
+    mean_overdue = DataParser.to_columns({"王五": 3.0, "张三": 1.0, "赵六": 0.5})
+    days = DataParser.to_columns({"赵六": 12.0, "张三": 8.0, "钱七": 10.0})
+
+    aligned = DataParser.join_columns(overdue, mean_overdue, days)
+    assert aligned.names.tolist() == ["张三", "赵六"]
+    assert aligned.overdue_ratio.tolist() == [10.0, 5.0]
+    assert aligned.overdue_days.tolist() == [1.0, 0.5]
+    assert aligned.work_days.tolist() == [8.0, 12.0]
+    assert aligned.unmatched == {"overdue": ["李四", "王五"], "mean_overdue": ["王五"], "days": ["钱七"]}
+
+    assert DataParser.validate_columns(overdue, mean_overdue, days, aligned) == (True, "数据验证通过")
+    print("✅ 三数据集连接结果正确")
+
+
+def test_validate_data():
+    """数据验证的错误信息与逐条检查保持一致"""
+    assert DataParser.validate_data({}, {"张三": 1.0}, {"张三": 1.0}) == (False, "存在空数据集")
+    assert DataParser.validate_data({"张三": 1.0}, {"李四": 1.0}, {"张三": 1.0}) == \
+        (False, "三个数据集没有共同的员工姓名")
+    assert DataParser.validate_data({"张三": 120.0}, {"张三": 1.0}, {"张三": 1.0}) == \
+        (False, "逾期比例数据异常: 张三 = 120.0%")
+    assert DataParser.validate_data({"张三": 1.0}, {"张三": 1.0}, {"张三": -2.5}) == \
+        (False, "工作人天数据异常: 张三 = -2.5人天")
+
+
+if __name__ == "__main__":
+    test_join_columns()
+    test_validate_data()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量增强版评分测试
+验证向量化增强评分与逐人调用calculate_enhanced_comprehensive_score逐位一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore
+from scoring import DataProcessor, ScoringCalculator
+
+
+def _ragged(rng, n, width, low, high, decimals):
+    """右对齐的历史矩阵，每行随机期数，缺失为NaN"""
+    matrix = np.round(rng.uniform(low, high, (n, width)), decimals)
+    lengths = rng.integers(0, width + 1, n)
+    matrix[np.arange(width) < (width - lengths)[:, None]] = np.nan
+    return matrix
+
+
+def _history_list(row):
+    return [value for value in row.tolist() if value == value]
+
+
+def test_batch_enhanced_matches_scalar():
+    """复杂度类别、历史矩阵、紧急任务计数组合下与标量结果逐位一致"""
+    calculator = ScoringCalculator()
+    rng = np.random.default_rng(19)
+    n, width = 3000, 10
+    ratio = np.round(rng.uniform(0, 100, n), 1)
+    days = np.round(rng.uniform(0, 10, n), 1)
+    work = np.round(rng.uniform(0, 25, n), 1)
+    complexity = pd.Categorical(rng.choice(["简单", "中等", "复杂", "非常复杂", "未知"], n))
+    previous_ratios = _ragged(rng, n, width, 0, 100, 1)
+    historical_scores = _ragged(rng, n, width, 0, 100, 2)
+    total = rng.integers(0, 6, n)
+    completed = np.minimum(rng.integers(0, 6, n), total)
+
+    batch = calculator.calculate_batch_enhanced_scores(ratio, days, work, complexity, previous_ratios,
+                                                       historical_scores, completed, total)
+    for i in range(n):
+        expected = calculator.calculate_enhanced_comprehensive_score(
+            ratio[i].item(), days[i].item(), work[i].item(), complexity[i],
+            _history_list(previous_ratios[i]), _history_list(historical_scores[i]),
+            int(completed[i]), int(total[i]))
+        for key, value in expected.items():
+            assert batch[key][i] == value, (key, i)
+    print(f"✅ {n}人批量增强评分与标量结果一致")
+
+
+def test_pipeline_uses_history_and_attributes():
+    """add_enhanced_scores按姓名对齐扩展属性，并从历史库读取最近N期"""
+    processor = DataProcessor()
+    calculator = processor.calculator
+    df = pd.DataFrame({"name": ["张三", "李四", "王五"], "overdue_ratio": [30.0, 10.0, 55.0],
+                       "overdue_days": [1.0, 3.0, 0.5], "work_days": [10.0, 12.0, 2.0]})
+    attributes = pd.DataFrame({"name": ["李四", "张三"], "complexity": ["复杂", "简单"],
+                               "urgent_tasks_completed": [2, 1], "urgent_tasks_total": [2, 3]})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(tmp)
+        for period, base in (("2025-06", 20.0), ("2025-07", 40.0), ("2025-08", 35.0), ("2025-09", 25.0)):
+            store.append_period(period, pd.DataFrame({
+                "name": ["张三", "李四"], "overdue_ratio": [base, base / 2], "overdue_days": [1.0, 1.0],
+                "work_days": [10.0, 10.0], "comprehensive_score": [base * 2, 90.0 - base]}))
+
+        result = processor.add_enhanced_scores(df, attributes, store, window=3)
+        defaults = {"王五": ("中等", 0, 0)}
+        for row in result.itertuples():
+            complexity, completed, total = defaults.get(row.name) or tuple(
+                attributes.set_index("name").loc[row.name, ["complexity", "urgent_tasks_completed",
+                                                           "urgent_tasks_total"]])
+            history = store.last_n(row.name, 3)
+            expected = calculator.calculate_enhanced_comprehensive_score(
+                row.overdue_ratio, row.overdue_days, row.work_days, complexity,
+                history["overdue_ratio"].tolist(), history["comprehensive_score"].tolist(),
+                int(completed), int(total))
+            for key in ("adjusted_ratio_score", "trend_score", "stability_score", "urgency_score", "enhanced_score"):
+                assert getattr(row, key) == expected[key], (row.name, key)
+    print("✅ 增强评分流水线与标量结果一致")
+
+
+if __name__ == "__main__":
+    test_batch_enhanced_matches_scalar()
+    test_pipeline_uses_history_and_attributes()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史评分库测试
+验证按周期追加、重新打开后读取、最近N期回溯以及中断或写入失败后恢复
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from history_store import COLUMN_DTYPES, HistoryStore
+
+
+def _period_frame(names, base):
+    n = len(names)
+    return pd.DataFrame({
+        "name": names,
+        "overdue_ratio": base + np.arange(n, dtype=float),
+        "overdue_days": np.full(n, base / 10),
+        "work_days": np.full(n, 10.0),
+        "comprehensive_score": base + 0.5 + np.arange(n, dtype=float),
+    })
+
+
+def test_append_and_last_n():
+    """员工可缺席部分周期，最近N期按时间顺序返回；重新打开后结果不变"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(tmp)
+        store.append_period("2025-07", _period_frame(["张三", "李四"], 10.0))
+        store.append_period("2025-08", _period_frame(["李四", "王五"], 20.0))
+        store.append_period("2025-09", _period_frame(["张三", "李四", "王五"], 30.0))
+
+        for reopened in (store, HistoryStore(tmp)):
+            assert len(reopened) == 7
+            assert reopened.periods == ["2025-07", "2025-08", "2025-09"]
+            history = reopened.last_n("张三", 5)
+            assert list(history["period"]) == ["2025-07", "2025-09"]
+            assert list(history["comprehensive_score"]) == [10.5, 30.5]
+            assert list(reopened.last_n("李四", 2)["period"]) == ["2025-08", "2025-09"]
+            assert len(reopened.last_n("赵六", 3)["period"]) == 0
+
+            names, matrix = reopened.recent_matrix("overdue_ratio", 3, ["张三", "王五", "赵六"])
+            assert names == ["张三", "王五", "赵六"]
+            assert np.array_equal(matrix, np.array([[np.nan, 10.0, 30.0],
+                                                    [np.nan, 21.0, 32.0],
+                                                    [np.nan, np.nan, np.nan]]), equal_nan=True)
+
+        try:
+            store.append_period("2025-09", _period_frame(["张三"], 40.0))
+            assert False, "重复周期应报错"
+        except ValueError:
+            pass
+    print("✅ 历史库追加与最近N期读取正确")
+
+
+def test_recovers_from_uncommitted_tail():
+    """列文件中残留的未提交数据在下次追加时被覆盖"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(tmp)
+        store.append_period("2025-08", _period_frame(["张三", "李四"], 10.0))
+        for column in COLUMN_DTYPES:
+            with open(os.path.join(tmp, f"{column}.bin"), "ab") as f:
+                f.write(b"\xff" * 24)
+
+        store = HistoryStore(tmp)
+        assert len(store) == 2
+        store.append_period("2025-09", _period_frame(["李四"], 20.0))
+        reopened = HistoryStore(tmp)
+        assert len(reopened) == 3
+        assert list(reopened.last_n("李四", 3)["overdue_ratio"]) == [11.0, 20.0]
+        assert os.path.getsize(os.path.join(tmp, "work_days.bin")) == 3 * 8
+    print("✅ 中断残留数据被正确覆盖")
+
+
+def test_empty_period():
+    """追加空周期后历史库仍可重新打开，后续周期正常追加"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(tmp)
+        store.append_period("2024-01", _period_frame(["张三", "李四"], 10.0))
+        assert store.append_period("2024-02", _period_frame(["张三", "李四"], 20.0).iloc[:0]) == 0
+
+        reopened = HistoryStore(tmp)
+        assert len(reopened) == 2
+        assert reopened.periods == ["2024-01", "2024-02"]
+        reopened.append_period("2024-03", _period_frame(["张三"], 30.0))
+        reopened = HistoryStore(tmp)
+        assert list(reopened.last_n("张三", 3)["period"]) == ["2024-01", "2024-03"]
+    print("✅ 空周期追加后历史库保持可用")
+
+
+def test_failed_append_keeps_state():
+    """写入失败时内存中的周期、员工与指针保持不变，之后可正常重试"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(tmp)
+        store.append_period("2025-08", _period_frame(["张三", "李四"], 10.0))
+
+        def failing_write_meta(*args):
+            raise OSError("磁盘已满")
+        store._write_meta = failing_write_meta
+        try:
+            store.append_period("2025-09", _period_frame(["李四", "王五"], 20.0))
+            raise AssertionError("元数据写入失败时应抛出异常")
+        except OSError:
+            pass
+        assert len(store) == 2 and store.periods == ["2025-08"]
+        assert store.employees == ["张三", "李四"]
+        assert list(store.last_n("李四", 3)["overdue_ratio"]) == [11.0]
+
+        del store._write_meta
+        store.append_period("2025-09", _period_frame(["李四", "王五"], 20.0))
+        reopened = HistoryStore(tmp)
+        assert reopened.employees == ["张三", "李四", "王五"]
+        assert list(reopened.last_n("李四", 3)["overdue_ratio"]) == [11.0, 20.0]
+    print("✅ 写入失败不改变历史库状态")
+
+
+if __name__ == "__main__":
+    test_append_and_last_n()
+    test_recovers_from_uncommitted_tail()
+    test_empty_period()
+    test_failed_append_keeps_state()
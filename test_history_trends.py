@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史滚动趋势与稳定性测试
+验证一次线性回填的结果与逐人逐期调用标量函数一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore
+from history_trends import backfill
+from scoring import ScoringCalculator
+
+
+def _build_store(path, n_periods=14, n_employees=60, seed=9):
+    """员工随机缺席部分周期，模拟入职、离职与请假"""
+    rng = np.random.default_rng(seed)
+    store = HistoryStore(path)
+    names = np.array([f"员工{i}" for i in range(n_employees)])
+    for month in range(n_periods):
+        present = names[rng.random(n_employees) < 0.8]
+        store.append_period(f"2024-{month + 1:02d}" if month < 12 else f"2025-{month - 11:02d}", pd.DataFrame({
+            "name": present,
+            "overdue_ratio": np.round(rng.uniform(0, 80, len(present)), 1),
+            "overdue_days": np.round(rng.uniform(0, 8, len(present)), 1),
+            "work_days": np.round(rng.uniform(0, 20, len(present)), 1),
+            "comprehensive_score": np.round(rng.uniform(10, 100, len(present)), 2),
+        }))
+    return store
+
+
+def test_backfill_matches_scalar():
+    """滑动窗口与全部历史两种模式下，趋势与稳定性与标量函数一致"""
+    calculator = ScoringCalculator()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _build_store(tmp)
+        for window in (3, 5, None):
+            result = backfill(store, window, calculator)
+            assert len(result) == len(store)
+
+            for row in result.itertuples():
+                history = store.employee_rows(row.name)
+                current = int(np.flatnonzero(np.array(store.periods)[store.column("period")[history]] == row.period)[0])
+                previous = history[:current] if window is None else history[max(0, current - window):current]
+                ratios = store.column("overdue_ratio")[previous].tolist()
+                scores = store.column("comprehensive_score")[previous].tolist()
+
+                assert row.history_periods == len(previous)
+                expected_trend = calculator.calculate_overdue_trend_score(row.overdue_ratio, ratios)
+                assert abs(row.trend_score - expected_trend) < 1e-9
+                expected = calculator.calculate_performance_stability(scores)
+                assert row.stability == expected["stability"]
+                assert row.stability_score == expected["stability_score"]
+                if len(scores) >= 3:
+                    assert abs(row.score_std - expected["std_dev"]) < 1e-9
+    print("✅ 滚动回填结果与标量函数一致")
+
+
+if __name__ == "__main__":
+    test_backfill_matches_scalar()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量评分测试
+验证只更新部分文件后，增量结果与整体重新评分一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from incremental_scoring import IncrementalScorer
+from scoring import DataProcessor
+
+
+def _write(path, values, fmt="{:.1f}"):
+    with open(path, "w", encoding="utf-8") as f:
+        for name, value in values.items():
+            f.write(f"{name}\n{fmt.format(value)}\n0\n")
+
+
+def _canonical(df):
+    """按(得分降序, 姓名升序)排列，便于与整体评分比较"""
+    df = df.sort_values(["comprehensive_score", "name"], ascending=[False, True], kind="mergesort")
+    return df.reset_index(drop=True)
+
+
+def test_incremental_update_matches_full_rescore():
+    """days文件变化（改值、新增、删除）后增量结果与完整重新评分一致"""
+    rng = np.random.default_rng(5)
+    names = [f"员工{i}" for i in range(300)]
+    overdue = dict(zip(names, np.round(rng.uniform(0, 80, 300), 1)))
+    mean_overdue = dict(zip(names, np.round(rng.uniform(0, 10, 300), 1)))
+    days = dict(zip(names, np.round(rng.uniform(0, 25, 300), 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ("overdue.data", "mean_overdue.data", "days.data")]
+        _write(paths[0], overdue, "{:.1f}%")
+        _write(paths[1], mean_overdue)
+        _write(paths[2], days)
+
+        scorer = IncrementalScorer()
+        initial = scorer.load(*paths)
+        full = DataProcessor().process_files(*paths, verbose=False)
+        assert _canonical(initial).equals(_canonical(full))
+        assert list(initial.index) == list(range(1, 301))
+
+        # 修改10人、删除2人、新增1人（新增者在其他文件中不存在，不参与排名）
+        new_days = dict(days)
+        for name in names[:10]:
+            new_days[name] = round(new_days[name] + 3.5, 1)
+        del new_days[names[10]], new_days[names[11]]
+        new_days["新同事"] = 12.0
+        new_days_path = os.path.join(tmp, "days_v2.data")
+        _write(new_days_path, new_days)
+
+        summary = scorer.update(days_file=new_days_path)
+        assert summary == {"changed": 10, "added": 1, "removed": 2, "rescored": 10}
+
+        updated = scorer.ranked_frame(anomalies=True)
+        full = DataProcessor().process_files(paths[0], paths[1], new_days_path, verbose=False)
+        assert _canonical(updated).equals(_canonical(full))
+        assert list(updated["comprehensive_score"]) == sorted(updated["comprehensive_score"], reverse=True)
+
+        # 默认只取排名所需的列，前top名与完整排行榜一致
+        top = scorer.ranked_frame(5)
+        assert "workload_anomaly" not in top.columns
+        assert list(top.index) == [1, 2, 3, 4, 5]
+        assert top.equals(updated.head(5)[top.columns])
+    print("✅ 增量评分与完整重新评分一致")
+
+
+def test_invalid_update_rejected():
+    """数据验证与完整评分一致；更新失败时已有状态保持不变"""
+    names = [f"员工{i}" for i in range(20)]
+    values = {name: float(i) for i, name in enumerate(names)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ("overdue.data", "mean_overdue.data", "days.data")]
+        _write(paths[0], values, "{:.1f}%")
+        _write(paths[1], values)
+        _write(paths[2], values)
+        invalid_overdue = os.path.join(tmp, "overdue_invalid.data")
+        _write(invalid_overdue, {**values, names[3]: -5.0}, "{:.1f}%")
+
+        try:
+            IncrementalScorer().load(invalid_overdue, paths[1], paths[2])
+            raise AssertionError("负的逾期比例应验证失败")
+        except ValueError as e:
+            assert "数据验证失败" in str(e)
+
+        scorer = IncrementalScorer()
+        before = scorer.load(*paths)
+        new_days = os.path.join(tmp, "days_v2.data")
+        _write(new_days, {**values, names[0]: 15.0})
+        for kwargs in ({"overdue_file": invalid_overdue, "days_file": new_days},
+                       {"days_file": new_days, "mean_overdue_file": os.path.join(tmp, "missing.data")}):
+            try:
+                scorer.update(**kwargs)
+                raise AssertionError(f"应更新失败: {kwargs}")
+            except (ValueError, FileNotFoundError):
+                pass
+        assert scorer.files["days"] == paths[2]
+        assert scorer.ranked_frame(anomalies=True).equals(before)
+
+        # 重新评分中途出错时，结果表、排行榜与快照均不被部分修改
+        calculator = scorer.processor.calculator
+        def failing_scores(*args):
+            raise RuntimeError("评分失败")
+        calculator.calculate_batch_scores = failing_scores
+        try:
+            scorer.update(days_file=new_days)
+            raise AssertionError("评分出错时应抛出异常")
+        except RuntimeError:
+            pass
+        del calculator.calculate_batch_scores
+        assert scorer.files["days"] == paths[2]
+        assert scorer.ranked_frame(anomalies=True).equals(before)
+        assert scorer.update(days_file=new_days)["changed"] == 1
+    print("✅ 无效数据被拒绝且不影响已有排行榜")
+
+
+if __name__ == "__main__":
+    test_incremental_update_matches_full_rescore()
+    test_invalid_update_rejected()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按需导入测试
+验证标量评分与数据解析不会加载pandas/numpy
+"""
+
+import sys
+import os
+import subprocess
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPT = """
+import sys, tempfile
+from scoring import DataParser, ScoringCalculator
+
+calculator = ScoringCalculator()
+calculator.calculate_comprehensive_score(35.0, 4.2, 8.0)
+calculator.get_grade(60.0)
+calculator.explain_score(35.0, 4.2, 8.0)
+
+with tempfile.NamedTemporaryFile("w", suffix=".data", encoding="utf-8", delete=False) as f:
+    f.write("张三\\n25%\\n20%\\n")
+DataParser.parse_overdue_data(f.name)
+
+print(sorted(m for m in ("numpy", "pandas") if m in sys.modules))
+"""
+
+
+def test_scalar_path_does_not_import_pandas():
+    """在独立进程中导入scoring并执行标量评分"""
+    output = subprocess.run([sys.executable, "-c", SCRIPT], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]", output
+    print("✅ 标量评分与解析未加载pandas/numpy")
+
+
+if __name__ == "__main__":
+    test_scalar_path_does_not_import_pandas()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+查表评分模式测试
+验证查找表结果与精确计算逐位一致，且配置修改后自动重建
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import ScoringCalculator, ScoringConfig
+
+
+def test_lookup_matches_exact():
+    """网格内、网格外及超出范围的输入在查表模式下与精确计算一致"""
+    rng = np.random.default_rng(7)
+    ratios = np.round(rng.uniform(0, 100, 20000), 1)
+    days = np.concatenate([np.round(rng.uniform(0, 40, 10000), 1), rng.uniform(0, 60, 10000)])
+    work_days = np.concatenate([rng.uniform(0, 60, 10000), np.round(rng.uniform(0, 40, 10000), 1)])
+
+    exact = ScoringCalculator().calculate_batch_scores(ratios, days, work_days)
+    lookup = ScoringCalculator(use_lookup=True).calculate_batch_scores(ratios, days, work_days)
+    for key in exact:
+        assert np.array_equal(exact[key], lookup[key]), key
+    print("✅ 查表模式与精确计算逐位一致")
+
+
+def test_lookup_invalidated_on_config_change():
+    """修改配置参数后查找表重建，结果跟随新配置"""
+    config = ScoringConfig()
+    calculator = ScoringCalculator(config, use_lookup=True)
+    work_days = np.array([6.0, 8.5, 12.0])
+
+    before = calculator.calculate_batch_scores(np.zeros(3), np.zeros(3), work_days)["work_days_score"]
+    config.work_days_params["base_penalty_rate"] = 8
+    after = calculator.calculate_batch_scores(np.zeros(3), np.zeros(3), work_days)["work_days_score"]
+
+    assert after[0] < before[0] and after[2] == before[2]
+    assert after[0] == round(calculator.calculate_work_days_score(6.0), 2)
+    # 各配置实例互不影响
+    assert ScoringConfig().work_days_params["base_penalty_rate"] == 5
+    print("✅ 配置修改后查找表已重建")
+
+
+if __name__ == "__main__":
+    test_lookup_matches_exact()
+    test_lookup_invalidated_on_config_change()
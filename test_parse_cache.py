@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析结果缓存测试
+验证命中、文件变更失效以及按总大小淘汰
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from parse_cache import ParsedDataCache
+from scoring import DataParser
+
+
+def test_parse_cache():
+    """缓存命中时不重新解析，文件内容变化后重新解析"""
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return DataParser.parse_days_data(path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "days.data")
+        with open(data_file, "w", encoding="utf-8") as f:
+            f.write("张三\n12.5\n10\n李四\n3\n10\n")
+
+        cache = ParsedDataCache(os.path.join(tmp, "cache"))
+        first = cache.load_dict(data_file, "days", parse)
+        second = cache.load_dict(data_file, "days", parse)
+        assert first == second == {"张三": 12.5, "李四": 3.0}
+        assert len(calls) == 1 and cache.hits == 1 and cache.misses == 1
+
+        # 新实例从磁盘索引恢复
+        reopened = ParsedDataCache(os.path.join(tmp, "cache"))
+        assert reopened.load_dict(data_file, "days", parse) == first
+        assert len(calls) == 1
+
+        with open(data_file, "w", encoding="utf-8") as f:
+            f.write("张三\n8\n10\n")
+        assert reopened.load_dict(data_file, "days", parse) == {"张三": 8.0}
+        assert len(calls) == 2
+
+        # 总大小限制为0时所有条目都会被淘汰
+        tiny = ParsedDataCache(os.path.join(tmp, "cache"), max_total_mb=0)
+        tiny.evict()
+        assert not [f for f in os.listdir(os.path.join(tmp, "cache")) if f.endswith(".npz")]
+    print("✅ 解析缓存命中与失效正确")
+
+
+if __name__ == "__main__":
+    test_parse_cache()
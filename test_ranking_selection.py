@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Top-K/Bottom-K选择测试
+验证部分选择的结果与完整排名表的head/tail一致（含同分情况）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from scoring import DataProcessor, ScoringConfig
+
+
+def _result_frame(scores):
+    names = [f"员工{i}" for i in range(len(scores))]
+    return pd.DataFrame({"name": names, "comprehensive_score": scores})
+
+
+def _ranked(df):
+    ranked = df.sort_values("comprehensive_score", ascending=False, kind="mergesort").reset_index(drop=True)
+    ranked.index += 1
+    return ranked
+
+
+def test_top_bottom_match_full_sort():
+    """大量同分时Top/Bottom与稳定排序后的head/tail逐行一致，索引为排名"""
+    processor = DataProcessor()
+    rng = np.random.default_rng(7)
+    df = _result_frame(np.round(rng.choice([40.0, 55.0, 70.0, 85.5, 12.25], 500), 2))
+    ranked = _ranked(df)
+
+    for k in (0, 1, 3, 17, 499, 500, 800):
+        top = processor.select_top(df, k)
+        bottom = processor.select_bottom(df, k)
+        assert top.equals(ranked.head(k)), k
+        assert bottom.equals(ranked.tail(k)), k
+    print("✅ Top/Bottom与完整排序结果一致")
+
+
+def test_grade_boundaries():
+    """门槛附近人员按得分降序返回，并给出与门槛的距离"""
+    config = ScoringConfig()
+    processor = DataProcessor(config)
+    df = _result_frame(np.array([86.0, 84.0, 90.0, 70.5, 69.0, 10.0, 83.5]))
+
+    boundaries = processor.select_grade_boundaries(df, margin=2.0)
+    assert list(boundaries["S"]["name"]) == ["员工0", "员工1", "员工6"]
+    assert list(boundaries["S"]["distance_to_cutoff"]) == [1.0, -1.0, -1.5]
+    assert list(boundaries["A"]["name"]) == ["员工3", "员工4"]
+    assert boundaries["C"].empty
+    print("✅ 等级门槛附近人员选择正确")
+
+
+if __name__ == "__main__":
+    test_top_bottom_match_full_sort()
+    test_grade_boundaries()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检测结果编码测试
+验证批量检测的uint8编码经共享文字表还原后与逐人检测结果一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import ScoringCalculator, describe_reason
+
+
+def _inputs():
+    """边界值网格 + 随机值"""
+    edges = np.array([0.0, 0.5, 0.6, 1.0, 4.9, 5.0, 8.0, 12.0, 15.0, 15.1, 20.0, 20.1,
+                      30.0, 30.1, 40.0, 40.1, 50.0, 50.1, 60.0, 60.1, np.nan])
+    ratio, work = np.meshgrid(edges, edges)
+    rng = np.random.default_rng(11)
+    ratio = np.concatenate([ratio.ravel(), np.round(rng.uniform(0, 100, 5000), 1)])
+    work = np.concatenate([work.ravel(), np.round(rng.uniform(0, 30, 5000), 1)])
+    return ratio, work
+
+
+def test_batch_detectors_match_scalar():
+    """逾期模式与任务分配检测：编码查表结果与标量字典一致"""
+    calculator = ScoringCalculator()
+    ratio, work = _inputs()
+    days = np.ones_like(ratio)
+
+    pattern_codes = calculator.analyze_batch_overdue_patterns(ratio, days, work)
+    assignment_codes = calculator.detect_batch_task_assignment_issues(work, ratio)
+    assert pattern_codes.dtype == np.uint8 and assignment_codes.dtype == np.uint8
+
+    for r, w, pattern, assignment in zip(ratio.tolist(), work.tolist(),
+                                         pattern_codes.tolist(), assignment_codes.tolist()):
+        assert describe_reason("overdue_pattern", pattern) == calculator.analyze_overdue_patterns(r, 1.0, w)
+        assert describe_reason("task_assignment", assignment) == calculator.detect_task_assignment_issues(w, r)
+    print(f"✅ {len(ratio)}组输入的逾期模式与任务分配编码一致")
+
+
+def test_batch_workload_anomalies_match_scalar():
+    """工作量异常：支持标量或逐人团队均值，团队均值为0时无异常"""
+    calculator = ScoringCalculator()
+    _, work = _inputs()
+    averages = np.resize(np.array([0.0, 4.0, 10.0, 12.5]), len(work))
+
+    for team_average in (10.0, averages):
+        codes = calculator.detect_batch_workload_anomalies(work, team_average)
+        described = calculator.describe_workload_anomalies(codes, work, team_average)
+        expected_averages = np.broadcast_to(team_average, work.shape).tolist()
+        for w, avg, result in zip(work.tolist(), expected_averages, described):
+            assert result == calculator.detect_workload_anomalies(w, avg)
+    print("✅ 工作量异常编码与标量检测一致")
+
+
+if __name__ == "__main__":
+    test_batch_detectors_match_scalar()
+    test_batch_workload_anomalies_match_scalar()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分结果流式导出测试
+验证分块写出的CSV与整表导出逐字节一致，压缩CSV与Parquet可还原为相同结果
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from result_export import check_export_path, detect_export_format, export_results
+from scoring import DataProcessor
+
+
+def _scored_frame(count=2500, seed=0):
+    rng = np.random.default_rng(seed)
+    processor = DataProcessor()
+    aligned = processor.align_columns(
+        (np.array([f"员工{i:05d}" for i in range(count)]), np.round(rng.uniform(0, 60, count), 2)),
+        (np.array([f"员工{i:05d}" for i in range(count)]), np.round(rng.uniform(0, 10, count), 2)),
+        (np.array([f"员工{i:05d}" for i in range(count)]), np.round(rng.uniform(3, 25, count), 1)),
+        verbose=False)
+    return processor, processor.score_aligned_data(aligned)
+
+
+def test_chunked_csv_matches_full_export():
+    """分块写出的CSV与一次性渲染后整表写出的文件逐字节一致"""
+    processor, df = _scored_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        expected_path = os.path.join(tmp, "expected.csv")
+        processor.render_explanations(df).to_csv(expected_path, index=True, index_label="排名", encoding="utf-8-sig")
+        for chunk_rows in (1, 333, 100_000):
+            path = os.path.join(tmp, f"chunked_{chunk_rows}.csv")
+            assert export_results(processor, df, path, chunk_rows=chunk_rows) == len(df)
+            with open(path, "rb") as actual, open(expected_path, "rb") as expected:
+                assert actual.read() == expected.read(), chunk_rows
+    print("✅ 分块CSV与整表导出一致")
+
+
+def test_compressed_formats_round_trip():
+    """gzip/bz2/xz压缩CSV与Parquet读回后与整表结果一致"""
+    processor, df = _scored_frame(seed=1)
+    expected = processor.render_explanations(df).rename_axis("排名").reset_index()
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in (".csv.gz", ".csv.bz2", ".csv.xz"):
+            path = os.path.join(tmp, "result" + extension)
+            export_results(processor, df, path, chunk_rows=700)
+            result = pd.read_csv(path, encoding="utf-8-sig")
+            assert result["name"].tolist() == expected["name"].tolist(), extension
+            assert np.array_equal(result["comprehensive_score"], expected["comprehensive_score"]), extension
+            assert result["explanation"].tolist() == expected["explanation"].tolist(), extension
+
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("⚠️ 未安装pyarrow，跳过Parquet验证")
+        else:
+            path = os.path.join(tmp, "result.parquet")
+            export_results(processor, df, path, chunk_rows=700, compression="zstd")
+            metadata = pq.ParquetFile(path).metadata
+            assert metadata.num_row_groups == 4
+            assert metadata.row_group(0).column(0).compression == "ZSTD"
+            result = pd.read_parquet(path)
+            assert result["排名"].tolist() == expected["排名"].tolist()
+            assert result["comprehensive_score"].tolist() == expected["comprehensive_score"].tolist()
+            assert result["explanation"].tolist() == expected["explanation"].tolist()
+    print("✅ 压缩CSV与Parquet导出可还原")
+
+
+def test_empty_result_and_unsupported_format():
+    """空结果只写表头；不支持的扩展名与压缩方式给出明确错误"""
+    processor, df = _scored_frame(count=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "empty.csv")
+        assert export_results(processor, df.iloc[:0], path) == 0
+        header = pd.read_csv(path, encoding="utf-8-sig")
+        assert header.empty and header.columns[0] == "排名" and "explanation" in header.columns
+
+        for bad_path, options in ((os.path.join(tmp, "result.xlsx"), {}),
+                                  (os.path.join(tmp, "result.csv"), {"compression": "zstd"})):
+            try:
+                export_results(processor, df, bad_path, **options)
+            except ValueError:
+                continue
+            raise AssertionError(f"应拒绝: {bad_path} {options}")
+    for bad_path, compression in (("result.csv.gz", "gzip"), ("result.parquet", "rar")):
+        try:
+            check_export_path(bad_path, compression)
+        except ValueError:
+            continue
+        raise AssertionError(f"应在评分前拒绝: {bad_path} {compression}")
+    assert detect_export_format("a/b.CSV.GZ") == "csv"
+    assert detect_export_format("result.pq") == "parquet"
+    print("✅ 空结果与不支持的格式处理正确")
+
+
+if __name__ == "__main__":
+    test_chunked_csv_matches_full_export()
+    test_compressed_formats_round_trip()
+    test_empty_result_and_unsupported_format()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+综合得分LRU缓存测试
+验证命中统计、容量淘汰、配置修改后的失效以及指纹编号映射的容量限制
+"""
+
+import sys
+import os
+import copy
+import pickle
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scoring import ScoringCalculator, ScoringConfig
+
+
+def test_score_cache():
+    """重复评分命中缓存，结果与关闭缓存时一致"""
+    config = ScoringConfig()
+    calculator = ScoringCalculator(config, cache_size=2)
+    uncached = ScoringCalculator(config, cache_size=0)
+
+    first = calculator.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    first["comprehensive_score"] = -1  # 修改返回值不影响缓存
+    second = calculator.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    assert second == uncached.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    assert calculator.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    # 增强版评分复用基础得分缓存
+    calculator.calculate_enhanced_comprehensive_score(35.0, 4.2, 8.0)
+    assert calculator.cache_info()["hits"] == 2
+
+    # 容量为2时最久未使用的条目被淘汰
+    calculator.calculate_comprehensive_score(10.0, 1.0, 12.0)
+    calculator.calculate_comprehensive_score(50.0, 6.0, 3.0)
+    assert calculator.cache_info()["size"] == 2
+    calculator.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    assert calculator.cache_info()["misses"] == 4
+
+    # 修改配置后旧结果不再命中；恢复配置后重新命中
+    config.weights["work_days"] = 0.5
+    changed = calculator.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    assert changed == uncached.calculate_comprehensive_score(35.0, 4.2, 8.0)
+    assert changed["comprehensive_score"] != second["comprehensive_score"]
+    config.weights["work_days"] = 0.2
+    hits = calculator.cache_info()["hits"]
+    assert calculator.calculate_comprehensive_score(35.0, 4.2, 8.0) == second
+    assert calculator.cache_info()["hits"] == hits + 1
+
+    # 反复修改配置时，指纹编号映射随缓存容量受限，不会无限增长
+    for i in range(50):
+        config.weights["work_days"] = 0.2 + i / 1000
+        expected = uncached.calculate_comprehensive_score(35.0, 4.2, 8.0)
+        assert calculator.calculate_comprehensive_score(35.0, 4.2, 8.0) == expected
+    assert len(calculator._fingerprint_ids) <= calculator.cache_size + 1
+    config.weights["work_days"] = 0.2
+    assert calculator.calculate_comprehensive_score(35.0, 4.2, 8.0) == second
+
+    calculator.cache_clear()
+    assert calculator.cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+    print("✅ 综合得分缓存命中与失效正确")
+
+
+def test_config_weights_copy_and_pickle():
+    """配置参数字典可以pickle与复制，得到与原配置脱离的普通dict"""
+    config = ScoringConfig()
+    version = config.version
+    for clone in (pickle.loads(pickle.dumps(config.weights)), copy.copy(config.weights),
+                  copy.deepcopy(config.weights)):
+        assert type(clone) is dict and clone == config.weights
+        clone["work_days"] = 0.9
+        assert config.weights["work_days"] == 0.2
+    assert config.version == version
+
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored.fingerprint() == config.fingerprint()
+    restored.weights["work_days"] = 0.5
+    assert restored.version > 0 and config.weights["work_days"] == 0.2
+    print("✅ 配置参数字典复制与序列化正确")
+
+
+if __name__ == "__main__":
+    test_score_cache()
+    test_config_weights_copy_and_pickle()
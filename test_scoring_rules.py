@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分规则单一来源测试
+验证编译后的Python评估器与标量评分一致、网页中的生成代码为最新，并用node做Python/JS差分测试
+"""
+
+import sys
+import os
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import ScoringCalculator, ScoringConfig
+from scoring_rules import (build_rule_spec, compile_rules, differential_check, extract_js,
+                           fuzz_inputs, generate_js)
+
+
+def _assert_matches_scalar(calculator, inputs):
+    result = compile_rules(build_rule_spec(calculator.config)).evaluate(
+        inputs["overdue_ratio"], inputs["overdue_days"], inputs["work_days"])
+    rows = zip(inputs["overdue_ratio"].tolist(), inputs["overdue_days"].tolist(), inputs["work_days"].tolist())
+    for i, (ratio, days, work) in enumerate(rows):
+        expected = calculator.calculate_comprehensive_score(ratio, days, work)
+        for column in ("overdue_ratio_score", "overdue_days_score", "work_days_score", "comprehensive_score"):
+            assert result[column][i] == expected[column], (column, ratio, days, work)
+        assert result["grade"][i] == calculator.get_grade(expected["comprehensive_score"]), (ratio, days, work)
+
+
+def test_compiled_rules_match_scalar():
+    """编译后的向量化评估器与标量评分逐位一致（含分段边界与舍入中点）"""
+    calculator = ScoringCalculator(cache_size=0)
+    _assert_matches_scalar(calculator, fuzz_inputs(20000, seed=3))
+    print("✅ 编译规则与标量评分逐位一致")
+
+
+def test_rules_follow_config():
+    """修改配置后规则随之变化，批量评分自动重新编译"""
+    config = ScoringConfig()
+    config.weights["work_days"] = 0.3
+    config.work_days_params["bonus_tier2_rate"] = 1.5
+    config.grade_thresholds["A"] = 72
+    calculator = ScoringCalculator(config, cache_size=0)
+    inputs = fuzz_inputs(5000, seed=4, spec=build_rule_spec(config))
+    _assert_matches_scalar(calculator, inputs)
+
+    before = calculator.calculate_batch_scores([10.0], [1.0], [18.0])["comprehensive_score"][0]
+    config.work_days_params["bonus_tier2_rate"] = 3
+    after = calculator.calculate_batch_scores([10.0], [1.0], [18.0])["comprehensive_score"][0]
+    assert after == calculator.calculate_comprehensive_score(10.0, 1.0, 18.0)["comprehensive_score"]
+    assert after > before
+    print("✅ 配置变化后规则重新编译")
+
+
+def test_explain_follows_config():
+    """解释编码与文字使用配置中的基准线，标量与批量一致"""
+    config = ScoringConfig()
+    config.overdue_ratio_params["baseline"] = 30.0
+    config.overdue_days_params["baseline"] = 3.5
+    calculator = ScoringCalculator(config, cache_size=0)
+    inputs = fuzz_inputs(5000, seed=5, spec=build_rule_spec(config))
+    codes = calculator.calculate_batch_explain_codes(
+        inputs["overdue_ratio"], inputs["overdue_days"], inputs["work_days"])
+    rows = zip(inputs["overdue_ratio"].tolist(), inputs["overdue_days"].tolist(), inputs["work_days"].tolist())
+    for code, (ratio, days, work) in zip(codes.tolist(), rows):
+        assert code == calculator.explain_code(ratio, days, work), (ratio, days, work)
+
+    assert calculator.explain_code(25.0, 3.0, 10) == ScoringCalculator().explain_code(10.0, 1.0, 10)
+    text = calculator.explain_score(35.0, 4.0, 10)
+    assert "超出基准(30%)" in text and "超出基准(3.5天)" in text
+    print("✅ 解释编码随配置基准线变化")
+
+
+def test_invalid_spec_rejected():
+    """未知规则类型或格式版本给出明确错误"""
+    spec = build_rule_spec()
+    spec["components"]["overdue_days"]["kind"] = "quadratic"
+    for broken in (spec, {**build_rule_spec(), "version": 0}):
+        try:
+            compile_rules(broken)
+        except ValueError:
+            continue
+        raise AssertionError("应拒绝无效规则")
+    print("✅ 无效规则被拒绝")
+
+
+def test_html_rules_up_to_date():
+    """网页中的评分代码与规则生成结果一致"""
+    assert extract_js() == generate_js(), "请运行 python scoring_rules.py --write-html"
+    print("✅ 网页评分代码为最新")
+
+
+def test_python_js_differential():
+    """同一批随机输入下Python与网页JS评分结果完全一致（需要node）"""
+    if not shutil.which("node"):
+        print("⚠️ 未找到node，跳过差分测试")
+        return
+    result = differential_check(1_000_000, seed=11)
+    assert result["mismatches"] == 0, result["examples"]
+    print(f"✅ {result['count']} 组输入Python与JS评分一致")
+
+
+if __name__ == "__main__":
+    test_compiled_rules_match_scalar()
+    test_rules_follow_config()
+    test_explain_follows_config()
+    test_invalid_spec_rejected()
+    test_html_rules_up_to_date()
+    test_python_js_differential()
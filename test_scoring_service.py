@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地评分服务测试
+在随机端口启动服务，验证评分结果与DataProcessor一致、并发请求被合并评分、流式输出与错误处理
+"""
+
+import sys
+import os
+import asyncio
+import http.client
+import json
+import socket
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import DataProcessor
+from scoring_service import ARROW_TYPE, NDJSON_TYPE, ScoringService
+
+
+def _make_columns(count, seed, prefix="员工"):
+    rng = np.random.default_rng(seed)
+    return {
+        "name": [f"{prefix}{i:04d}" for i in range(count)],
+        "overdue_ratio": np.round(rng.uniform(0, 60, count), 2).tolist(),
+        "overdue_days": np.round(rng.uniform(0, 12, count), 2).tolist(),
+        "work_days": np.round(rng.uniform(5, 25, count), 1).tolist(),
+    }
+
+
+def _expected(columns):
+    processor = DataProcessor()
+    aligned = processor.align_columns(*[(np.array(columns["name"]), np.array(columns[key]))
+                                        for key in ("overdue_ratio", "overdue_days", "work_days")],
+                                      verbose=False)
+    return processor.render_explanations(processor.score_aligned_data(aligned))
+
+
+def _request(port, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        connection.close()
+
+
+def _with_service(scenario, **options):
+    """启动服务执行场景（同步函数，在线程中运行），结束后关闭服务"""
+    async def run():
+        service = ScoringService(**options)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, scenario, port, service)
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+
+def test_score_matches_processor():
+    """JSON接口的评分、排名与说明与DataProcessor结果一致，两种JSON请求格式等价"""
+    columns = _make_columns(300, seed=1)
+    expected = _expected(columns)
+
+    def scenario(port, service):
+        records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        results = []
+        for payload in (columns, {"employees": records}):
+            status, content_type, body = _request(port, "POST", "/score?explain=1", json.dumps(payload))
+            assert status == 200, body
+            assert content_type.startswith("application/json")
+            results.append(json.loads(body))
+        return results
+
+    for result in _with_service(scenario):
+        assert result["count"] == len(expected)
+        rows = result["results"]
+        assert [row["name"] for row in rows] == expected["name"].tolist()
+        assert [row["rank"] for row in rows] == expected.index.tolist()
+        for column in ("comprehensive_score", "overdue_ratio_score", "leave_adjustment", "grade", "explanation"):
+            assert [row[column] for row in rows] == expected[column].tolist(), column
+    print("✅ 服务评分与DataProcessor一致")
+
+
+def test_concurrent_requests_batched():
+    """并发请求合并为更少的批量评分调用，拆分后各请求结果与单独评分一致"""
+    requests = [_make_columns(50 + i, seed=10 + i, prefix=f"组{i}_") for i in range(16)]
+
+    def scenario(port, service):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+            responses = list(pool.map(
+                lambda payload: _request(port, "POST", "/score", json.dumps(payload)), requests))
+        status, _, health = _request(port, "GET", "/health")
+        assert status == 200
+        return responses, json.loads(health)
+
+    responses, health = _with_service(scenario, max_delay=0.05)
+    assert health["requests"] == len(requests)
+    assert health["batches"] < len(requests), health
+    for columns, (status, _, body) in zip(requests, responses):
+        assert status == 200, body
+        rows = json.loads(body)["results"]
+        expected = _expected(columns)
+        assert [row["name"] for row in rows] == expected["name"].tolist()
+        assert [row["comprehensive_score"] for row in rows] == expected["comprehensive_score"].tolist()
+    print(f"✅ {health['requests']} 个并发请求合并为 {health['batches']} 次批量评分")
+
+
+def test_streaming_formats():
+    """NDJSON按行流式输出（默认不渲染解释文字），Arrow流可还原为同样的结果表"""
+    columns = _make_columns(1200, seed=2)
+    expected = _expected(columns)
+
+    def scenario(port, service):
+        payload = json.dumps(columns)
+        ndjson = _request(port, "POST", "/score", payload, {"Accept": NDJSON_TYPE})
+        arrow = _request(port, "POST", "/score?explain=1", payload, {"Accept": ARROW_TYPE})
+        return ndjson, arrow
+
+    (status, content_type, body), arrow = _with_service(scenario, stream_chunk_rows=100)
+    assert status == 200 and content_type.startswith(NDJSON_TYPE)
+    rows = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert len(rows) == len(expected)
+    assert "explanation" not in rows[0] and "explain_code" in rows[0]
+    assert [row["comprehensive_score"] for row in rows] == expected["comprehensive_score"].tolist()
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("⚠️ 未安装pyarrow，跳过Arrow输出验证")
+    else:
+        status, content_type, body = arrow
+        assert status == 200 and content_type == ARROW_TYPE
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.num_rows == len(expected)
+        assert table.column("name").to_pylist() == expected["name"].tolist()
+        assert table.column("comprehensive_score").to_pylist() == expected["comprehensive_score"].tolist()
+        assert table.column("explanation").to_pylist() == expected["explanation"].tolist()
+    print("✅ NDJSON与Arrow流式输出正确")
+
+
+def test_invalid_requests_rejected():
+    """无效请求返回4xx错误，连接与服务继续可用"""
+    valid = _make_columns(3, seed=3)
+
+    def scenario(port, service):
+        cases = {
+            "not json": 400,
+            json.dumps({"name": ["甲"], "overdue_ratio": [1.0]}): 400,
+            json.dumps({**valid, "name": ["甲", "甲", "乙"]}): 400,
+            json.dumps({**valid, "work_days": [1.0, 2.0]}): 400,
+            json.dumps({**valid, "overdue_days": [1.0, "x", 2.0]}): 400,
+        }
+        statuses = {body: _request(port, "POST", "/score", body)[0] for body in cases}
+        statuses["/missing"] = _request(port, "GET", "/missing")[0]
+        statuses["GET /score"] = _request(port, "GET", "/score")[0]
+        ok = _request(port, "POST", "/score", json.dumps(valid))[0]
+        return cases, statuses, ok
+
+    cases, statuses, ok = _with_service(scenario)
+    for body, status in cases.items():
+        assert statuses[body] == status, (body, statuses[body])
+    assert statuses["/missing"] == 404
+    assert statuses["GET /score"] == 405
+    assert ok == 200
+    print("✅ 无效请求返回错误且服务保持可用")
+
+
+def test_unread_body_closes_connection():
+    """请求体过大或Content-Length无效时返回错误并关闭连接，后续请求不会被错位解析"""
+    valid = json.dumps(_make_columns(3, seed=4)).encode("utf-8")
+
+    def exchange(port, first):
+        with socket.create_connection(("127.0.0.1", port), timeout=30) as sock:
+            sock.sendall(first)
+            sock.sendall(b"POST /score HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(valid)).encode() + b"\r\n\r\n" + valid)
+            response = b""
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    return response
+                response += data
+
+    oversized = b"x" * 4096
+    requests = (
+        b"POST /score HTTP/1.1\r\nHost: x\r\nContent-Length: 4096\r\n\r\n" + oversized,
+        b"POST /score HTTP/1.1\r\nHost: x\r\nContent-Length: abc\r\n\r\n",
+    )
+
+    def scenario(port, service):
+        responses = [exchange(port, first) for first in requests]
+        status, _, _ = _request(port, "POST", "/score", valid)
+        return responses, status
+
+    responses, status = _with_service(scenario, max_body_bytes=1024)
+    for response, expected in zip(responses, (b"413", b"400")):
+        head = response.split(b"\r\n\r\n", 1)[0]
+        assert head.startswith(b"HTTP/1.1 " + expected), head
+        assert b"Connection: close" in head
+        # 服务端读完错误响应后即关闭连接，第二个请求没有被当作请求体剩余部分解析
+        assert response.count(b"HTTP/1.1 ") == 1, response
+    assert status == 200
+    print("✅ 未读请求体的错误响应关闭连接")
+
+
+if __name__ == "__main__":
+    test_score_matches_processor()
+    test_concurrent_requests_batched()
+    test_streaming_formats()
+    test_invalid_requests_rejected()
+    test_unread_body_closes_connection()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+敏感性扫描测试
+验证扫描结果与逐个修改配置后重新评分的结果一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from scoring import AlignedData, ScoringCalculator, ScoringConfig
+from sensitivity_sweep import SensitivitySweep, cross_candidates, random_candidates, threshold_grid, weight_grid
+
+
+def _aligned(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    return AlignedData(
+        names=np.array([f"员工{i}" for i in range(n)]),
+        overdue_ratio=np.round(rng.uniform(0, 90, n), 1),
+        overdue_days=np.round(rng.uniform(0, 15, n), 1),
+        work_days=np.round(rng.uniform(0, 30, n), 1),
+    )
+
+
+def test_sweep_matches_rescoring():
+    """每组方案的等级分布与修改配置后批量评分的结果一致"""
+    aligned = _aligned()
+    sweep = SensitivitySweep(aligned, max_chunk_elements=2000)
+
+    weights, thresholds = random_candidates(20, seed=1)
+    grid_weights, grid_thresholds = cross_candidates(weight_grid(0.1, 0.1),
+                                                     threshold_grid([85, 90], [70], [55], [40]))
+    weights = np.vstack([weights, grid_weights])
+    thresholds = np.vstack([thresholds, grid_thresholds])
+    result = sweep.evaluate(weights, thresholds)
+    assert len(result) == len(weights)
+
+    for i in range(len(weights)):
+        config = ScoringConfig()
+        config.weights.update(overdue_ratio=weights[i, 0], overdue_days=weights[i, 1], work_days=weights[i, 2])
+        config.grade_thresholds.update(zip("SABC", thresholds[i]))
+        scores = ScoringCalculator(config).calculate_batch_scores(
+            aligned.overdue_ratio, aligned.overdue_days, aligned.work_days)
+        grades, counts = np.unique(scores["grade"], return_counts=True)
+        expected = dict(zip(grades.tolist(), counts.tolist()))
+        assert [result.loc[i, grade] for grade in "SABCD"] == [expected.get(g, 0) for g in "SABCD"], i
+
+    # 当前配置对应的方案没有等级和排名变化
+    baseline = result[(result["w_overdue_ratio"] == 0.4) & (result["w_work_days"] == 0.2)
+                      & (result["S_cutoff"] == 85)]
+    assert len(baseline) == 1
+    assert baseline[["grade_changes", "max_rank_shift"]].values.tolist() == [[0, 0]]
+    print(f"✅ {len(result)}组方案扫描结果与重新评分一致")
+
+
+if __name__ == "__main__":
+    test_sweep_matches_rescoring()
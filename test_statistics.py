@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统计分析测试
+验证单次遍历统计与逐项过滤统计结果一致，且分块累积与整体计算一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from scoring import AlignedData, DataProcessor, StatisticsAccumulator
+
+
+def _reference_statistics(df):
+    """逐项过滤的统计方式，作为对照"""
+    return {
+        "总人数": len(df),
+        "平均综合得分": round(df["comprehensive_score"].mean(), 2),
+        "得分中位数": round(df["comprehensive_score"].median(), 2),
+        "最高分": df["comprehensive_score"].max(),
+        "最低分": df["comprehensive_score"].min(),
+        "等级分布": df["grade"].value_counts().to_dict(),
+        "Highlight候选": df[df["grade"] == "S"]["name"].tolist(),
+        "Lowlight需关注": df[df["grade"] == "D"]["name"].tolist(),
+        "需核实人天": df[df["needs_review"] == True]["name"].tolist(),
+        "逾期分析": {
+            "平均逾期比例": round(df["overdue_ratio"].mean(), 2),
+            "平均逾期天数": round(df["overdue_days"].mean(), 2),
+            "逾期比例>50%": len(df[df["overdue_ratio"] > 50]),
+            "逾期天数>5天": len(df[df["overdue_days"] > 5])
+        },
+        "工作量分析": {
+            "平均人天": round(df["work_days"].mean(), 2),
+            "人天中位数": round(df["work_days"].median(), 2),
+            "工作量不足(<8人天)": len(df[df["work_days"] < 8]),
+            "理想区间(8-10人天)": len(df[(df["work_days"] >= 8) & (df["work_days"] <= 10)]),
+            "优秀表现(10-15人天)": len(df[(df["work_days"] > 10) & (df["work_days"] <= 15)]),
+            "超高产出(>15人天)": len(df[df["work_days"] > 15]),
+            "需核实记录(>15人天)": len(df[df["needs_review"] == True])
+        }
+    }
+
+
+def _result_frame(n, seed=11):
+    rng = np.random.default_rng(seed)
+    aligned = AlignedData(
+        names=np.array([f"员工{i}" for i in range(n)]),
+        overdue_ratio=np.round(rng.uniform(0, 90, n), 1),
+        overdue_days=np.round(rng.uniform(0, 12, n), 1),
+        work_days=np.round(rng.choice([0, 3, 8, 10, 15, 16.5, 22], n) + rng.uniform(0, 1, n).round(1), 1),
+    )
+    return DataProcessor().score_aligned_data(aligned)
+
+
+def test_statistics_match_reference():
+    """单次遍历统计与逐项统计一致（奇数与偶数人数）"""
+    for n in (301, 302):
+        df = _result_frame(n)
+        stats = DataProcessor().analyze_statistics(df)
+        expected = _reference_statistics(df)
+        assert stats == expected
+        assert list(stats["等级分布"].values()) == sorted(stats["等级分布"].values(), reverse=True)
+    print("✅ 单次遍历统计与逐项统计一致")
+
+
+def test_statistics_accumulate_chunks():
+    """分块累积与整体统计一致"""
+    df = _result_frame(1000)
+    accumulator = StatisticsAccumulator()
+    for start in range(0, len(df), 128):
+        accumulator.update(df.iloc[start:start + 128])
+    chunked = accumulator.result()
+    whole = DataProcessor().analyze_statistics(df)
+
+    for key in ("总人数", "得分中位数", "最高分", "最低分", "等级分布", "Highlight候选", "需核实人天", "工作量分析"):
+        assert chunked[key] == whole[key], key
+    assert abs(chunked["平均综合得分"] - whole["平均综合得分"]) <= 0.01
+    assert chunked["逾期分析"]["逾期比例>50%"] == whole["逾期分析"]["逾期比例>50%"]
+    print("✅ 分块累积统计与整体统计一致")
+
+
+if __name__ == "__main__":
+    test_statistics_match_reference()
+    test_statistics_accumulate_chunks()
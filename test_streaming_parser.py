@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式解析器测试
+验证三行一组格式的逐条解析与原有整文件解析结果一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scoring import DataParser
+
+
+def test_streaming_parser():
+    """流式解析：跳过空行、忽略末尾不完整分组、惰性产出"""
+    content = "张三\n25.5%\n20%\n\n李四\n  0%  \n20%\n\n\n王五\n100%\n"
+    with tempfile.NamedTemporaryFile("w", suffix=".data", encoding="utf-8", delete=False) as f:
+        f.write(content)
+        path = f.name
+
+    try:
+        records = DataParser.iter_overdue_records(path)
+        assert next(records) == ("张三", 25.5)
+        assert list(records) == [("李四", 0.0)]
+
+        assert DataParser.parse_overdue_data(path) == {"张三": 25.5, "李四": 0.0}
+        assert list(DataParser.iter_triplets(path)) == [("张三", "25.5%", "20%"), ("李四", "0%", "20%")]
+    finally:
+        os.unlink(path)
+    print("✅ 流式解析结果正确")
+
+
+if __name__ == "__main__":
+    test_streaming_parser()
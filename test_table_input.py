@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合并表格输入测试
+验证CSV/Parquet/Arrow合并文件与三个.data文件的评分结果一致
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from scoring import DataProcessor
+from table_input import read_attributes, read_table, write_table
+
+try:
+    import pyarrow  # noqa: F401
+    FORMATS = ["csv", "parquet", "arrow"]
+except ImportError:
+    FORMATS = ["csv"]
+
+RECORDS = {"张三": (10.0, 1.0, 12.0), "李四": (55.5, 6.3, 6.0), "王五": (0.0, 0.0, 0.0), "赵六": (23.4, 2.1, 16.5)}
+
+
+def _write_data_files(tmp):
+    paths = []
+    for index, (kind, fmt) in enumerate([("overdue", "{:.1f}%"), ("mean_overdue", "{:.1f}"), ("days", "{:.1f}")]):
+        path = os.path.join(tmp, f"{kind}.data")
+        with open(path, "w", encoding="utf-8") as f:
+            for name, values in RECORDS.items():
+                f.write(f"{name}\n{fmt.format(values[index])}\n0\n")
+        paths.append(path)
+    return paths
+
+
+def _combined_frame():
+    return pd.DataFrame({
+        "name": list(RECORDS),
+        "overdue_ratio": [values[0] for values in RECORDS.values()],
+        "overdue_days": [values[1] for values in RECORDS.values()],
+        "work_days": [values[2] for values in RECORDS.values()],
+        "complexity": pd.Categorical(["复杂", "简单", "中等", "非常复杂"]),
+        "urgent_tasks_completed": [1, 0, 0, 3],
+        "urgent_tasks_total": [2, 0, 0, 3],
+    })
+
+
+def test_combined_file_matches_data_files():
+    """三种格式的合并文件与三个.data文件评分结果完全一致"""
+    processor = DataProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = processor.process_files(*_write_data_files(tmp), verbose=False)
+        for extension in FORMATS:
+            path = os.path.join(tmp, f"combined.{extension}")
+            write_table(_combined_frame(), path)
+            result = processor.process_table(path, verbose=False)
+            assert result.equals(expected), extension
+
+            attributes = read_attributes(path)
+            assert list(attributes.columns) == ["name", "complexity", "urgent_tasks_completed", "urgent_tasks_total"]
+            assert attributes.set_index("name").loc["赵六", "urgent_tasks_total"] == 3
+    print(f"✅ {', '.join(FORMATS)} 合并文件评分结果与.data文件一致")
+
+
+def test_missing_values_and_columns():
+    """指标为空的员工按未匹配处理；缺少必需列时报错"""
+    processor = DataProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "combined.csv")
+        df = _combined_frame()
+        df.loc[1, "work_days"] = np.nan
+        write_table(df, path)
+        aligned = processor.load_aligned_table(path, verbose=False)
+        assert list(aligned.names) == sorted(["张三", "王五", "赵六"])
+        assert aligned.unmatched["overdue"] == ["李四"]
+
+        write_table(df.drop(columns="overdue_days"), path)
+        try:
+            read_table(path)
+            assert False, "缺少列应报错"
+        except ValueError as e:
+            assert "overdue_days" in str(e)
+    print("✅ 缺失值与缺失列处理正确")
+
+
+if __name__ == "__main__":
+    test_combined_file_matches_data_files()
+    test_missing_values_and_columns()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+团队工作量异常检测测试
+验证分组统计与pandas分组聚合一致，逐人异常编码与标量检测一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from scoring import DataProcessor
+
+
+def _frame(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"员工{i}" for i in range(n)],
+        "team": rng.choice(["前端组", "后端组", "算法组"], n),
+        "period": rng.choice(["2025-08", "2025-09"], n),
+        "work_days": np.round(rng.uniform(0, 25, n), 1),
+    })
+
+
+def test_grouped_statistics_match_pandas():
+    """各团队周期的均值、中位数、MAD、方差与pandas逐组计算一致"""
+    processor = DataProcessor()
+    df = _frame()
+    result = processor.add_workload_anomalies(df, group_by=["team", "period"])
+
+    grouped = df.groupby(["team", "period"])["work_days"]
+    expected_median = grouped.transform("median")
+    expected_mad = (df["work_days"] - expected_median).abs().groupby([df["team"], df["period"]]).transform("median")
+    assert np.allclose(result["team_work_mean"], grouped.transform("mean"))
+    assert np.array_equal(result["team_work_median"], expected_median)
+    assert np.array_equal(result["team_work_mad"], expected_mad)
+    assert np.allclose(result["team_work_var"], grouped.transform(lambda x: x.var(ddof=0)))
+    print("✅ 分组统计与pandas一致")
+
+
+def test_missing_group_value():
+    """分组列缺失的人员归为单独一组，统计量与pandas保留NaN分组的结果一致"""
+    processor = DataProcessor()
+    df = _frame(n=300, seed=5)
+    df.loc[df.index[::7], "team"] = None
+    result = processor.add_workload_anomalies(df, group_by=["team"])
+    assert len(result) == len(df)
+
+    grouped = df.groupby("team", dropna=False)["work_days"]
+    missing = df["team"].isna()
+    assert np.allclose(result["team_work_mean"], grouped.transform("mean"))
+    assert np.array_equal(result["team_work_median"], grouped.transform("median"))
+    assert np.isclose(result.loc[missing, "team_work_mean"].iloc[0], df.loc[missing, "work_days"].mean())
+    print("✅ 分组列缺失的人员单独成组")
+
+
+def test_anomaly_codes_match_scalar():
+    """逐人异常编码与detect_workload_anomalies一致，变异系数超阈值时标记团队"""
+    processor = DataProcessor()
+    result = processor.add_workload_anomalies(_frame(300))
+    anomalies = processor.calculator.describe_workload_anomalies(
+        result["workload_anomaly"], result["work_days"], result["team_work_mean"])
+    for work, average, anomaly in zip(result["work_days"], result["team_work_mean"], anomalies):
+        assert anomaly == processor.calculator.detect_workload_anomalies(work, average)
+
+    # 均匀分布的人天变异系数约0.58 > 0.4；人天完全相同时既无异常也不标记
+    assert result["team_workload_uneven"].all()
+    even = processor.add_workload_anomalies(pd.DataFrame({"work_days": [10.0] * 5}))
+    assert not even["team_workload_uneven"].any()
+    assert (even["workload_anomaly"] == 0).all() and (even["work_days_robust_z"] == 0).all()
+    assert processor.add_workload_anomalies(pd.DataFrame({"work_days": []})).empty
+    print("✅ 工作量异常编码与标量检测一致")
+
+
+if __name__ == "__main__":
+    test_grouped_statistics_match_pandas()
+    test_missing_group_value()
+    test_anomaly_codes_match_scalar()